@@ -7,10 +7,15 @@ class AccountAppConfig(AppConfig):
 
     def ready(self):
         from .models import User
-        from .signals import delete_avatar
+        from .signals import delete_avatar, delete_jwt_user_cache
 
         post_delete.connect(
             delete_avatar,
             sender=User,
             dispatch_uid="delete_user_avatar",
         )
+        post_delete.connect(
+            delete_jwt_user_cache,
+            sender=User,
+            dispatch_uid="delete_jwt_user_cache",
+        )
@@ -212,8 +212,12 @@ class User(PermissionsMixin, ModelWithMetadata, AbstractBaseUser):
     # VALCOME: enforce email address to be lowercase [NWS-1468]
     # https://stackoverflow.com/a/13044762/12237560
     def save(self, *args, **kwargs):
+        from ..core.jwt import invalidate_jwt_user_cache
+
         self.email = self.email.lower()
         super().save(*args, **kwargs)
+        # cached token users could be deactivated or have changed permissions
+        invalidate_jwt_user_cache(self)
 
     @property
     def effective_permissions(self) -> "QuerySet[Permission]":
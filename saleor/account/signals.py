@@ -1,6 +1,12 @@
+from ..core.jwt import invalidate_jwt_user_cache
 from ..core.utils import delete_versatile_image
 
 
 def delete_avatar(sender, instance, **kwargs):
     if avatar := instance.avatar:
         delete_versatile_image(avatar)
+
+
+def delete_jwt_user_cache(sender, instance, **kwargs):
+    # cached token users of deleted accounts would be authenticated
+    invalidate_jwt_user_cache(instance)
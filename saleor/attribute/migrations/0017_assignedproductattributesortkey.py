@@ -0,0 +1,104 @@
+# Generated by Django 3.2.12 on 2022-03-14 10:21
+
+import django.db.models.deletion
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import migrations, models
+from django.db.models import F
+
+BATCH_SIZE = 2000
+
+
+def create_product_attribute_sort_keys(apps, schema_editor):
+    AssignedProductAttribute = apps.get_model("attribute", "AssignedProductAttribute")
+    AssignedProductAttributeSortKey = apps.get_model(
+        "attribute", "AssignedProductAttributeSortKey"
+    )
+
+    rows = (
+        AssignedProductAttribute.objects.order_by("pk")
+        .annotate(
+            attribute_id=F("assignment__attribute_id"),
+            concatenated_values=StringAgg(
+                "values__name",
+                delimiter=",",
+                ordering=["values__sort_order", "values__pk"],
+            ),
+        )
+        .values_list("pk", "product_id", "attribute_id", "concatenated_values")
+    )
+    sort_keys = []
+    for pk, product_id, attribute_id, values in rows.iterator():
+        sort_keys.append(
+            AssignedProductAttributeSortKey(
+                assignment_id=pk,
+                product_id=product_id,
+                attribute_id=attribute_id,
+                values=values,
+            )
+        )
+        if len(sort_keys) >= BATCH_SIZE:
+            AssignedProductAttributeSortKey.objects.bulk_create(sort_keys)
+            sort_keys = []
+    AssignedProductAttributeSortKey.objects.bulk_create(sort_keys)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0152_product_search_index_dirty"),
+        ("attribute", "0016_auto_20210827_0938"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssignedProductAttributeSortKey",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("values", models.TextField(blank=True, null=True)),
+                (
+                    "assignment",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sort_key",
+                        to="attribute.assignedproductattribute",
+                    ),
+                ),
+                (
+                    "attribute",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="product_sort_keys",
+                        to="attribute.attribute",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attribute_sort_keys",
+                        to="product.product",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("product", "attribute")},
+            },
+        ),
+        migrations.AddIndex(
+            model_name="assignedproductattributesortkey",
+            index=models.Index(
+                fields=["attribute", "values"], name="attribute_a_attribu_eb2df3_idx"
+            ),
+        ),
+        migrations.RunPython(
+            create_product_attribute_sort_keys, migrations.RunPython.noop
+        ),
+    ]
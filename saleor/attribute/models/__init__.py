@@ -7,6 +7,7 @@ from .base import (
 from .page import AssignedPageAttribute, AssignedPageAttributeValue, AttributePage
 from .product import (
     AssignedProductAttribute,
+    AssignedProductAttributeSortKey,
     AssignedProductAttributeValue,
     AttributeProduct,
 )
@@ -25,6 +26,7 @@ __all__ = [
     "AssignedPageAttributeValue",
     "AttributePage",
     "AssignedProductAttribute",
+    "AssignedProductAttributeSortKey",
     "AssignedProductAttributeValue",
     "AttributeProduct",
     "AssignedVariantAttribute",
@@ -45,6 +45,29 @@ class AssignedProductAttribute(BaseAssignedAttribute):
         unique_together = (("product", "assignment"),)
 
 
+class AssignedProductAttributeSortKey(models.Model):
+    """Hold the concatenated values of a product attribute to sort products by.
+
+    Maintained by `update_product_attribute_sort_keys` whenever the assigned values,
+    their names or their order change.
+    """
+
+    assignment = models.OneToOneField(
+        AssignedProductAttribute, on_delete=models.CASCADE, related_name="sort_key"
+    )
+    product = models.ForeignKey(
+        Product, related_name="attribute_sort_keys", on_delete=models.CASCADE
+    )
+    attribute = models.ForeignKey(
+        "Attribute", related_name="product_sort_keys", on_delete=models.CASCADE
+    )
+    values = models.TextField(blank=True, null=True)
+
+    class Meta:
+        unique_together = (("product", "attribute"),)
+        indexes = [models.Index(fields=["attribute", "values"])]
+
+
 class AttributeProduct(SortableModel):
     attribute = models.ForeignKey(
         "Attribute", related_name="attributeproduct", on_delete=models.CASCADE
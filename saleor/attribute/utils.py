@@ -1,4 +1,8 @@
-from typing import TYPE_CHECKING, Iterable, Set, Union
+from typing import TYPE_CHECKING, Iterable, Optional, Set, Union
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import transaction
+from django.db.models import F
 
 from ..page.models import Page
 from ..product.models import Product, ProductVariant
@@ -6,6 +10,7 @@ from .models import (
     AssignedPageAttribute,
     AssignedPageAttributeValue,
     AssignedProductAttribute,
+    AssignedProductAttributeSortKey,
     AssignedProductAttributeValue,
     AssignedVariantAttribute,
     AssignedVariantAttributeValue,
@@ -43,6 +48,10 @@ def associate_attribute_values_to_instance(
     assignment = _associate_attribute_to_instance(instance, attribute.pk)
     assignment.values.set(values)
     sort_assigned_attribute_values(instance, assignment, values)
+    if isinstance(instance, Product):
+        update_product_attribute_sort_keys(
+            product_ids=[instance.pk], attribute_ids=[attribute.pk]
+        )
 
     return assignment
 
@@ -115,3 +124,46 @@ def sort_assigned_attribute_values(
         value_assignment.sort_order = index
 
     assignment_model.objects.bulk_update(values_assignment, ["sort_order"])
+
+
+def update_product_attribute_sort_keys(
+    product_ids: Optional[Iterable[int]] = None,
+    attribute_ids: Optional[Iterable[int]] = None,
+) -> None:
+    """Rebuild the sort keys of the product attributes.
+
+    A key holds the names of the values assigned to the product, ordered like the
+    values of the attribute. Products sorted by an attribute are ordered by these
+    keys, see `ProductsQueryset.sort_by_attribute`.
+    """
+    assignments = AssignedProductAttribute.objects.all()
+    if product_ids is not None:
+        assignments = assignments.filter(product_id__in=product_ids)
+    if attribute_ids is not None:
+        assignments = assignments.filter(assignment__attribute_id__in=attribute_ids)
+
+    rows = assignments.annotate(
+        attribute_id=F("assignment__attribute_id"),
+        concatenated_values=StringAgg(
+            "values__name",
+            delimiter=",",
+            ordering=[
+                f"values__{field_name}"
+                for field_name in AttributeValue._meta.ordering or []
+            ],
+        ),
+    ).values_list("pk", "product_id", "attribute_id", "concatenated_values")
+    sort_keys = [
+        AssignedProductAttributeSortKey(
+            assignment_id=pk,
+            product_id=product_id,
+            attribute_id=attribute_id,
+            values=values,
+        )
+        for pk, product_id, attribute_id, values in rows
+    ]
+    with transaction.atomic():
+        AssignedProductAttributeSortKey.objects.filter(
+            assignment_id__in=[sort_key.assignment_id for sort_key in sort_keys]
+        ).delete()
+        AssignedProductAttributeSortKey.objects.bulk_create(sort_keys)
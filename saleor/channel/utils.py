@@ -1,5 +1,6 @@
 import warnings
 
+from ..core.configuration import get_all_channels
 from .exceptions import ChannelNotDefined, NoDefaultChannel
 from .models import Channel
 
@@ -23,16 +24,12 @@ def get_default_channel() -> Channel:
     :raises NoDefaultChannel: When there are no channels.
     """
 
-    try:
-        channel = Channel.objects.get()
-    except Channel.MultipleObjectsReturned:
-        channels = list(Channel.objects.filter(is_active=True))
-        if len(channels) == 1:
-            warnings.warn(DEPRECATION_WARNING_MESSAGE)
-            return channels[0]
-        raise ChannelNotDefined()
-    except Channel.DoesNotExist:
+    channels = get_all_channels()
+    if not channels:
         raise NoDefaultChannel()
-    else:
-        warnings.warn(DEPRECATION_WARNING_MESSAGE)
-        return channel
+    if len(channels) > 1:
+        channels = [channel for channel in channels if channel.is_active]
+        if len(channels) != 1:
+            raise ChannelNotDefined()
+    warnings.warn(DEPRECATION_WARNING_MESSAGE)
+    return channels[0]
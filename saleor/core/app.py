@@ -1,6 +1,7 @@
 from django.apps import AppConfig
 from django.conf import settings
 from django.db.models import Field
+from django.db.models.signals import post_delete, post_save
 from django.utils.module_loading import import_string
 
 from .db.filters import PostgresILike
@@ -15,6 +16,24 @@ class CoreAppConfig(AppConfig):
         if settings.SENTRY_DSN:
             settings.SENTRY_INIT(settings.SENTRY_DSN, settings.SENTRY_OPTS)
         self.validate_jwt_manager()
+        self.connect_signals()
+
+    def connect_signals(self):
+        from django.contrib.sites.models import Site
+
+        from ..channel.models import Channel
+        from ..site.models import SiteSettings
+        from .configuration import channels_cache
+
+        # sites are cached with their settings, channels by slug, both invalidated
+        # by the configuration version
+        for model in [Site, SiteSettings, Channel]:
+            for signal in [post_save, post_delete]:
+                signal.connect(
+                    channels_cache.invalidate_on_commit,
+                    sender=model,
+                    dispatch_uid=f"invalidate_configuration_cache_{model.__name__}",
+                )
 
     def validate_jwt_manager(self):
         jwt_manager_path = getattr(settings, "JWT_MANAGER_PATH", None)
@@ -1,9 +1,16 @@
 import logging
+import threading
+import uuid
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
 
+import graphene
+from django.apps import apps
 from django.core.cache import cache
+from django.db import transaction
 from django.db.models import QuerySet
+from django_redis import get_redis_connection
 from graphql import ResolveInfo
-import json
 
 from ..settings import CACHES
 
@@ -12,67 +19,342 @@ logger = logging.getLogger(__name__)
 
 class CachePrefix:
     CATEGORY = 'Category'
-    CATEGORY_PATTERN = f"{CATEGORY}:*"
     PAGE = 'Page'
-    PAGE_PATTERN = f"{PAGE}:*"
     PRODUCT = 'Product'
-    PRODUCT_PATTERN = f"{PRODUCT}:*"
+    STREAM_PRODUCT_PROFILE = f"{PRODUCT}:StreamProfile"
     ADDRESS = 'Address'
-    ADDRESS_PATTERN = f"{ADDRESS}:*"
+    STREAM_ENTITLEMENT = 'StreamEntitlement'
+    USER_WATCH_LOGS = 'UserWatchLogs'
+    PERSISTED_QUERY = 'PersistedQuery'
+    JWT_USER = 'JwtUser'
+    TOTAL_COUNT = 'TotalCount'
+    RESPONSE = 'Response'
+    CACHE_TAG = 'CacheTag'
+    PLUGINS_MANAGER = 'PluginsManager'
+    DISCOUNTS_SNAPSHOT = 'DiscountsSnapshot'
+    PLUGIN_HOOK_METRICS = 'PluginHookMetrics'
+    CONFIGURATION = 'Configuration'
+    WEBHOOK_REGISTRY = 'WebhookRegistry'
+    WEBHOOK_BATCH = 'WebhookBatch'
+    WEBHOOK_CIRCUIT = 'WebhookCircuit'
+    WEBHOOK_QUEUE_DEPTH = 'WebhookQueueDepth'
 
 
-def cache_query(qs: "QuerySet", action):
-    cached_value = cache.get(qs.query)
+# tag of the entries which don't point to a single instance, e.g. connections
+LIST_TAG = 'list'
 
-    if cached_value:
-        return cached_value
-    else:
-        return action()
+# prefixes whose cached responses nest the instances of other prefixes, e.g.
+# products of a category
+NESTING_CACHE_PREFIXES = {CachePrefix.PRODUCT: [CachePrefix.CATEGORY]}
 
 
-def invalidate_cache(pattern: "str"):
+def get_cache_tag(prefix: str, suffix: Optional[object] = None) -> str:
+    """Return the cache tag of a prefix.
+
+    Without a suffix the tag covers all entries of the prefix, with a primary key
+    it covers the entries of a single instance and with `LIST_TAG` the entries of
+    lists, which can change whenever an instance is created or updated.
+    """
+    if suffix is None:
+        return prefix
+    return f"{prefix}:{suffix}"
+
+
+def get_cache_tag_version_key(tag: str) -> str:
+    return f"{CachePrefix.CACHE_TAG}:{tag}:version"
+
+
+def get_cache_tag_keys_key(tag: str) -> str:
+    return cache.make_key(f"{CachePrefix.CACHE_TAG}:{tag}:keys")
+
+
+def get_cache_tag_versions(tags: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Return the current version stamps of the tags.
+
+    Tags which were never invalidated have no version yet.
+    """
+    tags = list(tags)
+    if not tags:
+        return {}
+    versions = cache.get_many([get_cache_tag_version_key(tag) for tag in tags])
+    return {tag: versions.get(get_cache_tag_version_key(tag)) for tag in tags}
+
+
+def tag_cache_key(key: str, tags: Iterable[str], timeout: Optional[int] = None):
+    """Register a cache key in the Redis sets of its tags.
+
+    Keys are deleted when any of their tags is invalidated.
+    """
+    if not is_redis_cache():
+        return
+
+    timeout = timeout or CACHES["default"].get("TIMEOUT")
+    client = get_redis_client()
+    pipeline = client.pipeline()
+    for tag in tags:
+        tag_keys_key = get_cache_tag_keys_key(tag)
+        pipeline.sadd(tag_keys_key, key)
+        if timeout:
+            # tagged keys expire on their own, so the set doesn't have to outlive
+            # the last of them
+            pipeline.expire(tag_keys_key, int(timeout))
+    pipeline.execute()
+
+
+def invalidate_cache_tags(tags: Iterable[str]):
+    """Bump the version stamps of the tags and delete their keys.
+
+    Entries store the tag versions they were built with, so an entry written
+    concurrently with the invalidation is detected as stale even if its key was
+    added to the set after it was emptied.
+    """
+    tags = set(tags)
+    if not tags or not is_redis_cache():
+        return
+
+    cache.set_many(
+        {get_cache_tag_version_key(tag): uuid.uuid4().hex for tag in tags},
+        timeout=None,
+    )
+
+    client = get_redis_client()
+    keys: List[str] = []
+    for tag in tags:
+        tag_keys_key = get_cache_tag_keys_key(tag)
+        keys.extend(key.decode() for key in client.smembers(tag_keys_key))
+        client.delete(tag_keys_key)
+    if keys:
+        cache.delete_many(keys)
+    logger.debug("Invalidated cache tags %s and %s keys", sorted(tags), len(keys))
+
+
+def get_instance_cache_tags(prefix: str, *args, **kwargs) -> List[str]:
+    """Return the tags of the instances of the prefix passed to a mutation.
+
+    Instances are taken from the model instances and querysets in the arguments
+    and from the global IDs of the `id`, `ids` and `*_id` mutation arguments.
+    Related instances, e.g. variants of a product, are mapped with their
+    `<prefix>_id` field.
+    """
+    related_field = f"{prefix.lower()}_id"
+    pks = set()
+    for arg in args:
+        if isinstance(arg, QuerySet):
+            if arg.model._meta.object_name == prefix:
+                pks.update(arg.values_list("pk", flat=True))
+            continue
+        meta = getattr(arg, "_meta", None)
+        if meta is None:
+            continue
+        if getattr(meta, "object_name", None) == prefix:
+            if arg.pk is not None:
+                pks.add(arg.pk)
+        elif getattr(arg, related_field, None) is not None:
+            pks.add(getattr(arg, related_field))
+
+    global_ids = list(kwargs.get("ids") or [])
+    global_ids.extend(
+        value
+        for name, value in kwargs.items()
+        if (name == "id" or name.endswith("_id")) and isinstance(value, str)
+    )
+    related_pks: Dict[str, Set[str]] = defaultdict(set)
+    for global_id in global_ids:
+        try:
+            type_, pk = graphene.Node.from_global_id(global_id)
+        except Exception:
+            continue
+        if type_ == prefix:
+            pks.add(pk)
+        else:
+            related_pks[type_].add(pk)
+
+    for type_, type_pks in related_pks.items():
+        pks.update(get_related_pks(type_, type_pks, related_field))
+
+    return [get_cache_tag(prefix, pk) for pk in pks]
+
+
+def get_related_pks(model_name: str, pks: Iterable[str], related_field: str):
+    models = [model for model in apps.get_models() if model.__name__ == model_name]
+    if len(models) != 1:
+        return []
+    model = models[0]
+    if related_field not in {field.attname for field in model._meta.concrete_fields}:
+        return []
+    try:
+        return list(
+            model.objects.filter(pk__in=pks).values_list(related_field, flat=True)
+        )
+    except ValueError:
+        return []
+
+
+def invalidate_cache(prefix: "str", all_entries: "bool" = False):
+    """Invalidate the cache entries of the instances changed by a mutation.
+
+    Entries of the changed instances and all lists of the prefix are dropped once
+    the transaction is committed. With `all_entries` every entry of the prefix is
+    dropped, e.g. when attributes shared by many instances change.
+    """
     def decorator(func):
         def wrapper(*args, **kwargs):
-            if is_redis_cache():
-                nr_deleted = cache.delete_pattern(pattern)
-                # logger.debug(f"Deleted {nr_deleted} cache entries")
-            return func(*args, **kwargs)
+            if not is_redis_cache():
+                return func(*args, **kwargs)
+
+            if all_entries:
+                tags = [get_cache_tag(prefix)]
+            else:
+                # instances are resolved before the mutation, as it can delete them
+                tags = [get_cache_tag(prefix, LIST_TAG)]
+                tags.extend(get_instance_cache_tags(prefix, *args, **kwargs))
+            tags.extend(get_nesting_cache_tags(prefix))
+
+            response = func(*args, **kwargs)
+            transaction.on_commit(lambda: invalidate_cache_tags(tags))
+            return response
         return wrapper
     return decorator
 
 
+def get_nesting_cache_tags(prefix: str) -> List[str]:
+    nesting_prefixes = NESTING_CACHE_PREFIXES.get(prefix, [])
+    return [get_cache_tag(nesting_prefix) for nesting_prefix in nesting_prefixes]
+
+
+def invalidate_instances_cache(prefix: str, pks: Optional[Iterable] = None):
+    """Invalidate the cache entries of instances changed outside of mutations.
+
+    Used for changes made by signals, tasks and stock management, e.g. of prices
+    and availability. Without `pks` every entry of the prefix is dropped. The
+    primary keys may be a lazy queryset, it's evaluated once the transaction is
+    committed.
+    """
+    if not is_redis_cache():
+        return
+
+    def invalidate():
+        if pks is None:
+            tags = [get_cache_tag(prefix)]
+        else:
+            tags = [get_cache_tag(prefix, pk) for pk in set(pks)]
+            if not tags:
+                return
+            tags.append(get_cache_tag(prefix, LIST_TAG))
+        invalidate_cache_tags(tags + get_nesting_cache_tags(prefix))
+
+    transaction.on_commit(invalidate)
+
+
+def get_resolver_cache_tags(prefix: str, value) -> List[str]:
+    node = getattr(value, "node", value)
+    meta = getattr(node, "_meta", None)
+    if getattr(meta, "object_name", None) == prefix and node.pk is not None:
+        return [get_cache_tag(prefix, node.pk)]
+    # missing instances are tagged as lists, so creating them drops the entry
+    return [get_cache_tag(prefix, LIST_TAG)]
+
+
 def cached_resolver(prefix: "str", with_user: "bool" = False):
+    """Mark a root query resolver as cacheable by the GraphQL response cache.
+
+    The resolver result itself is never cached. The response cache of the view
+    stores the serialized response of operations whose root fields are all
+    resolved by cached resolvers, tagged with the instances they returned.
+    Responses of `with_user` resolvers are cached per user.
+    """
     def decorator(func):
         def wrapper(*args, **kwargs):
-            if not is_redis_cache():
+            info = next(arg for arg in args if isinstance(arg, ResolveInfo))
+            recorder = getattr(info.context, "response_cache", None)
+            if recorder is None or len(info.path) != 1:
                 return func(*args, **kwargs)
 
-            info = next(arg for arg in args if isinstance(arg, ResolveInfo))
-            user = info.context.user
-            operation = f"{info.parent_type.name}:{info.field_name}"
+            recorder.add_field(info.path[0], with_user=with_user)
+            recorder.add_tags([get_cache_tag(prefix)])
+            # tags of instances are read after they're fetched, changes of instances
+            # bump the tag of the lists as well, so it's read before to detect them
+            list_tag = get_cache_tag(prefix, LIST_TAG)
+            list_versions = get_cache_tag_versions([list_tag])
+            value = func(*args, **kwargs)
+            recorder.add_tags(get_resolver_cache_tags(prefix, value), list_versions)
+            return value
+        return wrapper
+    return decorator
 
-            if type(kwargs) != 'str':
-                variables = json.dumps(kwargs).replace(' ', '')
-            else:
-                variables = kwargs
 
-            if with_user and user is not None and user.id is not None:
-                key = f"{prefix}:{operation}:{user.id}:{variables}"
-            else:
-                key = f"{prefix}:{operation}:{variables}"
+def get_cache_version_key(prefix: str) -> str:
+    return f"{prefix}:version"
 
-            cached_value = cache.get(key)
 
-            if cached_value:
-                # logger.debug(f"Using cache: {key}")
-                return cached_value
-            else:
-                # logger.debug(f"Key: {key}")
-                value = func(*args, **kwargs)
-                cache.set(key, value)
-                return value
-        return wrapper
-    return decorator
+def get_cache_version(prefix: str) -> str:
+    """Return the version stamp of data kept in process memory.
+
+    Processes compare the stamp with the one their data was built for. A missing
+    stamp, never set or evicted, is replaced by a new one by the first process.
+    """
+    key = get_cache_version_key(prefix)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(prefix: str):
+    """Make all processes rebuild the data of the prefix kept in their memory."""
+    cache.set(get_cache_version_key(prefix), uuid.uuid4().hex, timeout=None)
+
+
+class ProcessCache:
+    """Data kept in process memory until the version of its prefix changes.
+
+    The version is kept in the cache, so all processes rebuild their data once any
+    of them invalidates it, which requires a cache shared by all of them, e.g.
+    Redis. The data is rebuilt as well when it's requested for another key, e.g.
+    a new time bucket.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._data: Tuple[Optional[Tuple[str, Hashable]], Any] = (None, None)
+        self._lock = threading.Lock()
+
+    def get(self, build: Callable[[str], Any], key: Hashable = None) -> Any:
+        """Return the data of the key, built by `build(version)` when outdated."""
+        data_key = (get_cache_version(self.prefix), key)
+        cached_key, data = self._data
+        if cached_key == data_key:
+            return data
+
+        with self._lock:
+            # another thread could have rebuilt the data while waiting for the lock
+            cached_key, data = self._data
+            if cached_key == data_key:
+                return data
+            data = build(data_key[0])
+            self._data = (data_key, data)
+            return data
+
+    def clear(self):
+        """Drop the data of this process only."""
+        self._data = (None, None)
+
+    def invalidate(self):
+        """Make all processes rebuild their data."""
+        bump_cache_version(self.prefix)
+
+    def invalidate_on_commit(self, sender=None, **kwargs):
+        """Invalidate the data once the transaction is committed.
+
+        Processes rebuilding before the commit would cache the old data. Used as a
+        receiver of the signals of the models the data is built from.
+        """
+        transaction.on_commit(self.invalidate)
+
+
+def get_redis_client():
+    return get_redis_connection("default")
 
 
 def is_redis_cache():
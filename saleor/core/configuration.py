@@ -0,0 +1,56 @@
+import copy
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+
+from ..channel.models import Channel
+from .caching import CachePrefix, ProcessCache
+
+# the sites cache of the process is cleared once per configuration version
+sites_cache = ProcessCache(CachePrefix.CONFIGURATION)
+# channels of the process by slug
+channels_cache = ProcessCache(CachePrefix.CONFIGURATION)
+
+
+def refresh_sites_cache():
+    """Clear the sites cache of the process if a site changed in any process.
+
+    Sites and their settings are loaded once per process by the patched
+    `Site.objects.get_current` and reused until the configuration version changes,
+    instead of being queried on every request.
+    """
+    if not settings.CONFIGURATION_CACHE_ENABLED:
+        Site.objects.clear_cache()
+        return
+
+    sites_cache.get(lambda version: Site.objects.clear_cache())
+
+
+def get_cached_channels() -> Dict[str, Channel]:
+    return channels_cache.get(
+        lambda version: {channel.slug: channel for channel in Channel.objects.all()}
+    )
+
+
+def get_channel_by_slug(slug: str) -> Optional[Channel]:
+    """Return the channel of the slug or None if it doesn't exist.
+
+    Channels are loaded once per process and reused until the configuration
+    version changes. A copy is returned, so callers can't alter the shared instance.
+    """
+    if not settings.CONFIGURATION_CACHE_ENABLED:
+        return Channel.objects.filter(slug=str(slug)).first()
+    channel = get_cached_channels().get(str(slug))
+    return copy.copy(channel) if channel else None
+
+
+def get_all_channels() -> List[Channel]:
+    if not settings.CONFIGURATION_CACHE_ENABLED:
+        return list(Channel.objects.all())
+    return [copy.copy(channel) for channel in get_cached_channels().values()]
+
+
+def invalidate_configuration_cache():
+    """Make all processes reload their sites and channels."""
+    channels_cache.invalidate()
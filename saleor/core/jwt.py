@@ -1,19 +1,25 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 import graphene
 import jwt
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils.crypto import get_random_string
 from graphql_relay import from_global_id
 
+from .caching import CachePrefix, is_redis_cache
 from .error_codes import TokenDeactivatedError
 from ..account.models import User
 from ..app.models import App
 from .jwt_manager import get_jwt_manager
 from .permissions import (
     get_permission_names,
+    get_permissions_by_codename,
+    get_permissions_enum_dict,
     get_permissions_from_codenames,
-    get_permissions_from_names,
 )
 
 JWT_ACCESS_TYPE = "access"
@@ -105,6 +111,11 @@ def create_refresh_token(
 
 
 def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
+    user_jwt_token = payload.get("token")
+    user = get_cached_user_from_payload(payload)
+    if user is not None:
+        return user
+
     user = User.objects.filter(email=payload["email"], is_active=True).first()
 
     # VALCOME use user_id as backup (to not throw error if user changes email over
@@ -113,7 +124,6 @@ def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
         _, user_id = from_global_id(payload["user_id"])
         user = User.objects.filter(id=user_id, is_active=True).first()
 
-    user_jwt_token = payload.get("token")
     if not user_jwt_token or not user:
         raise jwt.InvalidTokenError(
             "Invalid token (get_user_from_payload). Create new one by using tokenCreate mutation."
@@ -123,9 +133,62 @@ def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
         raise TokenDeactivatedError(
             "TokenDeactivatedError: This token already got deactivated."
         )
+
+    if is_redis_cache():
+        cache.set(
+            get_jwt_user_cache_key(user.pk, user_jwt_token),
+            user,
+            timeout=settings.JWT_USER_CACHE_TIMEOUT,
+        )
     return user
 
 
+def get_cached_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
+    """Return the active user of the token from the short-lived principal cache.
+
+    Entries are keyed by the user and the token key, so tokens signed with a
+    rotated key never match. Entries are dropped when the key is rotated or the
+    user is saved, e.g. deactivated.
+    """
+    user_jwt_token = payload.get("token")
+    if not user_jwt_token or not is_redis_cache():
+        return None
+    try:
+        _, user_id = from_global_id(payload.get("user_id") or "")
+    except Exception:
+        return None
+    if not user_id:
+        return None
+    return cache.get(get_jwt_user_cache_key(user_id, user_jwt_token))
+
+
+def get_jwt_user_cache_key(user_id: Any, jwt_token_key: str) -> str:
+    return f"{CachePrefix.JWT_USER}:{user_id}:{jwt_token_key}"
+
+
+def invalidate_jwt_user_cache(users: Union[User, Iterable[User], "QuerySet[User]"]):
+    """Drop the cached token users once the transaction is committed.
+
+    Dropped earlier, they could be cached again by a concurrent request as they
+    were before the commit. Cache keys are taken from the users as they are now.
+    """
+    if not is_redis_cache():
+        return
+    if isinstance(users, User):
+        users = [users]
+    elif isinstance(users, QuerySet):
+        users = users.only("pk", "jwt_token_key")
+    keys = [get_jwt_user_cache_key(user.pk, user.jwt_token_key) for user in users]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def rotate_jwt_token_key(user: User):
+    """Deactivate all tokens of the user by generating a new token key."""
+    invalidate_jwt_user_cache(user)
+    user.jwt_token_key = get_random_string()
+
+
 def is_saleor_token(token: str) -> bool:
     """Confirm that token was generated by Saleor not by plugin."""
     try:
@@ -155,16 +218,36 @@ def get_user_from_access_payload(payload: dict) -> Optional[User]:
     user = get_user_from_payload(payload)
     if user:
         if permissions is not None:
-            token_permissions = get_permissions_from_names(permissions)
-            token_codenames = [perm.codename for perm in token_permissions]
-            user.effective_permissions = get_permissions_from_codenames(token_codenames)
-            user.is_staff = True if user.effective_permissions else False
+            set_token_permissions(user, permissions)
 
         if payload.get("is_staff"):
             user.is_staff = True
     return user
 
 
+def set_token_permissions(user: User, permission_names: List[str]):
+    """Limit the user permissions to the permissions carried by the token.
+
+    Permissions are resolved from the process-local codename map, so checking
+    them doesn't query the database.
+    """
+    permission_enums = get_permissions_enum_dict()
+    permissions_by_codename = get_permissions_by_codename()
+    token_permissions = [
+        permissions_by_codename[codename]
+        for codename in {permission_enums[name].codename for name in permission_names}
+        if codename in permissions_by_codename
+    ]
+    user.effective_permissions = get_permissions_from_codenames(
+        [perm.codename for perm in token_permissions]
+    )
+    # permission names checked by the auth backend
+    user._effective_permissions_cache = {
+        f"{perm.content_type.app_label}.{perm.codename}" for perm in token_permissions
+    }
+    user.is_staff = True if token_permissions else False
+
+
 def create_access_token_for_app(app: "App", user: "User"):
     """Create access token for app.
 
@@ -11,11 +11,11 @@ from ...utils.stream_data import (
     create_page_type,
     create_users,
     create_gatling_test_user, create_page_translation, create_user_object,
+    create_stream_ticket,
 )
 from ....account.models import User, Address
 from ....account.utils import create_superuser
 from ....app.models import App
-from ....streaming.models import StreamTicket
 
 
 class Command(BaseCommand):
@@ -38,7 +38,7 @@ class Command(BaseCommand):
         create_user_object("e2e3@valcome.dev", "KG5gTEhNJa&K@?&5#KG4YBXDS94dPnnmfXtMqNqR")
 
         user = User.objects.filter(email="dev@valcome.tv").first()
-        self.create_stream_ticket(user)
+        create_stream_ticket(user)
 
         add_address_to_admin(credentials["email"])
 
@@ -91,20 +91,6 @@ class Command(BaseCommand):
         for msg in create_page_translation(withdrawal):
             self.stdout.write(msg)
 
-    def create_stream_ticket(self, user):
-        stream_ticket = StreamTicket()
-        stream_ticket.game_id = 1
-        stream_ticket.user = user
-        stream_ticket.stream_type = 'Game'
-        stream_ticket.game_id = "14"
-        stream_ticket.season_id = None
-        stream_ticket.team_ids = None
-        stream_ticket.expires = None
-        stream_ticket.type = "single"
-        stream_ticket.product_slug = "single"
-        stream_ticket.save()
-        return stream_ticket
-
     def create_company_address(self):
         company_address = Address(
             company_name="Valcome Innovation GmbH",
@@ -9,9 +9,11 @@ from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language
 
 from ..streaming import stream_settings
-from ..discount.utils import fetch_discounts
+from ..discount.snapshot import fetch_discounts_snapshot
+from ..plugins.base_plugin import plugins_request_scope
 from ..plugins.manager import get_plugins_manager
 from . import analytics
+from .configuration import refresh_sites_cache
 from .jwt import JWT_REFRESH_TOKEN_COOKIE_NAME, jwt_decode_with_exception_handler
 
 logger = logging.getLogger(__name__)
@@ -52,7 +54,7 @@ def discounts(get_response):
 
     def _discounts_middleware(request):
         request.discounts = SimpleLazyObject(
-            lambda: fetch_discounts(request.request_time)
+            lambda: fetch_discounts_snapshot(request.request_time)
         )
         return get_response(request)
 
@@ -60,16 +62,18 @@ def discounts(get_response):
 
 
 def site(get_response):
-    """Clear the Sites cache and assign the current site to `request.site`.
+    """Refresh the Sites cache and assign the current site to `request.site`.
 
     By default django.contrib.sites caches Site instances at the module
     level. This leads to problems when updating Site instances, as it's
     required to restart all application servers in order to invalidate
-    the cache. Using this middleware solves this problem.
+    the cache. Using this middleware solves this problem: the cache is cleared
+    when the configuration version changes, or on every request if the
+    configuration cache is disabled.
     """
 
     def _get_site():
-        Site.objects.clear_cache()
+        refresh_sites_cache()
         return Site.objects.get_current()
 
     def _site_middleware(request):
@@ -87,7 +91,9 @@ def plugins(get_response):
 
     def _plugins_middleware(request):
         request.plugins = SimpleLazyObject(lambda: _get_manager())
-        return get_response(request)
+        # plugins are shared between requests, their request state is not
+        with plugins_request_scope():
+            return get_response(request)
 
     return _plugins_middleware
 
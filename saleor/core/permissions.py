@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Iterable, List
+from typing import Dict, Iterable, List
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
@@ -97,6 +97,9 @@ PERMISSIONS_ENUMS = [
     CheckoutPermissions,
 ]
 
+# filled on first use by `get_permissions_by_codename`
+PERMISSIONS_BY_CODENAME: Dict[str, "Permission"] = {}
+
 
 def split_permission_codename(permissions):
     return [permission.split(".")[1] for permission in permissions]
@@ -153,6 +156,15 @@ def get_permissions(permissions=None):
     return get_permissions_from_codenames(codenames)
 
 
+def get_permissions_by_codename() -> Dict[str, "Permission"]:
+    """Return the saleor permissions by codename, loaded once per process."""
+    if not PERMISSIONS_BY_CODENAME:
+        PERMISSIONS_BY_CODENAME.update(
+            {permission.codename: permission for permission in get_permissions()}
+        )
+    return PERMISSIONS_BY_CODENAME
+
+
 def get_permissions_from_codenames(permission_codenames: List[str]):
     return (
         Permission.objects.filter(codename__in=permission_codenames)
@@ -0,0 +1,59 @@
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..caching import CachePrefix, ProcessCache, get_cache_version_key
+
+PREFIX = f"{CachePrefix.CONFIGURATION}:Test"
+
+
+@pytest.fixture
+def process_cache():
+    cache.delete(get_cache_version_key(PREFIX))
+    yield ProcessCache(PREFIX)
+    cache.delete(get_cache_version_key(PREFIX))
+
+
+def test_process_cache_reuses_data_until_invalidated(process_cache):
+    build = Mock(side_effect=lambda version: object())
+    data = process_cache.get(build)
+
+    assert process_cache.get(build) is data
+    build.assert_called_once()
+
+    process_cache.invalidate()
+
+    assert process_cache.get(build) is not data
+    assert build.call_count == 2
+
+
+def test_process_cache_rebuilt_for_other_key(process_cache):
+    build = Mock(side_effect=lambda version: object())
+    data = process_cache.get(build, key=1)
+
+    assert process_cache.get(build, key=2) is not data
+    assert build.call_count == 2
+
+
+def test_process_cache_invalidated_by_other_process(process_cache):
+    # caches of other processes share the version in the cache
+    other_process_cache = ProcessCache(PREFIX)
+    data = process_cache.get(lambda version: object())
+
+    other_process_cache.invalidate()
+
+    assert process_cache.get(lambda version: object()) is not data
+
+
+def test_process_cache_invalidated_on_commit(process_cache):
+    data = process_cache.get(lambda version: object())
+
+    with TestCase.captureOnCommitCallbacks() as callbacks:
+        process_cache.invalidate_on_commit(sender=None)
+        # data read before the commit is still up to date
+        assert process_cache.get(lambda version: object()) is data
+    callbacks[0]()
+
+    assert process_cache.get(lambda version: object()) is not data
@@ -0,0 +1,95 @@
+import pytest
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..caching import CachePrefix, get_cache_version_key
+from ..configuration import (
+    channels_cache,
+    get_channel_by_slug,
+    invalidate_configuration_cache,
+    refresh_sites_cache,
+    sites_cache,
+)
+
+
+@pytest.fixture
+def configuration_cache(settings):
+    settings.CONFIGURATION_CACHE_ENABLED = True
+    channels_cache.clear()
+    sites_cache.clear()
+    cache.delete(get_cache_version_key(CachePrefix.CONFIGURATION))
+    yield
+    channels_cache.clear()
+    sites_cache.clear()
+    cache.delete(get_cache_version_key(CachePrefix.CONFIGURATION))
+    Site.objects.clear_cache()
+
+
+def test_get_channel_by_slug_served_from_memory(
+    configuration_cache, channel_USD, django_assert_num_queries
+):
+    get_channel_by_slug(channel_USD.slug)
+
+    with django_assert_num_queries(0):
+        channel = get_channel_by_slug(channel_USD.slug)
+        missing_channel = get_channel_by_slug("missing")
+
+    assert channel == channel_USD
+    assert channel is not get_channel_by_slug(channel_USD.slug)
+    assert missing_channel is None
+
+
+def test_get_channel_by_slug_reloaded_after_channel_change(
+    configuration_cache, channel_USD
+):
+    get_channel_by_slug(channel_USD.slug)
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        channel_USD.name = "New name"
+        channel_USD.save(update_fields=["name"])
+
+    assert get_channel_by_slug(channel_USD.slug).name == "New name"
+
+
+def test_get_channel_by_slug_without_cache(channel_USD, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        channel = get_channel_by_slug(channel_USD.slug)
+
+    assert channel == channel_USD
+
+
+def test_refresh_sites_cache_keeps_current_site(
+    configuration_cache, site_settings, django_assert_num_queries
+):
+    refresh_sites_cache()
+    Site.objects.get_current()
+
+    refresh_sites_cache()
+    with django_assert_num_queries(0):
+        site = Site.objects.get_current()
+
+    assert site.settings == site_settings
+
+
+def test_refresh_sites_cache_after_site_settings_change(
+    configuration_cache, site_settings
+):
+    refresh_sites_cache()
+    Site.objects.get_current()
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        site_settings.header_text = "New header"
+        site_settings.save(update_fields=["header_text"])
+
+    refresh_sites_cache()
+    assert Site.objects.get_current().settings.header_text == "New header"
+
+
+def test_invalidate_configuration_cache_changes_version(configuration_cache):
+    refresh_sites_cache()
+    version = cache.get(get_cache_version_key(CachePrefix.CONFIGURATION))
+
+    invalidate_configuration_cache()
+
+    assert cache.get(get_cache_version_key(CachePrefix.CONFIGURATION)) != version
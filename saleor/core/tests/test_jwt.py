@@ -1,7 +1,18 @@
 import jwt
+import pytest
 from cryptography.hazmat.primitives import serialization
+from django.core.cache import cache
+from django.test import TestCase
 
-from ..jwt import jwt_decode, jwt_encode
+from ..error_codes import TokenDeactivatedError
+from ..jwt import (
+    create_access_token,
+    get_user_from_access_token,
+    jwt_decode,
+    jwt_encode,
+    rotate_jwt_token_key,
+)
+from ..permissions import get_permissions_by_codename
 
 
 def test_jwt_decode_accepts_token_signed_with_hs256(settings):
@@ -41,3 +52,98 @@ def test_jwt_encode_creates_token_signed_with_rs256(settings):
     # then
     headers = jwt.get_unverified_header(token)
     assert headers.get("alg") == "RS256"
+
+
+@pytest.fixture
+def jwt_user_cache(monkeypatch):
+    monkeypatch.setattr("saleor.core.jwt.is_redis_cache", lambda: True)
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_get_user_from_access_token_is_cached(
+    jwt_user_cache, customer_user, django_assert_num_queries
+):
+    # given
+    token = create_access_token(customer_user)
+    get_user_from_access_token(token)
+
+    # when
+    with django_assert_num_queries(0):
+        user = get_user_from_access_token(token)
+
+    # then
+    assert user == customer_user
+
+
+def test_get_user_from_access_token_cache_dropped_on_key_rotation(
+    jwt_user_cache, customer_user
+):
+    # given
+    token = create_access_token(customer_user)
+    get_user_from_access_token(token)
+
+    # when
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        rotate_jwt_token_key(customer_user)
+        customer_user.save(update_fields=["jwt_token_key"])
+
+    # then
+    with pytest.raises(TokenDeactivatedError):
+        get_user_from_access_token(token)
+
+
+def test_get_user_from_access_token_cache_dropped_on_deactivation(
+    jwt_user_cache, customer_user
+):
+    # given
+    token = create_access_token(customer_user)
+    get_user_from_access_token(token)
+
+    # when
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        customer_user.is_active = False
+        customer_user.save(update_fields=["is_active"])
+        # the deactivation isn't committed yet
+        assert get_user_from_access_token(token) == customer_user
+
+    # then
+    with pytest.raises(jwt.InvalidTokenError):
+        get_user_from_access_token(token)
+
+
+def test_get_user_from_access_token_cache_dropped_on_deletion(
+    jwt_user_cache, customer_user
+):
+    # given
+    token = create_access_token(customer_user)
+    get_user_from_access_token(token)
+
+    # when
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        customer_user.delete()
+
+    # then
+    with pytest.raises(jwt.InvalidTokenError):
+        get_user_from_access_token(token)
+
+
+def test_token_permissions_resolved_without_permission_queries(
+    customer_user, django_assert_num_queries
+):
+    # given
+    token = create_access_token(customer_user, {"permissions": ["MANAGE_USERS"]})
+    get_permissions_by_codename()
+
+    # when
+    # only the user is fetched, permissions are resolved from the token
+    with django_assert_num_queries(1):
+        user = get_user_from_access_token(token)
+        has_perm = user.has_perm("account.manage_users")
+        has_other_perm = user.has_perm("order.manage_orders")
+
+    # then
+    assert user.is_staff
+    assert has_perm
+    assert not has_other_perm
@@ -36,6 +36,7 @@ from ...attribute.models import (
     AttributeValue,
     AttributeVariant,
 )
+from ...attribute.utils import update_product_attribute_sort_keys
 from ...channel.models import Channel
 from ...checkout import AddressType
 from ...core.permissions import (
@@ -358,6 +359,7 @@ def assign_attributes_to_products(product_attributes):
         )
         if created:
             assoc.values.set(AttributeValue.objects.filter(pk__in=assigned_values))
+    update_product_attribute_sort_keys()
 
 
 def assign_attributes_to_variants(variant_attributes):
@@ -4,6 +4,7 @@ from django.utils import timezone
 
 from .random_data import create_address
 from ...page.models import Page, PageType, PageTranslation
+from ...streaming.models import StreamTicket
 from ..utils import random_data
 from ...tests.utils import dummy_editorjs
 
@@ -36,6 +37,21 @@ def create_user_object(email, password):
     user.addresses.add(address)
     return user
 
+
+def create_stream_ticket(user, game_id="14"):
+    stream_ticket = StreamTicket()
+    stream_ticket.user = user
+    stream_ticket.stream_type = 'Game'
+    stream_ticket.game_id = game_id
+    stream_ticket.season_id = None
+    stream_ticket.team_ids = None
+    stream_ticket.expires = None
+    stream_ticket.type = "single"
+    stream_ticket.product_slug = "single"
+    stream_ticket.save()
+    return stream_ticket
+
+
 def create_users(how_many=10):
     for dummy in range(how_many):
         user = random_data.create_fake_user("password")
@@ -1,3 +1,5 @@
+default_app_config = "saleor.discount.app.DiscountAppConfig"
+
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Union
 
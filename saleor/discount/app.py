@@ -0,0 +1,41 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class DiscountAppConfig(AppConfig):
+    name = "saleor.discount"
+
+    def ready(self):
+        from ..channel.models import Channel
+        from ..product.models import Category
+        from .models import Sale, SaleChannelListing, Voucher, VoucherChannelListing
+        from .signals import invalidate_product_cache
+        from .snapshot import discounts_snapshot_cache
+
+        # categories are stored with their descendants and listings by channel slug
+        for model in [Sale, SaleChannelListing, Category, Channel]:
+            for signal in [post_save, post_delete]:
+                signal.connect(
+                    discounts_snapshot_cache.invalidate_on_commit,
+                    sender=model,
+                    dispatch_uid=f"invalidate_discounts_snapshot_{model.__name__}",
+                )
+        for field in ["categories", "collections", "products", "variants"]:
+            m2m_changed.connect(
+                discounts_snapshot_cache.invalidate_on_commit,
+                sender=getattr(Sale, field).through,
+                dispatch_uid=f"invalidate_discounts_snapshot_sale_{field}",
+            )
+        for model in [Sale, SaleChannelListing, Voucher, VoucherChannelListing]:
+            for signal in [post_save, post_delete]:
+                signal.connect(
+                    invalidate_product_cache,
+                    sender=model,
+                    dispatch_uid=f"invalidate_product_cache_{model.__name__}",
+                )
+        for field in ["categories", "collections", "products", "variants"]:
+            m2m_changed.connect(
+                invalidate_product_cache,
+                sender=getattr(Sale, field).through,
+                dispatch_uid=f"invalidate_product_cache_sale_{field}",
+            )
@@ -0,0 +1,9 @@
+from ..core.caching import CachePrefix, invalidate_instances_cache
+
+
+def invalidate_product_cache(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {"used"}:
+        # usage of vouchers is counted by every order placed with them
+        return
+    # cached responses nest the discounted prices of products
+    invalidate_instances_cache(CachePrefix.PRODUCT)
@@ -0,0 +1,138 @@
+import datetime
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q
+
+from ..core.caching import CachePrefix, ProcessCache
+from . import DiscountInfo
+from .models import Sale, SaleChannelListing
+from .utils import (
+    fetch_categories,
+    fetch_collections,
+    fetch_discounts,
+    fetch_products,
+    fetch_variants,
+)
+
+SALE_FIELDS = [field.attname for field in Sale._meta.concrete_fields]
+SALE_CHANNEL_LISTING_FIELDS = [
+    field.attname for field in SaleChannelListing._meta.concrete_fields
+]
+
+# discounts of the process active within the time bucket they were built for
+discounts_snapshot_cache = ProcessCache(CachePrefix.DISCOUNTS_SNAPSHOT)
+
+
+def fetch_discounts_snapshot(date: datetime.datetime) -> List[DiscountInfo]:
+    """Return the discounts active at the date, like `fetch_discounts`.
+
+    Sales which are active at any time of the time bucket of the date are kept in
+    process memory and in the cache, until the bucket ends or a sale, its
+    catalogue or a category changes. Sales starting or ending within the bucket
+    are filtered by their dates, so they don't need a new snapshot.
+    """
+    if not settings.DISCOUNTS_SNAPSHOT_ENABLED or not isinstance(
+        date, datetime.datetime
+    ):
+        return fetch_discounts(date)
+
+    return [
+        discount
+        for discount in get_discounts_snapshot(date)
+        if is_sale_active(discount.sale, date)
+    ]
+
+
+def get_discounts_snapshot(date: datetime.datetime) -> List[DiscountInfo]:
+    bucket = get_time_bucket(date)
+    return discounts_snapshot_cache.get(
+        lambda version: load_discounts_snapshot(version, bucket), key=bucket
+    )
+
+
+def load_discounts_snapshot(version: str, bucket: int) -> List[DiscountInfo]:
+    """Return the snapshot of the bucket from the cache or build it."""
+    cache_key = get_discounts_snapshot_cache_key(version, bucket)
+    data = cache.get(cache_key)
+    if data is None:
+        start, end = get_time_bucket_range(bucket)
+        data = serialize_discounts_snapshot(start, end)
+        # the snapshot is useless once the bucket ends
+        cache.set(cache_key, data, timeout=settings.DISCOUNTS_SNAPSHOT_BUCKET * 2)
+    return deserialize_discounts_snapshot(data)
+
+
+def serialize_discounts_snapshot(
+    start: datetime.datetime, end: datetime.datetime
+) -> dict:
+    """Fetch the sales active within the range in a compact, picklable form.
+
+    Instances are stored as tuples of their field values.
+    """
+    sales = list(
+        Sale.objects.filter(
+            Q(end_date__isnull=True) | Q(end_date__gte=start), start_date__lte=end
+        ).values_list(*SALE_FIELDS)
+    )
+    pk_index = SALE_FIELDS.index("id")
+    pks = {sale[pk_index] for sale in sales}
+    channel_listings = list(
+        SaleChannelListing.objects.filter(sale_id__in=pks)
+        .annotate(channel_slug=F("channel__slug"))
+        .values_list("channel_slug", *SALE_CHANNEL_LISTING_FIELDS)
+    )
+
+    return {
+        "sales": sales,
+        "channel_listings": channel_listings,
+        "categories": fetch_categories(pks),
+        "collections": fetch_collections(pks),
+        "products": fetch_products(pks),
+        "variants": fetch_variants(pks),
+    }
+
+
+def deserialize_discounts_snapshot(data: dict) -> List[DiscountInfo]:
+    channel_listings: Dict[int, Dict[str, SaleChannelListing]] = {}
+    for channel_slug, *values in data["channel_listings"]:
+        channel_listing = SaleChannelListing.from_db(
+            None, SALE_CHANNEL_LISTING_FIELDS, values
+        )
+        channel_listing.channel_slug = channel_slug
+        sale_listings = channel_listings.setdefault(channel_listing.sale_id, {})
+        sale_listings[channel_slug] = channel_listing
+
+    discounts = []
+    for values in data["sales"]:
+        sale = Sale.from_db(None, SALE_FIELDS, values)
+        discounts.append(
+            DiscountInfo(
+                sale=sale,
+                category_ids=data["categories"].get(sale.pk, set()),
+                channel_listings=channel_listings.get(sale.pk, {}),
+                collection_ids=data["collections"].get(sale.pk, set()),
+                product_ids=data["products"].get(sale.pk, set()),
+                variants_ids=data["variants"].get(sale.pk, set()),
+            )
+        )
+    return discounts
+
+
+def is_sale_active(sale: Sale, date: datetime.datetime) -> bool:
+    return sale.start_date <= date and (sale.end_date is None or sale.end_date >= date)
+
+
+def get_time_bucket(date: datetime.datetime) -> int:
+    return int(date.timestamp() // settings.DISCOUNTS_SNAPSHOT_BUCKET)
+
+
+def get_time_bucket_range(bucket: int) -> Tuple[datetime.datetime, datetime.datetime]:
+    size = settings.DISCOUNTS_SNAPSHOT_BUCKET
+    start = datetime.datetime.fromtimestamp(bucket * size, tz=datetime.timezone.utc)
+    return start, start + datetime.timedelta(seconds=size)
+
+
+def get_discounts_snapshot_cache_key(version: str, bucket: int) -> str:
+    return f"{CachePrefix.DISCOUNTS_SNAPSHOT}:{version}:{bucket}"
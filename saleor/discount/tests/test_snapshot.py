@@ -0,0 +1,91 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from ...core.caching import CachePrefix, get_cache_version_key
+from ..snapshot import (
+    discounts_snapshot_cache,
+    fetch_discounts_snapshot,
+    get_time_bucket,
+    get_time_bucket_range,
+)
+from ..utils import fetch_discounts
+
+
+@pytest.fixture
+def discounts_snapshot(settings):
+    settings.DISCOUNTS_SNAPSHOT_ENABLED = True
+    settings.DISCOUNTS_SNAPSHOT_BUCKET = 3600
+    discounts_snapshot_cache.clear()
+    cache.delete(get_cache_version_key(CachePrefix.DISCOUNTS_SNAPSHOT))
+    yield
+    discounts_snapshot_cache.clear()
+    cache.delete(get_cache_version_key(CachePrefix.DISCOUNTS_SNAPSHOT))
+
+
+def test_fetch_discounts_snapshot_matches_fetch_discounts(
+    discounts_snapshot, sale, channel_USD
+):
+    date = timezone.now()
+
+    discounts = fetch_discounts_snapshot(date)
+
+    expected_discounts = fetch_discounts(date)
+    assert len(discounts) == len(expected_discounts) == 1
+    discount, expected_discount = discounts[0], expected_discounts[0]
+    assert discount.sale == expected_discount.sale
+    assert discount.sale.type == expected_discount.sale.type
+    assert discount.category_ids == expected_discount.category_ids
+    assert discount.collection_ids == expected_discount.collection_ids
+    assert discount.product_ids == expected_discount.product_ids
+    assert discount.variants_ids == expected_discount.variants_ids
+    channel_listing = discount.channel_listings[channel_USD.slug]
+    expected_channel_listing = expected_discount.channel_listings[channel_USD.slug]
+    assert channel_listing.discount_value == expected_channel_listing.discount_value
+    assert channel_listing.currency == expected_channel_listing.currency
+
+
+def test_fetch_discounts_snapshot_served_from_memory(
+    discounts_snapshot, sale, django_assert_num_queries
+):
+    date = timezone.now()
+    fetch_discounts_snapshot(date)
+
+    with django_assert_num_queries(0):
+        discounts = fetch_discounts_snapshot(date)
+
+    assert [discount.sale for discount in discounts] == [sale]
+
+
+def test_fetch_discounts_snapshot_sale_starting_within_bucket(
+    discounts_snapshot, sale, django_assert_num_queries
+):
+    bucket_start, _ = get_time_bucket_range(get_time_bucket(timezone.now()))
+    sale.start_date = bucket_start + timedelta(minutes=10)
+    sale.save(update_fields=["start_date"])
+
+    assert fetch_discounts_snapshot(bucket_start + timedelta(minutes=1)) == []
+    with django_assert_num_queries(0):
+        discounts = fetch_discounts_snapshot(bucket_start + timedelta(minutes=20))
+
+    assert [discount.sale for discount in discounts] == [sale]
+
+
+def test_fetch_discounts_snapshot_rebuilt_after_sale_changed(
+    discounts_snapshot, sale, channel_USD
+):
+    date = timezone.now()
+    fetch_discounts_snapshot(date)
+    channel_listing = sale.channel_listings.get(channel=channel_USD)
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        channel_listing.discount_value = Decimal("15")
+        channel_listing.save(update_fields=["discount_value"])
+
+    discounts = fetch_discounts_snapshot(date)
+    new_channel_listing = discounts[0].channel_listings[channel_USD.slug]
+    assert new_channel_listing.discount_value == Decimal("15")
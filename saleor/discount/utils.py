@@ -346,4 +346,6 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
 
 
 def fetch_active_discounts() -> List[DiscountInfo]:
-    return fetch_discounts(timezone.now())
+    from .snapshot import fetch_discounts_snapshot
+
+    return fetch_discounts_snapshot(timezone.now())
@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 
 from ...account import models
 from ...account.error_codes import AccountErrorCode
+from ...core.jwt import invalidate_jwt_user_cache
 from ...core.permissions import AccountPermissions
 from ..core.mutations import BaseBulkMutation, ModelBulkDeleteMutation
 from ..core.types.common import AccountError, StaffError
@@ -21,6 +22,11 @@ class UserBulkDelete(ModelBulkDeleteMutation):
     class Meta:
         abstract = True
 
+    @classmethod
+    def bulk_action(cls, info, queryset):
+        invalidate_jwt_user_cache(queryset)
+        super().bulk_action(info, queryset)
+
 
 class CustomerBulkDelete(CustomerDeleteMixin, UserBulkDelete):
     class Meta:
@@ -109,4 +115,5 @@ class UserBulkSetActive(BaseBulkMutation):
 
     @classmethod
     def bulk_action(cls, info, queryset, is_active):
+        invalidate_jwt_user_cache(queryset)
         queryset.update(is_active=is_active)
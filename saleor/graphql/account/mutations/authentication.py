@@ -6,7 +6,6 @@ from django.core.exceptions import ValidationError
 from django.middleware.csrf import _compare_masked_tokens  # type: ignore
 from django.middleware.csrf import _get_new_csrf_token
 from django.utils import timezone
-from django.utils.crypto import get_random_string
 from graphene.types.generic import GenericScalar
 from sentry_sdk import capture_exception
 
@@ -20,7 +19,8 @@ from ....core.jwt import (
     create_access_token,
     create_refresh_token,
     get_user_from_payload,
-    jwt_decode
+    jwt_decode,
+    rotate_jwt_token_key,
 )
 from ....core.permissions import get_permissions_from_names
 from ...core.mutations import BaseMutation
@@ -134,7 +134,7 @@ class CreateToken(BaseMutation):
 
         # VALCOME: logout all generic users
         if not user.is_superuser:
-            user.jwt_token_key = get_random_string()
+            rotate_jwt_token_key(user)
 
         access_token = create_access_token(user)
         csrf_token = _get_new_csrf_token()
@@ -335,7 +335,7 @@ class DeactivateAllUserTokens(BaseMutation):
     @classmethod
     def perform_mutation(cls, root, info, **data):
         user = info.context.user
-        user.jwt_token_key = get_random_string()
+        rotate_jwt_token_key(user)
         user.save(update_fields=["jwt_token_key"])
         return cls()
 
@@ -22,6 +22,7 @@ from ..core.enums import LanguageCodeEnum
 from ..core.federation import resolve_federation_references
 from ..core.fields import PrefetchingConnectionField
 from ..core.scalars import UUID
+from ..core.total_count import CountStrategy
 from ..core.types import CountryDisplay, Image, Permission
 from ..core.utils import from_global_id_or_error, str_to_enum
 from ..decorators import one_of_permissions_required, permission_required
@@ -281,6 +282,7 @@ class User(CountableDjangoObjectType):
         description = "Represents user data."
         interfaces = [relay.Node, ObjectWithMetadata]
         model = get_user_model()
+        count_strategy = CountStrategy.CAPPED
         only_fields = [
             "date_joined",
             "default_billing_address",
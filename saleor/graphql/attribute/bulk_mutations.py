@@ -1,6 +1,7 @@
 import graphene
 
 from ...attribute import models
+from ...attribute.utils import update_product_attribute_sort_keys
 from ...core.permissions import PageTypePermissions
 from ..core.mutations import ModelBulkDeleteMutation
 from ..core.types.common import AttributeError
@@ -34,3 +35,18 @@ class AttributeValueBulkDelete(ModelBulkDeleteMutation):
         permissions = (PageTypePermissions.MANAGE_PAGE_TYPES_AND_ATTRIBUTES,)
         error_type_class = AttributeError
         error_type_field = "attribute_errors"
+
+    @classmethod
+    def bulk_action(cls, info, queryset):
+        # assignments of the values are deleted with them
+        assignments = list(
+            models.AssignedProductAttribute.objects.filter(
+                values__in=queryset
+            ).values_list("product_id", "assignment__attribute_id")
+        )
+        queryset.delete()
+        if assignments:
+            product_ids, attribute_ids = map(set, zip(*assignments))
+            update_product_attribute_sort_keys(
+                product_ids=product_ids, attribute_ids=attribute_ids
+            )
@@ -7,6 +7,7 @@ from django.utils.text import slugify
 from ...attribute import ATTRIBUTE_PROPERTIES_CONFIGURATION, AttributeInputType
 from ...attribute import models as models
 from ...attribute.error_codes import AttributeErrorCode
+from ...attribute.utils import update_product_attribute_sort_keys
 from ...core.caching import CachePrefix, invalidate_cache
 from ...core.exceptions import PermissionDenied
 from ...core.permissions import (
@@ -16,6 +17,10 @@ from ...core.permissions import (
 )
 from ...core.tracing import traced_atomic_transaction
 from ...core.utils import generate_unique_slug
+from ...product.search import (
+    get_product_ids_with_attribute_values,
+    mark_products_search_index_dirty,
+)
 from ..attribute.types import Attribute, AttributeValue
 from ..core.enums import MeasurementUnitsEnum
 from ..core.inputs import ReorderInput
@@ -501,7 +506,7 @@ class AttributeUpdate(AttributeMixin, ModelMutation):
             attribute_value.delete()
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT)
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def perform_mutation(cls, _root, info, id, input):
         instance = cls.get_node_or_error(info, id, only_type=Attribute)
 
@@ -535,7 +540,7 @@ class AttributeDelete(ModelDeleteMutation):
         error_type_field = "attribute_errors"
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT)
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def perform_mutation(cls, _root, info, **data):
         super().perform_mutation(_root, info, **data)
 
@@ -629,8 +634,17 @@ class AttributeValueUpdate(ModelMutation):
         super().clean_instance(info, instance)
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT)
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def success_response(cls, instance):
+        mark_products_search_index_dirty(
+            get_product_ids_with_attribute_values([instance.pk])
+        )
+        update_product_attribute_sort_keys(
+            product_ids=models.AssignedProductAttribute.objects.filter(
+                values=instance
+            ).values("product_id"),
+            attribute_ids=[instance.attribute_id],
+        )
         response = super().success_response(instance)
         response.attribute = instance.attribute
         return response
@@ -649,6 +663,19 @@ class AttributeValueDelete(ModelDeleteMutation):
         error_type_class = AttributeError
         error_type_field = "attribute_errors"
 
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        node_id = data.get("id")
+        instance = cls.get_node_or_error(info, node_id, only_type=AttributeValue)
+        # assignments of the value are deleted with it
+        product_ids = get_product_ids_with_attribute_values([instance.pk])
+        response = super().perform_mutation(_root, info, **data)
+        mark_products_search_index_dirty(product_ids)
+        update_product_attribute_sort_keys(
+            product_ids=product_ids, attribute_ids=[instance.attribute_id]
+        )
+        return response
+
     @classmethod
     def success_response(cls, instance):
         response = super().success_response(instance)
@@ -719,5 +746,6 @@ class AttributeReorderValues(BaseMutation):
 
         with traced_atomic_transaction():
             perform_reordering(values_m2m, operations)
+            update_product_attribute_sort_keys(attribute_ids=[attribute.pk])
         attribute.refresh_from_db(fields=["values"])
         return AttributeReorderValues(attribute=attribute)
@@ -5,6 +5,7 @@ from graphql.error import GraphQLError
 from ...channel.exceptions import ChannelNotDefined, NoDefaultChannel
 from ...channel.models import Channel
 from ...channel.utils import get_default_channel
+from ...core.configuration import get_channel_by_slug
 
 
 def get_default_channel_slug_or_graphql_error() -> SimpleLazyObject:
@@ -29,9 +30,8 @@ def get_default_channel_or_graphql_error() -> Channel:
 
 
 def validate_channel(channel_slug, error_class):
-    try:
-        channel = Channel.objects.get(slug=channel_slug)
-    except Channel.DoesNotExist:
+    channel = get_channel_by_slug(channel_slug)
+    if channel is None:
         raise ValidationError(
             {
                 "channel": ValidationError(
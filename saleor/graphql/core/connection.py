@@ -11,7 +11,8 @@ from graphql.error import GraphQLError
 from graphql_relay.connection.connectiontypes import Edge, PageInfo
 from graphql_relay.utils import base64, unbase64
 
-from ..core.enums import OrderDirection
+from ..core.enums import CountStrategyEnum, OrderDirection
+from .total_count import CountStrategy, TotalCount, get_total_count
 
 ConnectionArguments = Dict[str, Any]
 
@@ -298,13 +299,37 @@ class CountableConnection(NonNullConnection):
     class Meta:
         abstract = True
 
+    # strategy of counting `totalCount`, selectable per connection
+    count_strategy = CountStrategy.EXACT
+
     total_count = graphene.Int(description="A total count of items in the collection.")
+    total_count_strategy = CountStrategyEnum(
+        description="Strategy used to count the items of the collection."
+    )
+    total_count_is_exact = graphene.Boolean(
+        description=(
+            "Determine if the total count is exact. Estimated counts and capped "
+            "counts of longer collections are not."
+        )
+    )
+
+    @classmethod
+    def get_total_count(cls, root) -> TotalCount:
+        if getattr(root, "_total_count", None) is None:
+            root._total_count = get_total_count(root.iterable, cls.count_strategy)
+        return root._total_count
 
-    @staticmethod
-    def resolve_total_count(root, *_args, **_kwargs):
-        if isinstance(root.iterable, list):
-            return len(root.iterable)
-        return root.iterable.count()
+    @classmethod
+    def resolve_total_count(cls, root, *_args, **_kwargs):
+        return cls.get_total_count(root).count
+
+    @classmethod
+    def resolve_total_count_strategy(cls, root, *_args, **_kwargs):
+        return cls.get_total_count(root).strategy
+
+    @classmethod
+    def resolve_total_count_is_exact(cls, root, *_args, **_kwargs):
+        return cls.get_total_count(root).is_exact
 
 
 class CountableDjangoObjectType(DjangoObjectType):
@@ -312,9 +337,11 @@ class CountableDjangoObjectType(DjangoObjectType):
         abstract = True
 
     @classmethod
-    def __init_subclass_with_meta__(cls, *args, **kwargs):
+    def __init_subclass_with_meta__(cls, *args, count_strategy=None, **kwargs):
         # Force it to use the countable connection
         countable_conn = CountableConnection.create_type(
             "{}CountableConnection".format(cls.__name__), node=cls
         )
+        if count_strategy:
+            countable_conn.count_strategy = count_strategy
         super().__init_subclass_with_meta__(*args, connection=countable_conn, **kwargs)
@@ -33,6 +33,7 @@ from ...warehouse import error_codes as warehouse_error_codes
 from ...webhook import error_codes as webhook_error_codes
 from ...wishlist import error_codes as wishlist_error_codes
 from ..shop import error_codes as shop_error_codes
+from .total_count import CountStrategy
 from .utils import str_to_enum
 
 
@@ -91,6 +92,7 @@ LanguageCodeEnum = graphene.Enum(
 NewsletterStatusEnum = graphene.Enum.from_enum(NewsletterStatus)
 
 JobStatusEnum = to_enum(JobStatus)
+CountStrategyEnum = to_enum(CountStrategy)
 PermissionEnum = graphene.Enum("PermissionEnum", get_permissions_enum_list())
 
 # unit enums
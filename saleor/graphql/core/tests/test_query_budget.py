@@ -0,0 +1,126 @@
+import logging
+
+import pytest
+from graphql import get_default_backend
+
+from ...api import schema
+from ...query_budget import (
+    OTHER_OPERATIONS,
+    OperationQueries,
+    QueryStats,
+    account_queries,
+    get_operation_name,
+    get_sql_fingerprint,
+    normalize_sql,
+    query_stats,
+)
+from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+
+QUERY_PRODUCT_NAMES = """
+    query ProductNames($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def clean_query_stats():
+    query_stats.reset()
+    yield query_stats
+    query_stats.reset()
+
+
+def test_normalize_sql():
+    sql = (
+        'SELECT "product"."id" FROM "product" WHERE ("product"."id" IN (%s, %s, %s) '
+        "AND \"product\".\"name\" = 'Shirt') LIMIT 21"
+    )
+
+    assert normalize_sql(sql) == (
+        'SELECT "product"."id" FROM "product" WHERE ("product"."id" IN (%s, ...) '
+        'AND "product"."name" = ?) LIMIT ?'
+    )
+
+
+def test_operation_queries_detects_repeated_statements():
+    queries = OperationQueries("ProductNames")
+
+    def execute(sql, params, many, context):
+        return None
+
+    for _ in range(3):
+        queries(execute, "SELECT * FROM product WHERE id = %s", [1], False, {})
+    queries(execute, "SELECT * FROM category", None, False, {})
+
+    fingerprint = get_sql_fingerprint("SELECT * FROM product WHERE id = %s")
+    assert queries.count == 4
+    assert queries.get_repeated_statements(3) == [(fingerprint, 3)]
+
+
+def test_get_operation_name_from_document():
+    document = get_default_backend().document_from_string(schema, QUERY_PRODUCT_NAMES)
+
+    assert get_operation_name(document, None) == "ProductNames"
+    assert get_operation_name(document, "Other") == "Other"
+    assert get_operation_name(None, None) is None
+
+
+def test_account_queries_records_stats(product, clean_query_stats):
+    with account_queries("ProductNames") as queries:
+        list(product.variants.all())
+        list(product.variants.all())
+
+    assert queries.count == 2
+    stats = clean_query_stats.as_dict()["ProductNames"]
+    assert stats["requests"] == 1
+    assert stats["queries"] == 2
+    assert stats["top_statements"][0]["count"] == 2
+
+
+def test_query_stats_aggregates_operations_above_limit(monkeypatch):
+    monkeypatch.setattr("saleor.graphql.query_budget.MAX_TRACKED_OPERATIONS", 2)
+    stats = QueryStats()
+
+    for operation_name in ["First", "Second", "Third", "Fourth", "First"]:
+        stats.add(OperationQueries(operation_name, count=1), False, False)
+
+    operations = stats.as_dict()
+    assert sorted(operations) == ["First", OTHER_OPERATIONS, "Second"]
+    assert operations["First"]["requests"] == 2
+    assert operations[OTHER_OPERATIONS]["requests"] == 2
+
+
+def test_query_budget_exceeded_fails_operation(
+    api_client, product_list, channel_USD, settings, clean_query_stats
+):
+    settings.GRAPHQL_QUERY_BUDGETS = {"ProductNames": 0}
+
+    response = api_client.post_graphql(
+        QUERY_PRODUCT_NAMES, {"channel": channel_USD.slug}
+    )
+    content = get_graphql_content_from_response(response)
+
+    assert "exceeding its budget of 0" in content["errors"][0]["message"]
+    assert clean_query_stats.as_dict()["ProductNames"]["budget_exceeded"] == 1
+
+
+def test_query_budget_exceeded_logged(
+    api_client, product_list, channel_USD, settings, caplog, clean_query_stats
+):
+    settings.GRAPHQL_QUERY_BUDGETS = {"ProductNames": 0}
+    settings.GRAPHQL_QUERY_BUDGET_RAISE = False
+
+    with caplog.at_level(logging.WARNING, logger="saleor.graphql.query_budget"):
+        response = api_client.post_graphql(
+            QUERY_PRODUCT_NAMES, {"channel": channel_USD.slug}
+        )
+
+    content = get_graphql_content(response)
+    assert len(content["data"]["products"]["edges"]) == len(product_list)
+    assert "exceeding its budget of 0" in caplog.text
@@ -0,0 +1,99 @@
+from django.core.cache import cache
+
+from ....account.models import User
+from ....order.models import Order
+from ...tests.utils import get_graphql_content
+from ..total_count import CountStrategy, TotalCount, get_total_count
+
+
+def test_get_total_count_of_list():
+    assert get_total_count([1, 2, 3], CountStrategy.CAPPED) == TotalCount(
+        3, CountStrategy.EXACT
+    )
+
+
+def test_get_total_count_exact(order_list):
+    total_count = get_total_count(Order.objects.all(), CountStrategy.EXACT)
+
+    assert total_count == TotalCount(len(order_list), CountStrategy.EXACT)
+
+
+def test_get_total_count_capped(order_list, settings):
+    settings.GRAPHQL_TOTAL_COUNT_CAP = len(order_list) - 1
+
+    total_count = get_total_count(Order.objects.all(), CountStrategy.CAPPED)
+
+    assert total_count == TotalCount(
+        len(order_list) - 1, CountStrategy.CAPPED, is_exact=False
+    )
+
+
+def test_get_total_count_capped_below_cap(order_list, settings):
+    settings.GRAPHQL_TOTAL_COUNT_CAP = len(order_list)
+
+    total_count = get_total_count(Order.objects.all(), CountStrategy.CAPPED)
+
+    assert total_count == TotalCount(len(order_list), CountStrategy.CAPPED)
+
+
+def test_get_total_count_cached(order_list, monkeypatch, django_assert_num_queries):
+    monkeypatch.setattr("saleor.graphql.core.total_count.is_redis_cache", lambda: True)
+    cache.clear()
+    qs = Order.objects.filter(pk__in=[order.pk for order in order_list])
+    get_total_count(qs, CountStrategy.CACHED)
+
+    with django_assert_num_queries(0):
+        total_count = get_total_count(qs, CountStrategy.CACHED)
+
+    assert total_count == TotalCount(len(order_list), CountStrategy.CACHED)
+    # different filters are counted separately
+    other_qs = qs.exclude(pk=order_list[0].pk)
+    assert get_total_count(other_qs, CountStrategy.CACHED).count == len(order_list) - 1
+    cache.clear()
+
+
+def test_get_total_count_estimated_small_list_is_exact(order_list):
+    qs = Order.objects.filter(pk__in=[order.pk for order in order_list])
+
+    total_count = get_total_count(qs, CountStrategy.ESTIMATED)
+
+    assert total_count == TotalCount(len(order_list), CountStrategy.EXACT)
+
+
+def test_get_total_count_estimated_from_query_plan(order_list, settings):
+    settings.GRAPHQL_TOTAL_COUNT_EXACT_THRESHOLD = 0
+    qs = Order.objects.filter(pk__in=[order.pk for order in order_list])
+
+    total_count = get_total_count(qs, CountStrategy.ESTIMATED)
+
+    assert total_count.strategy == CountStrategy.ESTIMATED
+    assert total_count.is_exact is False
+    assert total_count.count >= 1
+
+
+QUERY_CUSTOMERS_TOTAL_COUNT = """
+    query {
+        customers(first: 1) {
+            totalCount
+            totalCountStrategy
+            totalCountIsExact
+        }
+    }
+"""
+
+
+def test_query_customers_total_count_capped(
+    staff_api_client, permission_manage_users, user_list, settings
+):
+    customers_count = User.objects.customers().count()
+    settings.GRAPHQL_TOTAL_COUNT_CAP = customers_count - 1
+
+    response = staff_api_client.post_graphql(
+        QUERY_CUSTOMERS_TOTAL_COUNT, permissions=[permission_manage_users]
+    )
+    content = get_graphql_content(response)
+
+    data = content["data"]["customers"]
+    assert data["totalCount"] == customers_count - 1
+    assert data["totalCountStrategy"] == "CAPPED"
+    assert data["totalCountIsExact"] is False
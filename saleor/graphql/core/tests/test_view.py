@@ -2,11 +2,14 @@ from unittest import mock
 
 import graphene
 import pytest
+from django.core.cache import cache
 from django.test import override_settings
 from graphql.execution.base import ExecutionResult
+from graphql.validation import validate
 
 from .... import __version__ as saleor_version
 from ....demo.views import EXAMPLE_QUERY
+from ...query_cache import document_cache, get_query_hash
 from ...tests.fixtures import (
     ACCESS_CONTROL_ALLOW_CREDENTIALS,
     ACCESS_CONTROL_ALLOW_HEADERS,
@@ -416,3 +419,101 @@ def test_introspection_query_is_not_cached_in_debug_mode(
 def test_generate_cache_key_use_saleor_version():
     cache_key = generate_cache_key(INTROSPECTION_QUERY)
     assert saleor_version in cache_key
+
+
+PERSISTED_QUERY = "query PersistedShop { shop { name } }"
+
+
+def get_persisted_query_extensions(query):
+    return {
+        "persistedQuery": {"version": 1, "sha256Hash": get_query_hash(query)}
+    }
+
+
+def test_persisted_query_not_found(api_client):
+    cache.clear()
+    document_cache.clear()
+    data = {"extensions": get_persisted_query_extensions(PERSISTED_QUERY)}
+
+    response = api_client.post(data)
+
+    assert response.status_code == 200
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_registered_and_executed_by_hash(api_client, site_settings):
+    cache.clear()
+    document_cache.clear()
+    extensions = get_persisted_query_extensions(PERSISTED_QUERY)
+
+    register_response = api_client.post(
+        {"query": PERSISTED_QUERY, "extensions": extensions}
+    )
+    document_cache.clear()
+    response = api_client.post({"extensions": extensions})
+
+    assert get_graphql_content(register_response)["data"]["shop"]["name"]
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    data = {
+        "query": "{ shop { name } }",
+        "extensions": get_persisted_query_extensions(PERSISTED_QUERY),
+    }
+
+    response = api_client.post(data)
+
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256Hash does not match query."
+    )
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERIES_ENABLED=False)
+def test_persisted_queries_disabled(api_client):
+    document_cache.clear()
+    data = {"extensions": get_persisted_query_extensions(PERSISTED_QUERY)}
+
+    response = api_client.post(data)
+
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERIES_ENABLED=False)
+def test_persisted_queries_disabled_skips_cached_document(api_client, site_settings):
+    document_cache.clear()
+    # documents of executed queries are cached by the hash of the query
+    get_graphql_content(api_client.post({"query": PERSISTED_QUERY}))
+    data = {"extensions": get_persisted_query_extensions(PERSISTED_QUERY)}
+
+    response = api_client.post(data)
+
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+def test_document_is_parsed_once(api_client, monkeypatch):
+    document_cache.clear()
+    query = "query CachedShop { shop { name } }"
+    mocked_validate = mock.Mock(wraps=validate)
+    monkeypatch.setattr("saleor.graphql.views.validate", mocked_validate)
+
+    get_graphql_content(api_client.post_graphql(query))
+    get_graphql_content(api_client.post_graphql(query))
+
+    mocked_validate.assert_called_once()
+    assert document_cache.stats()["hits"] == 1
+    assert document_cache.stats()["misses"] == 1
+
+
+def test_invalid_document_is_not_cached(api_client):
+    document_cache.clear()
+
+    response = api_client.post_graphql("{ shop }")
+
+    assert response.status_code == 400
+    assert document_cache.stats()["size"] == 0
@@ -0,0 +1,123 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+
+from ...core.caching import CachePrefix, is_redis_cache
+
+
+class CountStrategy:
+    """Strategies of counting items of a connection for `totalCount`."""
+
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    CAPPED = "capped"
+
+    CHOICES = [
+        (EXACT, "Exact count."),
+        (CACHED, "Exact count, cached for a short time per filter."),
+        (ESTIMATED, "Estimate of the database planner for large lists."),
+        (CAPPED, "Exact count up to a limit."),
+    ]
+
+
+@dataclass
+class TotalCount:
+    count: int
+    strategy: str
+    is_exact: bool = True
+
+
+def get_total_count(iterable: Union[list, QuerySet], strategy: str) -> TotalCount:
+    if isinstance(iterable, list):
+        return TotalCount(len(iterable), CountStrategy.EXACT)
+
+    # ordering doesn't change the count, but makes the database sort the rows
+    qs = iterable.order_by()
+    if strategy == CountStrategy.CACHED:
+        return count_cached(qs)
+    if strategy == CountStrategy.ESTIMATED:
+        return count_estimated(qs)
+    if strategy == CountStrategy.CAPPED:
+        return count_capped(qs, settings.GRAPHQL_TOTAL_COUNT_CAP)
+    return TotalCount(qs.count(), CountStrategy.EXACT)
+
+
+def count_cached(qs: QuerySet) -> TotalCount:
+    """Count the rows exactly and cache the count for the query and its filters.
+
+    Counts are only cached in Redis, shared by all processes.
+    """
+    if not is_redis_cache():
+        return TotalCount(qs.count(), CountStrategy.EXACT)
+
+    key = get_count_cache_key(qs)
+    count = cache.get(key)
+    if count is None:
+        count = qs.count()
+        cache.set(key, count, timeout=settings.GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT)
+    return TotalCount(count, CountStrategy.CACHED)
+
+
+def count_estimated(qs: QuerySet) -> TotalCount:
+    """Estimate the count from the table statistics or the query plan.
+
+    Unfiltered lists use the row count of the table statistics, filtered ones the
+    row estimate of the query plan. Estimates below the exact threshold are
+    replaced by an exact count, as small lists are cheap to count.
+    """
+    try:
+        if qs.query.where:
+            estimate = get_query_plan_rows(qs)
+        else:
+            estimate = get_table_rows(qs)
+    except DatabaseError:
+        estimate = None
+
+    if estimate is None or estimate < settings.GRAPHQL_TOTAL_COUNT_EXACT_THRESHOLD:
+        return TotalCount(qs.count(), CountStrategy.EXACT)
+    return TotalCount(estimate, CountStrategy.ESTIMATED, is_exact=False)
+
+
+def count_capped(qs: QuerySet, cap: int) -> TotalCount:
+    """Count the rows up to the cap, e.g. to display "10000+" for larger lists."""
+    count = qs[: cap + 1].count()
+    if count > cap:
+        return TotalCount(cap, CountStrategy.CAPPED, is_exact=False)
+    return TotalCount(count, CountStrategy.CAPPED)
+
+
+def get_table_rows(qs: QuerySet):
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [qs.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # tables which were never analyzed have no statistics
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def get_query_plan_rows(qs: QuerySet):
+    sql, params = qs.query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+def get_count_cache_key(qs: QuerySet) -> str:
+    sql, params = qs.query.sql_with_params()
+    query = json.dumps([sql, params], default=str)
+    query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    return f"{CachePrefix.TOTAL_COUNT}:{query_hash}"
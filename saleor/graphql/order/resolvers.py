@@ -1,4 +1,4 @@
-from ...channel.models import Channel
+from ...core.configuration import get_channel_by_slug
 from ...core.exceptions import PermissionDenied
 from ...core.tracing import traced_resolver
 from ...order import OrderStatus, models
@@ -30,7 +30,7 @@ def resolve_draft_orders(_info, **_kwargs):
 def resolve_orders_total(_info, period, channel_slug):
     if channel_slug is None:
         channel_slug = get_default_channel_slug_or_graphql_error()
-    channel = Channel.objects.filter(slug=str(channel_slug)).first()
+    channel = get_channel_by_slug(channel_slug)
     if not channel:
         return None
     qs = (
@@ -46,6 +46,7 @@ from ..core.connection import CountableDjangoObjectType
 from ..core.enums import LanguageCodeEnum
 from ..core.mutations import validation_error_to_error_type
 from ..core.scalars import PositiveDecimal
+from ..core.total_count import CountStrategy
 from ..core.types.common import Image, OrderError
 from ..core.types.money import Money, TaxedMoney
 from ..core.utils import str_to_enum
@@ -722,6 +723,7 @@ class Order(CountableDjangoObjectType):
         description = "Represents an order in the shop."
         interfaces = [relay.Node, ObjectWithMetadata]
         model = models.Order
+        count_strategy = CountStrategy.CACHED
         only_fields = [
             "billing_address",
             "created",
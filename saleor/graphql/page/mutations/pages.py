@@ -111,7 +111,7 @@ class PageCreate(ModelMutation):
             AttributeAssignmentMixin.save(instance, attributes)
 
     @classmethod
-    @invalidate_cache(CachePrefix.PAGE_PATTERN)
+    @invalidate_cache(CachePrefix.PAGE)
     def save(cls, info, instance, cleaned_input):
         super().save(info, instance, cleaned_input)
         info.context.plugins.page_created(instance)
@@ -132,7 +132,7 @@ class PageUpdate(PageCreate):
         error_type_field = "page_errors"
 
     @classmethod
-    @invalidate_cache(CachePrefix.PAGE_PATTERN)
+    @invalidate_cache(CachePrefix.PAGE)
     def save(cls, info, instance, cleaned_input):
         super(PageCreate, cls).save(info, instance, cleaned_input)
         info.context.plugins.page_updated(instance)
@@ -151,7 +151,7 @@ class PageDelete(ModelDeleteMutation):
 
     @classmethod
     @traced_atomic_transaction()
-    @invalidate_cache(CachePrefix.PAGE_PATTERN)
+    @invalidate_cache(CachePrefix.PAGE)
     def perform_mutation(cls, _root, info, **data):
         page = cls.get_instance(info, **data)
         cls.delete_assigned_attribute_values(page)
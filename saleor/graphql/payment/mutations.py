@@ -1,11 +1,11 @@
 import graphene
 from django.core.exceptions import ValidationError
 
-from ...channel.models import Channel
 from ...checkout.calculations import calculate_checkout_total_with_gift_cards
 from ...checkout.checkout_cleaner import clean_billing_address, clean_checkout_shipping
 from ...checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from ...checkout.utils import cancel_active_payments
+from ...core.configuration import get_channel_by_slug
 from ...core.permissions import OrderPermissions
 from ...core.utils import get_client_ip
 from ...core.utils.url import validate_storefront_url
@@ -317,9 +317,8 @@ class PaymentInitialize(BaseMutation):
 
     @classmethod
     def validate_channel(cls, channel_slug):
-        try:
-            channel = Channel.objects.get(slug=channel_slug)
-        except Channel.DoesNotExist:
+        channel = get_channel_by_slug(channel_slug)
+        if channel is None:
             raise ValidationError(
                 {
                     "channel": ValidationError(
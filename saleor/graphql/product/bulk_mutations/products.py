@@ -16,6 +16,7 @@ from ....order import models as order_models
 from ....order.tasks import recalculate_orders_task
 from ....product import models
 from ....product.error_codes import ProductErrorCode
+from ....product.search import mark_products_search_index_dirty
 from ....product.tasks import update_product_discounted_price_task
 from ....product.utils import delete_categories
 from ....product.utils.variants import generate_and_set_variant_name
@@ -63,7 +64,7 @@ class CategoryBulkDelete(ModelBulkDeleteMutation):
         error_type_field = "product_errors"
 
     @classmethod
-    @invalidate_cache(CachePrefix.CATEGORY_PATTERN)
+    @invalidate_cache(CachePrefix.CATEGORY)
     def bulk_action(cls, info, queryset):
         delete_categories(queryset.values_list("pk", flat=True), info.context.plugins)
 
@@ -82,6 +83,7 @@ class CollectionBulkDelete(ModelBulkDeleteMutation):
         error_type_field = "collection_errors"
 
     @classmethod
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def bulk_action(cls, info, queryset):
         collections_ids = queryset.values_list("id", flat=True)
         products = list(
@@ -109,7 +111,7 @@ class ProductBulkDelete(ModelBulkDeleteMutation):
 
     @classmethod
     @traced_atomic_transaction()
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, _root, info, ids, **data):
         try:
             pks = cls.get_global_ids_or_error(ids, Product)
@@ -373,7 +375,7 @@ class ProductVariantBulkCreate(BaseMutation):
             error_dict[key].extend(value)
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def save(cls, info, instance, cleaned_input):
         instance.save()
 
@@ -516,6 +518,7 @@ class ProductVariantBulkCreate(BaseMutation):
 
         # Recalculate the "discounted price" for the parent product
         update_product_discounted_price_task.delay(product.pk)
+        mark_products_search_index_dirty([product.pk])
 
         instances = [
             ChannelContext(node=instance, channel_slug=None) for instance in instances
@@ -550,7 +553,7 @@ class ProductVariantBulkDelete(ModelBulkDeleteMutation):
 
     @classmethod
     @traced_atomic_transaction()
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, _root, info, ids, **data):
         try:
             pks = cls.get_global_ids_or_error(ids, ProductVariant)
@@ -607,6 +610,7 @@ class ProductVariantBulkDelete(ModelBulkDeleteMutation):
         for product in products:
             product.default_variant = product.variants.first()
             product.save(update_fields=["default_variant"])
+        mark_products_search_index_dirty(product_pks)
 
         return response
 
@@ -641,7 +645,7 @@ class ProductVariantStocksCreate(BaseMutation):
         error_type_field = "bulk_stock_errors"
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, root, info, **data):
         errors = defaultdict(list)
         stocks = data["stocks"]
@@ -708,7 +712,7 @@ class ProductVariantStocksUpdate(ProductVariantStocksCreate):
         error_type_field = "bulk_stock_errors"
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, root, info, **data):
         errors = defaultdict(list)
         stocks = data["stocks"]
@@ -762,7 +766,7 @@ class ProductVariantStocksDelete(BaseMutation):
         error_type_field = "stock_errors"
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, root, info, **data):
         variant = cls.get_node_or_error(
             info, data["variant_id"], only_type=ProductVariant
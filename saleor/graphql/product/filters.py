@@ -21,6 +21,7 @@ from ...attribute.models import (
     AttributeValue,
 )
 from ...channel.models import Channel
+from ...core.configuration import get_channel_by_slug
 from ...product.models import (
     Category,
     Collection,
@@ -270,7 +271,7 @@ def filter_products_by_variant_price(qs, channel_slug, price_lte=None, price_gte
 def filter_products_by_minimal_price(
     qs, channel_slug, minimal_price_lte=None, minimal_price_gte=None
 ):
-    channel = Channel.objects.filter(slug=channel_slug).first()
+    channel = get_channel_by_slug(channel_slug)
     if not channel:
         return qs
     product_channel_listings = ProductChannelListing.objects.filter(
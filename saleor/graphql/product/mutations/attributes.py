@@ -180,7 +180,7 @@ class ProductAttributeAssign(BaseMutation):
 
     @classmethod
     @traced_atomic_transaction()
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def perform_mutation(cls, _root, info, **data):
         product_type_id: str = data["product_type_id"]
         operations: List[ProductAttributeAssignInput] = data["operations"]
@@ -245,7 +245,7 @@ class ProductAttributeUnassign(BaseMutation):
         getattr(product_type, field).remove(*pks)
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def perform_mutation(cls, _root, info, **data):
         product_type_id: str = data["product_type_id"]
         attribute_ids: List[str] = data["attribute_ids"]
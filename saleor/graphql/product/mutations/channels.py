@@ -274,7 +274,7 @@ class ProductChannelListingUpdate(BaseChannelListingMutation):
         info.context.plugins.product_updated(product)
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, _root, info, id, input):
         qs = ProductModel.objects.prefetched_for_webhook()
         product = cls.get_node_or_error(info, id, only_type=Product, field="id", qs=qs)
@@ -439,7 +439,7 @@ class ProductVariantChannelListingUpdate(BaseMutation):
         )
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, _root, info, id, input):
         qs = ProductVariantModel.objects.prefetched_for_webhook()
         variant: "ProductVariantModel" = cls.get_node_or_error(  # type: ignore
@@ -518,6 +518,7 @@ class CollectionChannelListingUpdate(BaseChannelListingMutation):
         cls.remove_channels(collection, cleaned_input.get("remove_channels", []))
 
     @classmethod
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def perform_mutation(cls, _root, info, id, input):
         collection = cls.get_node_or_error(info, id, only_type=Collection, field="id")
         errors = defaultdict(list)
@@ -22,6 +22,10 @@ from ....order import models as order_models
 from ....order.tasks import recalculate_orders_task
 from ....product import ProductMediaTypes, models
 from ....product.error_codes import CollectionErrorCode, ProductErrorCode
+from ....product.search import (
+    mark_products_search_index_dirty,
+    schedule_products_search_index_update,
+)
 from ....product.tasks import (
     update_product_discounted_price_task,
     update_products_discounted_prices_of_catalogues_task,
@@ -124,7 +128,7 @@ class CategoryCreate(ModelMutation):
         return cleaned_input
 
     @classmethod
-    @invalidate_cache(CachePrefix.CATEGORY_PATTERN)
+    @invalidate_cache(CachePrefix.CATEGORY)
     def perform_mutation(cls, root, info, **data):
         parent_id = data.pop("parent_id", None)
         data["input"]["parent_id"] = parent_id
@@ -152,7 +156,7 @@ class CategoryUpdate(CategoryCreate):
         error_type_field = "product_errors"
 
     @classmethod
-    @invalidate_cache(CachePrefix.CATEGORY_PATTERN)
+    @invalidate_cache(CachePrefix.CATEGORY)
     def perform_mutation(cls, root, info, **data):
         return super().perform_mutation(root, info, **data)
 
@@ -169,7 +173,7 @@ class CategoryDelete(ModelDeleteMutation):
         error_type_field = "product_errors"
 
     @classmethod
-    @invalidate_cache(CachePrefix.CATEGORY_PATTERN)
+    @invalidate_cache(CachePrefix.CATEGORY)
     def perform_mutation(cls, _root, info, **data):
         if not cls.check_permissions(info.context):
             raise PermissionDenied()
@@ -254,6 +258,7 @@ class CollectionCreate(ModelMutation):
             info.context.plugins.product_updated(product)
 
     @classmethod
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def perform_mutation(cls, _root, info, **kwargs):
         result = super().perform_mutation(_root, info, **kwargs)
         return CollectionCreate(
@@ -299,6 +304,7 @@ class CollectionDelete(ModelDeleteMutation):
         error_type_field = "collection_errors"
 
     @classmethod
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def perform_mutation(cls, _root, info, **kwargs):
         node_id = kwargs.get("id")
 
@@ -349,6 +355,7 @@ class CollectionReorderProducts(BaseMutation):
         )
 
     @classmethod
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def perform_mutation(cls, _root, info, collection_id, moves):
         pk = cls.get_global_id_or_error(
             collection_id, only_type=Collection, field="collection_id"
@@ -417,6 +424,7 @@ class CollectionAddProducts(BaseMutation):
         error_type_field = "collection_errors"
 
     @classmethod
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     @traced_atomic_transaction()
     def perform_mutation(cls, _root, info, collection_id, products):
         collection = cls.get_node_or_error(
@@ -480,6 +488,7 @@ class CollectionRemoveProducts(BaseMutation):
         error_type_field = "collection_errors"
 
     @classmethod
+    @invalidate_cache(CachePrefix.PRODUCT, all_entries=True)
     def perform_mutation(cls, _root, info, collection_id, products):
         collection = cls.get_node_or_error(
             info, collection_id, field="collection_id", only_type=Collection
@@ -643,10 +652,12 @@ class ProductCreate(ModelMutation):
     @classmethod
     @traced_atomic_transaction()
     def save(cls, info, instance, cleaned_input):
+        instance.search_index_dirty = True
         instance.save()
         attributes = cleaned_input.get("attributes")
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
+        transaction.on_commit(schedule_products_search_index_update)
 
     @classmethod
     def _save_m2m(cls, info, instance, cleaned_data):
@@ -660,7 +671,7 @@ class ProductCreate(ModelMutation):
         info.context.plugins.product_created(product)
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, _root, info, **data):
         response = super().perform_mutation(_root, info, **data)
         product = getattr(response, cls._meta.return_field_name)
@@ -690,12 +701,14 @@ class ProductUpdate(ProductCreate):
 
     @classmethod
     @traced_atomic_transaction()
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def save(cls, info, instance, cleaned_input):
+        instance.search_index_dirty = True
         instance.save()
         attributes = cleaned_input.get("attributes")
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
+        transaction.on_commit(schedule_products_search_index_update)
 
     @classmethod
     def post_save_action(cls, info, instance, _cleaned_input):
@@ -721,7 +734,7 @@ class ProductDelete(ModelDeleteMutation):
 
     @classmethod
     @traced_atomic_transaction()
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, _root, info, **data):
         node_id = data.get("id")
 
@@ -940,7 +953,7 @@ class ProductVariantCreate(ModelMutation):
 
     @classmethod
     @traced_atomic_transaction()
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def save(cls, info, instance, cleaned_input):
         new_variant = instance.pk is None
         instance.save()
@@ -957,6 +970,7 @@ class ProductVariantCreate(ModelMutation):
         if attributes:
             AttributeAssignmentMixin.save(instance, attributes)
             generate_and_set_variant_name(instance, cleaned_input.get("sku"))
+        mark_products_search_index_dirty([instance.product_id])
 
         event_to_call = (
             info.context.plugins.product_variant_created
@@ -1040,6 +1054,7 @@ class ProductVariantDelete(ModelDeleteMutation):
     def success_response(cls, instance):
         # Update the "discounted_prices" of the parent product
         update_product_discounted_price_task.delay(instance.product_id)
+        mark_products_search_index_dirty([instance.product_id])
         product = models.Product.objects.get(id=instance.product_id)
         # if the product default variant has been removed set the new one
         if not product.default_variant:
@@ -1050,7 +1065,7 @@ class ProductVariantDelete(ModelDeleteMutation):
 
     @classmethod
     @traced_atomic_transaction()
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, _root, info, **data):
         node_id = data.get("id")
         instance = cls.get_node_or_error(info, node_id, only_type=ProductVariant)
@@ -1495,7 +1510,7 @@ class ProductVariantSetDefault(BaseMutation):
         error_type_field = "product_errors"
 
     @classmethod
-    @invalidate_cache(CachePrefix.PRODUCT_PATTERN)
+    @invalidate_cache(CachePrefix.PRODUCT)
     def perform_mutation(cls, _root, info, product_id, variant_id):
         qs = models.Product.objects.prefetched_for_webhook()
         product = cls.get_node_or_error(
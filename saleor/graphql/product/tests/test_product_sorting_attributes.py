@@ -682,3 +682,49 @@ def test_sort_product_by_attribute_using_attribute_having_no_products(
 
     assert len(products) == product_models.Product.objects.count()
     assert products[0]["node"]["name"] == expected_first_product.name
+
+
+def test_product_attribute_sort_keys_follow_assigned_values(products_structures):
+    colors_attr, _, _ = products_structures
+
+    sort_keys = attribute_models.AssignedProductAttributeSortKey.objects.filter(
+        attribute=colors_attr
+    ).values_list("values", flat=True)
+
+    assert sorted(sort_keys) == sorted(",".join(colors) for colors in COLORS * 2)
+
+
+UPDATE_ATTRIBUTE_VALUE_NAME_MUTATION = """
+mutation AttributeValueUpdate($id: ID!, $name: String!) {
+    attributeValueUpdate(id: $id, input: {name: $name}) {
+        errors {
+            field
+            message
+        }
+    }
+}
+"""
+
+
+def test_sort_product_by_attribute_after_value_renamed(
+    staff_api_client,
+    permission_manage_product_types_and_attributes,
+    products_structures,
+):
+    colors_attr, _, _ = products_structures
+    value = colors_attr.values.get(name="Pink")
+    variables = {
+        "id": graphene.Node.to_global_id("AttributeValue", value.pk),
+        "name": "Aqua",
+    }
+
+    response = staff_api_client.post_graphql(
+        UPDATE_ATTRIBUTE_VALUE_NAME_MUTATION,
+        variables,
+        permissions=[permission_manage_product_types_and_attributes],
+    )
+    content = get_graphql_content(response)
+
+    assert not content["data"]["attributeValueUpdate"]["errors"]
+    products = product_models.Product.objects.sort_by_attribute(colors_attr.pk)
+    assert [product.concatenated_values for product in products[:4]] == ["Aqua"] * 4
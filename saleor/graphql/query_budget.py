@@ -0,0 +1,226 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from graphql import GraphQLDocument
+from graphql.language import ast
+
+ANONYMOUS_OPERATION = "anonymous"
+# operation names are supplied by the clients, the names above the limit are
+# aggregated together, so the process stats can't grow without bounds
+MAX_TRACKED_OPERATIONS = 500
+OTHER_OPERATIONS = "other"
+# distinct statements remembered per operation by the process stats
+MAX_STATEMENTS_PER_OPERATION = 100
+
+IN_LIST_RE = re.compile(r"\(\s*%s(?:\s*,\s*%s)+\s*\)")
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+WHITESPACE_RE = re.compile(r"\s+")
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def normalize_sql(sql: str) -> str:
+    """Replace the literals of the statement, so its executions can be grouped.
+
+    Lists of parameters of any length are collapsed to a single one.
+    """
+    sql = STRING_RE.sub("?", sql)
+    sql = NUMBER_RE.sub("?", sql)
+    sql = IN_LIST_RE.sub("(%s, ...)", sql)
+    return WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def get_sql_fingerprint(normalized_sql: str) -> str:
+    return hashlib.md5(normalized_sql.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class OperationQueries:
+    """Queries executed by a single GraphQL operation.
+
+    Used as a database execute wrapper, see `account_queries`.
+    """
+
+    operation_name: str
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    samples: Dict[str, str] = field(default_factory=dict)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            normalized_sql = normalize_sql(sql)
+            fingerprint = get_sql_fingerprint(normalized_sql)
+            self.statements[fingerprint] += 1
+            self.samples.setdefault(fingerprint, normalized_sql)
+
+    def get_repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Return the statements executed at least threshold times, a sign of N+1."""
+        return [
+            (fingerprint, count)
+            for fingerprint, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+@dataclass
+class OperationStats:
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    duration: float = 0.0
+    n_plus_one: int = 0
+    budget_exceeded: int = 0
+    statements: Counter = field(default_factory=Counter)
+    samples: Dict[str, str] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries": round(self.queries / self.requests, 2),
+            "max_queries": self.max_queries,
+            "avg_duration_ms": round(self.duration / self.requests * 1000, 2),
+            "n_plus_one": self.n_plus_one,
+            "budget_exceeded": self.budget_exceeded,
+            "top_statements": [
+                {
+                    "fingerprint": fingerprint,
+                    "count": count,
+                    "sql": self.samples[fingerprint],
+                }
+                for fingerprint, count in self.statements.most_common(10)
+            ],
+        }
+
+
+class QueryStats:
+    """Aggregate the queries of the operations executed by the process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.operations: Dict[str, OperationStats] = {}
+
+    def add(self, queries: OperationQueries, n_plus_one: bool, budget_exceeded: bool):
+        with self.lock:
+            stats = self.get_operation_stats(queries.operation_name)
+            stats.requests += 1
+            stats.queries += queries.count
+            stats.max_queries = max(stats.max_queries, queries.count)
+            stats.duration += queries.duration
+            stats.n_plus_one += int(n_plus_one)
+            stats.budget_exceeded += int(budget_exceeded)
+            for fingerprint, count in queries.statements.items():
+                if fingerprint not in stats.samples:
+                    if len(stats.samples) >= MAX_STATEMENTS_PER_OPERATION:
+                        continue
+                    stats.samples[fingerprint] = queries.samples[fingerprint]
+                stats.statements[fingerprint] += count
+
+    def get_operation_stats(self, operation_name: str) -> OperationStats:
+        stats = self.operations.get(operation_name)
+        if stats is not None:
+            return stats
+        if len(self.operations) >= MAX_TRACKED_OPERATIONS:
+            operation_name = OTHER_OPERATIONS
+        return self.operations.setdefault(operation_name, OperationStats())
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            return {
+                name: stats.as_dict()
+                for name, stats in sorted(self.operations.items())
+            }
+
+    def reset(self):
+        with self.lock:
+            self.operations = {}
+
+
+query_stats = QueryStats()
+
+
+def get_query_budget(operation_name: str) -> Optional[int]:
+    return settings.GRAPHQL_QUERY_BUDGETS.get(
+        operation_name, settings.GRAPHQL_DEFAULT_QUERY_BUDGET
+    )
+
+
+def get_operation_name(
+    document: Optional[GraphQLDocument], operation_name: Optional[str]
+) -> Optional[str]:
+    """Return the name of the executed operation.
+
+    Clients can omit `operationName` for documents with a single operation, its
+    name is taken from the document then.
+    """
+    if operation_name or document is None:
+        return operation_name
+    operations = [
+        definition
+        for definition in document.document_ast.definitions
+        if isinstance(definition, ast.OperationDefinition)
+    ]
+    if len(operations) == 1 and operations[0].name:
+        return operations[0].name.value
+    return None
+
+
+@contextmanager
+def account_queries(operation_name: Optional[str]):
+    """Count the queries of the operation and check them against its budget.
+
+    Statements repeated within the operation are logged as possible N+1. Exceeding
+    the budget is logged too. The budget is checked once the operation is
+    executed, when its mutations are already committed, so `QueryBudgetExceeded`
+    is raised only with `GRAPHQL_QUERY_BUDGET_RAISE`, set by the test settings.
+    """
+    if not settings.GRAPHQL_QUERY_ACCOUNTING_ENABLED:
+        yield None
+        return
+
+    queries = OperationQueries(operation_name or ANONYMOUS_OPERATION)
+    with connection.execute_wrapper(queries):
+        yield queries
+
+    repeated_statements = queries.get_repeated_statements(
+        settings.GRAPHQL_N_PLUS_ONE_THRESHOLD
+    )
+    for fingerprint, count in repeated_statements:
+        logger.warning(
+            "Possible N+1 in %s, statement executed %d times: %s",
+            queries.operation_name,
+            count,
+            queries.samples[fingerprint],
+        )
+
+    budget = get_query_budget(queries.operation_name)
+    budget_exceeded = budget is not None and queries.count > budget
+    query_stats.add(queries, bool(repeated_statements), budget_exceeded)
+    if budget_exceeded:
+        message = (
+            f"Operation {queries.operation_name} executed {queries.count} queries, "
+            f"exceeding its budget of {budget}."
+        )
+        if settings.GRAPHQL_QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,137 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLDocument
+from graphql.backend import core as backend_core
+from graphql.error import GraphQLError
+
+from ..core.caching import CachePrefix
+from .utils import query_fingerprint
+
+PERSISTED_QUERY_VERSION = 1
+
+
+class PersistedQueryNotFound(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryNotSupported(GraphQLError):
+    def __init__(self):
+        super().__init__("PersistedQueryNotSupported")
+
+
+class ValidatedDocument(GraphQLDocument):
+    """GraphQL document which was already validated against the schema.
+
+    Executing it skips the validation, so a cached document is only lexed, parsed
+    and validated once per process.
+    """
+
+    def __init__(self, document: GraphQLDocument):
+        super().__init__(
+            schema=document.schema,
+            document_string=document.document_string,
+            document_ast=document.document_ast,
+            execute=self._execute,
+        )
+        self.fingerprint = query_fingerprint(self)
+        self.query_hash = get_query_hash(document.document_string)
+        # learned from the first execution, see `response_cache`
+        self.response_cache_policy: Optional[str] = None
+
+    def _execute(self, *args, **kwargs):
+        return backend_core.execute_and_validate(
+            self.schema, self.document_ast, *args, validate=False, **kwargs
+        )
+
+
+class DocumentCache:
+    """LRU cache of validated GraphQL documents keyed by the query hash."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._documents: "OrderedDict[Hashable, ValidatedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[ValidatedDocument]:
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def set(self, key: Hashable, document: ValidatedDocument):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._documents),
+            "max_size": self.max_size,
+        }
+
+
+document_cache = DocumentCache(settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+
+
+def get_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def get_persisted_query_hash(extensions: Any) -> Optional[str]:
+    """Return the sha256 hash of an Apollo persisted query extension."""
+    if not isinstance(extensions, dict):
+        return None
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+        return None
+    return persisted_query.get("sha256Hash")
+
+
+def resolve_persisted_query(
+    query: Optional[str], query_hash: str
+) -> Tuple[Optional[str], Optional[GraphQLError]]:
+    """Resolve the query of an Apollo automatic persisted query request.
+
+    Requests with the query text register it under its hash, requests with the
+    hash only look the query up.
+    """
+    if not settings.GRAPHQL_PERSISTED_QUERIES_ENABLED:
+        return None, PersistedQueryNotSupported()
+
+    key = f"{CachePrefix.PERSISTED_QUERY}:{query_hash}"
+    if query:
+        if get_query_hash(query) != query_hash:
+            return None, GraphQLError("Provided sha256Hash does not match query.")
+        cache.set(key, query, timeout=settings.GRAPHQL_PERSISTED_QUERIES_TIMEOUT)
+        return query, None
+
+    query = cache.get(key)
+    if query is None:
+        return None, PersistedQueryNotFound()
+    return query, None
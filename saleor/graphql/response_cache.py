@@ -0,0 +1,167 @@
+import hashlib
+import json
+from typing import Dict, Iterable, Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+from graphql import GraphQLDocument
+from graphql.execution import ExecutionResult
+from graphql.language import ast
+from graphql.utils.get_operation_ast import get_operation_ast
+
+from ..core.caching import (
+    CachePrefix,
+    get_cache_tag_versions,
+    is_redis_cache,
+    tag_cache_key,
+)
+
+RESPONSE_CACHE_STATS = {"hits": 0, "misses": 0, "stale": 0}
+
+
+class ResponseCachePolicy:
+    """How responses of a document are cached, known after its first execution."""
+
+    NONE = "none"
+    SHARED = "shared"
+    USER = "user"
+
+
+class ResponseCacheRecorder:
+    """Collect the root fields and cache tags of cached resolvers.
+
+    Set on the request for the duration of an execution. Tag versions are read
+    when a tag is first added. Tags of instances are known only once they're
+    fetched, see `add_tags`.
+    """
+
+    def __init__(self):
+        self.fields: Set[str] = set()
+        self.with_user = False
+        self.tag_versions: Dict[str, Optional[str]] = {}
+
+    def add_field(self, field_name: str, with_user: bool = False):
+        self.fields.add(field_name)
+        self.with_user = self.with_user or with_user
+
+    def add_tags(
+        self,
+        tags: Iterable[str],
+        versions_before: Optional[Dict[str, Optional[str]]] = None,
+    ):
+        """Record the versions of the tags added for the first time.
+
+        Versions of tags of data fetched before they are read could already cover
+        an invalidation of that data. `versions_before` are versions of tags read
+        before the fetch and bumped by any such invalidation. They are recorded
+        when they changed since, so the response is dropped as stale once read.
+        """
+        new_tags = [tag for tag in tags if tag not in self.tag_versions]
+        if not new_tags:
+            return
+        versions_before = {
+            tag: version
+            for tag, version in (versions_before or {}).items()
+            if tag not in self.tag_versions
+        }
+        versions = get_cache_tag_versions(set(new_tags) | set(versions_before))
+        for tag, version in versions_before.items():
+            if tag in new_tags or versions[tag] != version:
+                versions[tag] = version
+            else:
+                del versions[tag]
+        self.tag_versions.update(versions)
+
+    def get_policy(self, root_fields: Set[str]) -> str:
+        if not root_fields or self.fields != root_fields:
+            return ResponseCachePolicy.NONE
+        if self.with_user:
+            return ResponseCachePolicy.USER
+        return ResponseCachePolicy.SHARED
+
+
+def is_response_cache_enabled(request: HttpRequest) -> bool:
+    """Return whether responses of the requestor can be cached.
+
+    Staff users and apps can see unpublished data, so they always bypass the
+    cache.
+    """
+    if not settings.GRAPHQL_RESPONSE_CACHE_ENABLED or not is_redis_cache():
+        return False
+    if getattr(request, "app", None):
+        return False
+    user = request.user
+    return not (user.is_authenticated and user.is_staff)
+
+
+def get_root_fields(
+    document: GraphQLDocument, operation_name: Optional[str]
+) -> Optional[Set[str]]:
+    """Return the response keys of the root fields of a query operation.
+
+    Returns None for mutations and for root selections other than fields.
+    """
+    operation = get_operation_ast(document.document_ast, operation_name)
+    if operation is None or operation.operation != "query":
+        return None
+
+    root_fields = set()
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, ast.Field):
+            return None
+        root_fields.add((selection.alias or selection.name).value)
+    return root_fields
+
+
+def get_response_cache_key(
+    request: HttpRequest,
+    document: GraphQLDocument,
+    variables: Optional[dict],
+    operation_name: Optional[str],
+    policy: str,
+) -> str:
+    """Return the cache key of a response.
+
+    The selection is covered by the hash of the query and the channel by the
+    variables or the arguments in the query. The host is included, as absolute
+    URLs in responses are built from it.
+    """
+    user_id = request.user.pk if policy == ResponseCachePolicy.USER else None
+    params = json.dumps(
+        [request.get_host(), operation_name, variables, user_id],
+        sort_keys=True,
+        default=str,
+    )
+    params_hash = hashlib.sha256(params.encode("utf-8")).hexdigest()
+    return f"{CachePrefix.RESPONSE}:{document.query_hash}:{params_hash}"
+
+
+def get_cached_response(key: str) -> Optional[ExecutionResult]:
+    """Return the cached response if none of its tags was invalidated since."""
+    entry = cache.get(key)
+    if entry is None:
+        RESPONSE_CACHE_STATS["misses"] += 1
+        return None
+
+    if get_cache_tag_versions(entry["tags"]) != entry["tags"]:
+        RESPONSE_CACHE_STATS["stale"] += 1
+        cache.delete(key)
+        return None
+
+    RESPONSE_CACHE_STATS["hits"] += 1
+    return ExecutionResult(data=entry["data"])
+
+
+def cache_response(
+    key: str, response: ExecutionResult, recorder: "ResponseCacheRecorder"
+):
+    timeout = settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
+    cache.set(
+        key, {"data": response.data, "tags": recorder.tag_versions}, timeout=timeout
+    )
+    tag_cache_key(key, recorder.tag_versions, timeout=timeout)
+
+
+def get_response_cache_stats() -> dict:
+    return dict(RESPONSE_CACHE_STATS)
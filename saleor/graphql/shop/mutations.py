@@ -1,7 +1,9 @@
 import graphene
 from django.core.exceptions import ValidationError
+from django.db import transaction
 
 from ...account import models as account_models
+from ...core.configuration import invalidate_configuration_cache
 from ...core.error_codes import ShopErrorCode
 from ...core.permissions import OrderPermissions, SitePermissions
 from ...core.utils.url import validate_storefront_url
@@ -11,6 +13,7 @@ from ..core.enums import WeightUnitsEnum
 from ..core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ..core.types.common import OrderSettingsError, ShopError
 from .types import OrderSettings, Shop
+from .utils import get_site_for_update
 
 
 class ShopSettingsInput(graphene.InputObjectType):
@@ -85,7 +88,7 @@ class ShopSettingsUpdate(BaseMutation):
 
     @classmethod
     def perform_mutation(cls, _root, info, **data):
-        instance = info.context.site.settings
+        instance = get_site_for_update(info).settings
         data = data.get("input")
         cleaned_input = cls.clean_input(info, instance, data)
         instance = cls.construct_instance(instance, cleaned_input)
@@ -111,7 +114,7 @@ class ShopAddressUpdate(BaseMutation, I18nMixin):
 
     @classmethod
     def perform_mutation(cls, _root, info, **data):
-        site_settings = info.context.site.settings
+        site_settings = get_site_for_update(info).settings
         data = data.get("input")
 
         if data:
@@ -128,6 +131,8 @@ class ShopAddressUpdate(BaseMutation, I18nMixin):
         else:
             if site_settings.company_address:
                 site_settings.company_address.delete()
+                # the address is detached from the settings without saving them
+                transaction.on_commit(invalidate_configuration_cache)
         return ShopAddressUpdate(shop=Shop())
 
 
@@ -145,7 +150,7 @@ class ShopDomainUpdate(BaseMutation):
 
     @classmethod
     def perform_mutation(cls, _root, info, **data):
-        site = info.context.site
+        site = get_site_for_update(info)
         data = data.get("input")
         domain = data.get("domain")
         name = data.get("name")
@@ -308,7 +313,7 @@ class OrderSettingsUpdate(BaseMutation):
 
     @classmethod
     def perform_mutation(cls, _root, info, **data):
-        instance = info.context.site.settings
+        instance = get_site_for_update(info).settings
         instance.automatically_confirm_all_new_orders = data["input"][
             "automatically_confirm_all_new_orders"
         ]
@@ -6,6 +6,7 @@ from django_countries import countries
 
 from .... import __version__
 from ....account.models import Address
+from ....core.configuration import refresh_sites_cache, sites_cache
 from ....core.error_codes import ShopErrorCode
 from ....core.permissions import get_permissions_codename
 from ....shipping import PostalCodeRuleInclusionType
@@ -352,6 +353,42 @@ def test_shop_settings_mutation(
     assert site_settings.charge_taxes_on_shipping == new_charge_taxes_on_shipping
 
 
+def test_shop_settings_mutation_keeps_cached_settings_unchanged(
+    staff_api_client, site_settings, permission_manage_settings, settings
+):
+    # given
+    settings.CONFIGURATION_CACHE_ENABLED = True
+    sites_cache.clear()
+    refresh_sites_cache()
+    cached_settings = Site.objects.get_current().settings
+    header_text = cached_settings.header_text
+    query = """
+        mutation updateSettings($input: ShopSettingsInput!) {
+            shopSettingsUpdate(input: $input) {
+                shop {
+                    headerText
+                }
+            }
+        }
+    """
+    variables = {"input": {"headerText": "Lorem ipsum"}}
+
+    # when
+    response = staff_api_client.post_graphql(
+        query, variables, permissions=[permission_manage_settings]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shopSettingsUpdate"]["shop"]["headerText"] == (
+        "Lorem ipsum"
+    )
+    # settings shared by the requests are reloaded once the change is committed
+    assert cached_settings.header_text == header_text
+    sites_cache.clear()
+    Site.objects.clear_cache()
+
+
 MUTATION_UPDATE_DEFAULT_MAIL_SENDER_SETTINGS = """
     mutation updateDefaultSenderSettings($input: ShopSettingsInput!) {
       shopSettingsUpdate(input: $input) {
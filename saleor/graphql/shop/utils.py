@@ -3,6 +3,7 @@ from typing import Optional
 from django_countries import countries
 
 from ...shipping.models import ShippingZone
+from ...site.models import Site
 
 
 def get_countries_codes_list(attached_to_shipping_zones: Optional[bool] = None):
@@ -26,3 +27,17 @@ def get_countries_codes_list(attached_to_shipping_zones: Optional[bool] = None):
             return all_countries_codes - covered_countries_codes
 
     return all_countries_codes
+
+
+def get_site_for_update(info) -> Site:
+    """Load the site of the request with its settings to change them.
+
+    Sites and their settings are shared by the requests of the process, see
+    `core.configuration`, so they must not be changed in place. The request uses
+    the loaded site from now on, so the response shows the changes.
+    """
+    site = Site.objects.select_related("settings__company_address").get(
+        pk=info.context.site.pk
+    )
+    info.context.site = site
+    return site
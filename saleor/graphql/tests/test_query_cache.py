@@ -0,0 +1,35 @@
+from ..query_cache import DocumentCache, get_persisted_query_hash
+
+
+def test_document_cache_evicts_least_recently_used():
+    document_cache = DocumentCache(max_size=2)
+    document_cache.set("a", "document-a")
+    document_cache.set("b", "document-b")
+
+    assert document_cache.get("a") == "document-a"
+    document_cache.set("c", "document-c")
+
+    assert document_cache.get("b") is None
+    assert document_cache.get("a") == "document-a"
+    assert document_cache.get("c") == "document-c"
+    assert document_cache.stats() == {
+        "hits": 3,
+        "misses": 1,
+        "size": 2,
+        "max_size": 2,
+    }
+
+
+def test_document_cache_disabled():
+    document_cache = DocumentCache(max_size=0)
+    document_cache.set("a", "document-a")
+
+    assert document_cache.get("a") is None
+
+
+def test_get_persisted_query_hash():
+    extensions = {"persistedQuery": {"version": 1, "sha256Hash": "hash"}}
+
+    assert get_persisted_query_hash(extensions) == "hash"
+    assert get_persisted_query_hash({"persistedQuery": {"version": 2}}) is None
+    assert get_persisted_query_hash(None) is None
@@ -0,0 +1,240 @@
+import graphene
+import pytest
+from django.core.cache import cache
+from django.test import TestCase
+
+from ...core import caching
+from ...core.caching import (
+    LIST_TAG,
+    CachePrefix,
+    get_cache_tag,
+    get_cache_tag_versions,
+    get_instance_cache_tags,
+    invalidate_cache,
+    invalidate_cache_tags,
+    invalidate_instances_cache,
+    tag_cache_key,
+)
+from ...warehouse.management import invalidate_stocks_cache
+from ..query_cache import document_cache
+from ..response_cache import RESPONSE_CACHE_STATS
+from .utils import get_graphql_content
+
+QUERY_PRODUCT = """
+    query GetProduct($id: ID!, $channel: String) {
+        product(id: $id, channel: $channel) {
+            name
+        }
+    }
+"""
+
+
+@pytest.fixture
+def response_cache(redis_client, settings):
+    settings.GRAPHQL_RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_STATS.update(hits=0, misses=0, stale=0)
+    document_cache.clear()
+    cache.clear()
+    yield redis_client
+    document_cache.clear()
+    cache.clear()
+
+
+def get_product_variables(product, channel):
+    return {
+        "id": graphene.Node.to_global_id("Product", product.pk),
+        "channel": channel.slug,
+    }
+
+
+def test_invalidate_cache_tags_bumps_versions_and_deletes_keys(response_cache):
+    cache.set("Response:a", "a")
+    cache.set("Response:b", "b")
+    tag_cache_key("Response:a", ["Product:1"])
+    tag_cache_key("Response:b", ["Product:2"])
+    versions = get_cache_tag_versions(["Product:1", "Product:2"])
+
+    invalidate_cache_tags(["Product:1"])
+
+    new_versions = get_cache_tag_versions(["Product:1", "Product:2"])
+    assert new_versions["Product:1"] != versions["Product:1"]
+    assert new_versions["Product:2"] == versions["Product:2"]
+    assert cache.get("Response:a") is None
+    assert cache.get("Response:b") == "b"
+
+
+def test_get_instance_cache_tags(product, variant):
+    product_id = graphene.Node.to_global_id("Product", product.pk)
+    variant_id = graphene.Node.to_global_id("ProductVariant", variant.pk)
+
+    assert get_instance_cache_tags(CachePrefix.PRODUCT, None, product) == [
+        f"Product:{product.pk}"
+    ]
+    assert get_instance_cache_tags(CachePrefix.PRODUCT, id=product_id) == [
+        f"Product:{product.pk}"
+    ]
+    assert get_instance_cache_tags(CachePrefix.PRODUCT, ids=[variant_id]) == [
+        f"Product:{product.pk}"
+    ]
+    assert get_instance_cache_tags(CachePrefix.CATEGORY, product) == [
+        f"Category:{product.category_id}"
+    ]
+
+
+def test_invalidate_cache_drops_tags_on_commit(response_cache, product):
+    @invalidate_cache(CachePrefix.PRODUCT)
+    def save(cls, info, instance, cleaned_input):
+        pass
+
+    tags = [
+        get_cache_tag(CachePrefix.PRODUCT, LIST_TAG),
+        get_cache_tag(CachePrefix.PRODUCT, product.pk),
+        # categories nest their products
+        get_cache_tag(CachePrefix.CATEGORY),
+    ]
+    versions = get_cache_tag_versions(tags)
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        save(None, None, product, {})
+
+    new_versions = get_cache_tag_versions(tags)
+    assert all(new_versions[tag] != versions[tag] for tag in tags)
+
+
+def test_invalidate_stocks_cache_drops_tags_of_variant_products(
+    response_cache, product_list
+):
+    product, other_product = product_list[:2]
+    tags = [
+        get_cache_tag(CachePrefix.PRODUCT, product.pk),
+        get_cache_tag(CachePrefix.PRODUCT, other_product.pk),
+        get_cache_tag(CachePrefix.CATEGORY),
+    ]
+    versions = get_cache_tag_versions(tags)
+
+    with TestCase.captureOnCommitCallbacks() as callbacks:
+        invalidate_stocks_cache([product.variants.first().pk])
+    assert get_cache_tag_versions(tags) == versions
+    callbacks[0]()
+
+    new_versions = get_cache_tag_versions(tags)
+    assert new_versions[tags[0]] != versions[tags[0]]
+    assert new_versions[tags[1]] == versions[tags[1]]
+    assert new_versions[tags[2]] != versions[tags[2]]
+
+
+def test_invalidate_instances_cache_without_pks_drops_all_entries(response_cache):
+    tag = get_cache_tag(CachePrefix.PRODUCT)
+    version = get_cache_tag_versions([tag])[tag]
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        invalidate_instances_cache(CachePrefix.PRODUCT)
+
+    assert get_cache_tag_versions([tag])[tag] != version
+
+
+def test_response_cache_invalidated_by_sale_change(
+    response_cache, api_client, product, channel_USD, sale
+):
+    variables = get_product_variables(product, channel_USD)
+    api_client.post_graphql(QUERY_PRODUCT, variables)
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        sale.name = "New sale"
+        sale.save(update_fields=["name"])
+    api_client.post_graphql(QUERY_PRODUCT, variables)
+
+    assert RESPONSE_CACHE_STATS["hits"] == 0
+
+
+def test_product_query_is_served_from_response_cache(
+    response_cache, api_client, product, channel_USD, django_assert_num_queries
+):
+    variables = get_product_variables(product, channel_USD)
+    content = get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+
+    with django_assert_num_queries(0):
+        cached_content = get_graphql_content(
+            api_client.post_graphql(QUERY_PRODUCT, variables)
+        )
+
+    assert cached_content == content
+    assert RESPONSE_CACHE_STATS["hits"] == 1
+
+
+def test_response_cache_invalidated_by_product_tag(
+    response_cache, api_client, product_list, channel_USD
+):
+    product, other_product = product_list[:2]
+    variables = get_product_variables(product, channel_USD)
+    other_variables = get_product_variables(other_product, channel_USD)
+    for _ in range(2):
+        api_client.post_graphql(QUERY_PRODUCT, variables)
+        api_client.post_graphql(QUERY_PRODUCT, other_variables)
+
+    product.name = "New name"
+    product.save(update_fields=["name"])
+    invalidate_cache_tags([get_cache_tag(CachePrefix.PRODUCT, product.pk)])
+
+    content = get_graphql_content(api_client.post_graphql(QUERY_PRODUCT, variables))
+    api_client.post_graphql(QUERY_PRODUCT, other_variables)
+
+    assert content["data"]["product"]["name"] == "New name"
+    # only the entry of the updated product was dropped
+    assert RESPONSE_CACHE_STATS["hits"] == 3
+
+
+def test_response_cache_stale_after_invalidation_while_resolving(
+    response_cache, api_client, product, channel_USD, monkeypatch
+):
+    variables = get_product_variables(product, channel_USD)
+    get_resolver_cache_tags = caching.get_resolver_cache_tags
+
+    def invalidate_after_fetch(prefix, value):
+        # the product was fetched, then the commit of its change invalidates it
+        invalidate_cache_tags(
+            [
+                get_cache_tag(CachePrefix.PRODUCT, product.pk),
+                get_cache_tag(CachePrefix.PRODUCT, LIST_TAG),
+            ]
+        )
+        return get_resolver_cache_tags(prefix, value)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(
+            "saleor.core.caching.get_resolver_cache_tags", invalidate_after_fetch
+        )
+        api_client.post_graphql(QUERY_PRODUCT, variables)
+    api_client.post_graphql(QUERY_PRODUCT, variables)
+
+    assert RESPONSE_CACHE_STATS == {"hits": 0, "misses": 0, "stale": 1}
+
+
+def test_response_cache_skipped_for_staff(
+    response_cache, staff_api_client, product, channel_USD
+):
+    variables = get_product_variables(product, channel_USD)
+    for _ in range(3):
+        staff_api_client.post_graphql(QUERY_PRODUCT, variables)
+
+    assert RESPONSE_CACHE_STATS == {"hits": 0, "misses": 0, "stale": 0}
+
+
+def test_response_cache_skipped_for_uncached_fields(
+    response_cache, api_client, product, channel_USD
+):
+    query = """
+        query GetProduct($id: ID!, $channel: String) {
+            product(id: $id, channel: $channel) {
+                name
+            }
+            shop {
+                name
+            }
+        }
+    """
+    variables = get_product_variables(product, channel_USD)
+    for _ in range(3):
+        get_graphql_content(api_client.post_graphql(query, variables))
+
+    assert RESPONSE_CACHE_STATS == {"hits": 0, "misses": 0, "stale": 0}
@@ -20,6 +20,7 @@ from graphql import GraphQLDocument, get_default_backend
 from graphql.error import GraphQLError, GraphQLSyntaxError
 from graphql.error import format_error as format_graphql_error
 from graphql.execution import ExecutionResult
+from graphql.validation import validate
 from jwt.exceptions import PyJWTError
 
 from .. import __version__ as saleor_version
@@ -27,7 +28,23 @@ from ..core.exceptions import PermissionDenied, ReadOnlyException
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
 from .api import API_PATH
 from .context import get_context_value
-from .utils import query_fingerprint
+from .query_budget import account_queries, get_operation_name, query_stats
+from .query_cache import (
+    ValidatedDocument,
+    document_cache,
+    get_persisted_query_hash,
+    get_query_hash,
+    resolve_persisted_query,
+)
+from .response_cache import (
+    ResponseCachePolicy,
+    ResponseCacheRecorder,
+    cache_response,
+    get_cached_response,
+    get_response_cache_key,
+    get_root_fields,
+    is_response_cache_enabled,
+)
 
 INT_ERROR_MSG = "Int cannot represent non 32-bit signed integer value"
 
@@ -206,14 +223,28 @@ class GraphQLView(View):
         return self.root_value
 
     def parse_query(
-        self, query: str
+        self, query: str, query_hash: Optional[str] = None
     ) -> Tuple[Optional[GraphQLDocument], Optional[ExecutionResult]]:
         """Attempt to parse a query (mandatory) to a gql document object.
 
         If no query was given or query is not a string, it returns an error.
         If the query is invalid, it returns an error as well.
-        Otherwise, it returns the parsed gql document.
+        Otherwise, it returns the parsed and validated gql document.
+
+        Documents are cached by the sha256 hash of the query. If the hash of an
+        Apollo persisted query is given, the query text is optional.
         """
+        # documents of hash only requests are looked up before the query text
+        is_hash_only = bool(query_hash) and not query
+        if is_hash_only and settings.GRAPHQL_PERSISTED_QUERIES_ENABLED:
+            document = document_cache.get((self.schema, query_hash))
+            if document is not None:
+                return document, None
+        if query_hash and (query is None or isinstance(query, str)):
+            query, error = resolve_persisted_query(query, query_hash)
+            if error:
+                return None, ExecutionResult(errors=[error])
+
         if not query or not isinstance(query, str):
             return (
                 None,
@@ -222,15 +253,28 @@ class GraphQLView(View):
                 ),
             )
 
+        key = (self.schema, query_hash or get_query_hash(query))
+        if not is_hash_only:
+            document = document_cache.get(key)
+            if document is not None:
+                return document, None
+
         # Attempt to parse the query, if it fails, return the error
         try:
-            return (
-                self.backend.document_from_string(self.schema, query),  # type: ignore
-                None,
+            document = self.backend.document_from_string(  # type: ignore
+                self.schema, query
             )
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
+        validation_errors = validate(self.schema, document.document_ast)
+        if validation_errors:
+            return None, ExecutionResult(errors=validation_errors, invalid=True)
+
+        document = ValidatedDocument(document)
+        document_cache.set(key, document)
+        return document, None
+
     def check_if_query_contains_only_schema(self, document: GraphQLDocument):
         query_with_schema = False
         for definition in document.document_ast.definitions:
@@ -255,15 +299,16 @@ class GraphQLView(View):
             )
 
             query, variables, operation_name = self.get_graphql_params(request, data)
+            query_hash = get_persisted_query_hash(data.get("extensions"))
 
-            document, error = self.parse_query(query)
+            document, error = self.parse_query(query, query_hash)
             if error:
                 return error
 
             if document is not None:
                 raw_query_string = document.document_string
                 span.set_tag("graphql.query", raw_query_string)
-                span.set_tag("graphql.query_fingerprint", query_fingerprint(document))
+                span.set_tag("graphql.query_fingerprint", document.fingerprint)
                 try:
                     query_contains_schema = self.check_if_query_contains_only_schema(
                         document
@@ -278,7 +323,9 @@ class GraphQLView(View):
                 # executor is not a valid argument in all backends
                 extra_options["executor"] = self.executor
             try:
-                with connection.execute_wrapper(tracing_wrapper):
+                with connection.execute_wrapper(tracing_wrapper), account_queries(
+                    get_operation_name(document, operation_name)
+                ):
                     response = None
                     should_use_cache_for_scheme = query_contains_schema & (
                         not settings.DEBUG
@@ -288,13 +335,12 @@ class GraphQLView(View):
                         response = cache.get(key)
 
                     if not response:
-                        response = document.execute(  # type: ignore
-                            root=self.get_root_value(),
-                            variables=variables,
-                            operation_name=operation_name,
-                            context=get_context_value(request),
-                            middleware=self.middleware,
-                            **extra_options,
+                        response = self.execute_document(
+                            request,
+                            document,
+                            variables,
+                            operation_name,
+                            extra_options,
                         )
                         if should_use_cache_for_scheme:
                             cache.set(key, response)
@@ -312,6 +358,62 @@ class GraphQLView(View):
                     e = GraphQLError(str(e))
                 return ExecutionResult(errors=[e], invalid=True)
 
+    def execute_document(
+        self,
+        request: HttpRequest,
+        document: GraphQLDocument,
+        variables: Optional[dict],
+        operation_name: Optional[str],
+        extra_options: Dict[str, Optional[Any]],
+    ):
+        """Execute the document, using the response cache for cacheable queries.
+
+        Whether a document can be cached is learned from its first execution, so
+        the cache is only looked up for queries resolved by cached resolvers.
+        """
+        context = get_context_value(request)
+        policy = getattr(document, "response_cache_policy", None)
+        root_fields = None
+        cache_key = None
+        recorder = None
+
+        if policy != ResponseCachePolicy.NONE and is_response_cache_enabled(context):
+            root_fields = get_root_fields(document, operation_name)
+            if policy is not None and root_fields:
+                cache_key = get_response_cache_key(
+                    context, document, variables, operation_name, policy
+                )
+                response = get_cached_response(cache_key)
+                if response is not None:
+                    return response
+            recorder = ResponseCacheRecorder()
+        context.response_cache = recorder
+
+        try:
+            response = document.execute(  # type: ignore
+                root=self.get_root_value(),
+                variables=variables,
+                operation_name=operation_name,
+                context=context,
+                middleware=self.middleware,
+                **extra_options,
+            )
+        finally:
+            context.response_cache = None
+
+        if recorder is None or response.errors or response.invalid:
+            return response
+
+        policy = recorder.get_policy(root_fields or set())
+        if isinstance(document, ValidatedDocument):
+            document.response_cache_policy = policy
+        if policy != ResponseCachePolicy.NONE:
+            cache_key = get_response_cache_key(
+                context, document, variables, operation_name, policy
+            )
+            cache_response(cache_key, response, recorder)
+        return response
+
     @staticmethod
     def parse_body(request: HttpRequest):
         content_type = request.content_type
@@ -374,6 +476,11 @@ class GraphQLView(View):
         return result
 
 
+def query_stats_view(request: HttpRequest) -> JsonResponse:
+    """Return the SQL query stats of the GraphQL operations run by the process."""
+    return JsonResponse(query_stats.as_dict())
+
+
 def get_key(key):
     try:
         int_key = int(key)
@@ -1,5 +1,6 @@
 import graphene
 from django.core.exceptions import ValidationError
+from django.db import transaction
 
 from ...core.permissions import AppPermission
 from ...webhook import models
@@ -27,6 +28,17 @@ class WebhookCreateInput(graphene.InputObjectType):
         description="The secret key used to create a hash signature with each payload.",
         required=False,
     )
+    batch_size = graphene.Int(
+        description=(
+            "Maximal number of events coalesced into a single request. Batching is "
+            "disabled below 2."
+        ),
+        required=False,
+    )
+    batch_window = graphene.Int(
+        description="Number of seconds the events are coalesced for.",
+        required=False,
+    )
 
 
 class WebhookCreate(ModelMutation):
@@ -81,14 +93,16 @@ class WebhookCreate(ModelMutation):
 
     @classmethod
     def save(cls, info, instance, cleaned_input):
-        instance.save()
-        events = set(cleaned_input.get("events", []))
-        models.WebhookEvent.objects.bulk_create(
-            [
-                models.WebhookEvent(webhook=instance, event_type=event)
-                for event in events
-            ]
-        )
+        # the webhook registry is invalidated on commit, after the events are saved
+        with transaction.atomic():
+            instance.save()
+            events = set(cleaned_input.get("events", []))
+            models.WebhookEvent.objects.bulk_create(
+                [
+                    models.WebhookEvent(webhook=instance, event_type=event)
+                    for event in events
+                ]
+            )
 
 
 class WebhookUpdateInput(graphene.InputObjectType):
@@ -111,6 +125,17 @@ class WebhookUpdateInput(graphene.InputObjectType):
     secret_key = graphene.String(
         description="Use to create a hash signature with each payload.", required=False
     )
+    batch_size = graphene.Int(
+        description=(
+            "Maximal number of events coalesced into a single request. Batching is "
+            "disabled below 2."
+        ),
+        required=False,
+    )
+    batch_window = graphene.Int(
+        description="Number of seconds the events are coalesced for.",
+        required=False,
+    )
 
 
 class WebhookUpdate(ModelMutation):
@@ -150,16 +175,18 @@ class WebhookUpdate(ModelMutation):
 
     @classmethod
     def save(cls, info, instance, cleaned_input):
-        instance.save()
-        events = set(cleaned_input.get("events", []))
-        if events:
-            instance.events.all().delete()
-            models.WebhookEvent.objects.bulk_create(
-                [
-                    models.WebhookEvent(webhook=instance, event_type=event)
-                    for event in events
-                ]
-            )
+        # the webhook registry is invalidated on commit, after the events are saved
+        with transaction.atomic():
+            instance.save()
+            events = set(cleaned_input.get("events", []))
+            if events:
+                instance.events.all().delete()
+                models.WebhookEvent.objects.bulk_create(
+                    [
+                        models.WebhookEvent(webhook=instance, event_type=event)
+                        for event in events
+                    ]
+                )
 
 
 class WebhookDelete(ModelDeleteMutation):
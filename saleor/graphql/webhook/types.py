@@ -40,6 +40,8 @@ class Webhook(CountableDjangoObjectType):
             "is_active",
             "secret_key",
             "name",
+            "batch_size",
+            "batch_window",
         ]
 
     @staticmethod
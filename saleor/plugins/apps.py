@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, List
 from django.apps import AppConfig
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.utils.module_loading import import_string
 
 if TYPE_CHECKING:
@@ -19,6 +20,43 @@ class PluginConfig(AppConfig):
         for plugin_path in plugins:
             self.load_and_check_plugin(plugin_path)
 
+        self.connect_signals()
+
+    def connect_signals(self):
+        from ..channel.models import Channel
+        from .manager import plugins_manager_cache
+        from .models import PluginConfiguration
+
+        # the cached plugins manager holds plugins per channel with their
+        # configurations
+        for model in [Channel, PluginConfiguration]:
+            for signal in [post_save, post_delete]:
+                signal.connect(
+                    plugins_manager_cache.invalidate_on_commit,
+                    sender=model,
+                    dispatch_uid=f"invalidate_plugins_manager_{model.__name__}",
+                )
+        self.connect_webhook_registry_signals()
+
+    def connect_webhook_registry_signals(self):
+        from ..app.models import App
+        from ..webhook.models import Webhook, WebhookEvent
+        from .webhook.registry import webhook_registry_cache
+
+        # subscriptions depend on the webhooks, their events and the app permissions
+        for model in [App, Webhook, WebhookEvent]:
+            for signal in [post_save, post_delete]:
+                signal.connect(
+                    webhook_registry_cache.invalidate_on_commit,
+                    sender=model,
+                    dispatch_uid=f"invalidate_webhook_registry_{model.__name__}",
+                )
+        m2m_changed.connect(
+            webhook_registry_cache.invalidate_on_commit,
+            sender=App.permissions.through,
+            dispatch_uid="invalidate_webhook_registry_app_permissions",
+        )
+
     def load_and_check_plugin(self, plugin_path: str):
         try:
             plugin = import_string(plugin_path)
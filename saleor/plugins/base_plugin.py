@@ -1,7 +1,19 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from copy import copy
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from django.core.handlers.wsgi import WSGIRequest
 from django.http import HttpResponse
@@ -37,6 +49,21 @@ if TYPE_CHECKING:
 PluginConfigurationType = List[dict]
 NoneType = type(None)
 
+# state of plugins per plugin instance, set for the duration of a request
+_request_state: ContextVar[Optional[Dict[int, dict]]] = ContextVar(
+    "plugins_request_state", default=None
+)
+
+
+@contextmanager
+def plugins_request_scope():
+    """Keep the request state of plugins until the scope is closed."""
+    token = _request_state.set({})
+    try:
+        yield
+    finally:
+        _request_state.reset(token)
+
 
 class ConfigurationTypeField:
     STRING = "String"
@@ -108,6 +135,20 @@ class BasePlugin:
     def __str__(self):
         return self.PLUGIN_NAME
 
+    @property
+    def request_state(self) -> dict:
+        """Return the state of the plugin scoped to the current request.
+
+        Plugin instances are shared by all requests of a process, so data which is
+        valid only for a request, e.g. values fetched for a calculation, has to be
+        kept here instead of on the instance. Outside of `plugins_request_scope`
+        the state isn't kept at all.
+        """
+        scope = _request_state.get()
+        if scope is None:
+            return {}
+        return scope.setdefault(id(self), {})
+
     #  Apply taxes to the product price based on the customer country.
     #
     #  Overwrite this method if you want to show products with taxes.
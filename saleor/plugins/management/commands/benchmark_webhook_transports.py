@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from ...webhook.benchmark import benchmark_http_transport
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver webhooks to a local stub server with and without pooled "
+        "connections and compare the deliveries per second."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--deliveries",
+            type=int,
+            default=500,
+            help="Number of webhooks delivered with each transport.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of threads delivering the webhooks.",
+        )
+        parser.add_argument(
+            "--payload-size",
+            type=int,
+            default=2048,
+            help="Size of the webhook payload in bytes.",
+        )
+
+    def handle(self, *args, **options):
+        results = benchmark_http_transport(
+            deliveries=options["deliveries"],
+            workers=options["workers"],
+            payload_size=options["payload_size"],
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<10} {result['deliveries_per_s']:>10} deliveries/s "
+                f"({result['deliveries']} in {result['elapsed_s']}s)"
+            )
+        unpooled = results["unpooled"]["deliveries_per_s"]
+        if unpooled:
+            speedup = results["pooled"]["deliveries_per_s"] / unpooled
+            self.stdout.write(f"Pooled transport is {speedup:.2f}x faster.")
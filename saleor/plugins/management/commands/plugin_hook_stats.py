@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from ...metrics import get_hook_metrics, get_slowest_hooks, render_prometheus_metrics
+
+SORT_FIELDS = {
+    "total": "total_duration",
+    "avg": "avg_duration",
+    "max": "max_duration",
+    "calls": "calls",
+    "errors": "errors",
+}
+
+
+class Command(BaseCommand):
+    help = "Print the slowest plugin hooks recorded by the hook metrics."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Number of hooks to print.",
+        )
+        parser.add_argument(
+            "--sort-by",
+            choices=sorted(SORT_FIELDS),
+            default="total",
+            help="Stat the hooks are sorted by.",
+        )
+        parser.add_argument(
+            "--local-only",
+            action="store_true",
+            help="Skip the stats flushed to the cache by other processes.",
+        )
+        parser.add_argument(
+            "--prometheus",
+            action="store_true",
+            help="Print all the stats in the Prometheus text format.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_hook_metrics(local_only=options["local_only"])
+        if options["prometheus"]:
+            self.stdout.write(render_prometheus_metrics(stats), ending="")
+            return
+        if not stats:
+            self.stdout.write(
+                "No hook calls recorded, make sure PLUGINS_HOOK_METRICS_ENABLED is set."
+            )
+            return
+
+        slowest = get_slowest_hooks(
+            stats, options["limit"], sort_by=SORT_FIELDS[options["sort_by"]]
+        )
+        self.stdout.write(
+            f"{'plugin':<40} {'hook':<40} {'calls':>8} {'errors':>7} "
+            f"{'total ms':>10} {'avg ms':>9} {'max ms':>9}"
+        )
+        for (plugin_id, hook), hook_stats in slowest:
+            self.stdout.write(
+                f"{plugin_id:<40} {hook:<40} {hook_stats.calls:>8} "
+                f"{hook_stats.errors:>7} {hook_stats.total_duration * 1000:>10.1f} "
+                f"{hook_stats.avg_duration * 1000:>9.2f} "
+                f"{hook_stats.max_duration * 1000:>9.2f}"
+            )
@@ -23,6 +23,7 @@ from prices import Money, TaxedMoney
 from ..channel.models import Channel
 from ..checkout import base_calculations
 from ..checkout.interface import CheckoutTaxedPricesData
+from ..core.caching import CachePrefix, ProcessCache
 from ..core.payments import PaymentInterface
 from ..core.prices import quantize_price
 from ..core.taxes import TaxType, zero_taxed_money
@@ -30,7 +31,8 @@ from ..core.utils.translations import Translation
 from ..discount import DiscountInfo
 from ..order.interface import OrderTaxedPricesData
 from ..shipping.interface import ShippingMethodData
-from .base_plugin import ExcludedShippingMethod, ExternalAccessTokens
+from .base_plugin import BasePlugin, ExcludedShippingMethod, ExternalAccessTokens
+from .metrics import observe_plugin_hook
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
@@ -50,10 +52,13 @@ if TYPE_CHECKING:
         TokenConfig,
     )
     from ..product.models import Product, ProductType, ProductVariant
-    from .base_plugin import BasePlugin
 
 
 NotifyEventTypeChoice = str
+HookImplementations = Dict[str, List["BasePlugin"]]
+
+# hooks declared, but not implemented by the base plugin
+PLUGIN_HOOKS = frozenset(BasePlugin.__annotations__)
 
 
 class PluginsManager(PaymentInterface):
@@ -62,6 +67,8 @@ class PluginsManager(PaymentInterface):
     plugins_per_channel: Dict[str, List["BasePlugin"]] = {}
     global_plugins: List["BasePlugin"] = []
     all_plugins: List["BasePlugin"] = []
+    # plugins implementing each hook per channel slug, None for all plugins
+    dispatch_table: Dict[Optional[str], HookImplementations] = {}
 
     def _load_plugin(
         self,
@@ -114,6 +121,30 @@ class PluginsManager(PaymentInterface):
             for channel in channels:
                 self.plugins_per_channel[channel.slug].extend(self.global_plugins)
 
+            self.dispatch_table = self._build_dispatch_table()
+
+    def _build_dispatch_table(self) -> Dict[Optional[str], HookImplementations]:
+        """Map the hooks to the plugins which implement them, per channel.
+
+        Plugins are kept instead of their bound methods, so the active flag and
+        patched methods are still resolved when a hook is called.
+        """
+        dispatch_table: Dict[Optional[str], HookImplementations] = {
+            None: self._get_hook_implementations(self.all_plugins)
+        }
+        for channel_slug, plugins in self.plugins_per_channel.items():
+            dispatch_table[channel_slug] = self._get_hook_implementations(plugins)
+        return dispatch_table
+
+    @staticmethod
+    def _get_hook_implementations(plugins: List["BasePlugin"]) -> HookImplementations:
+        implementations: HookImplementations = defaultdict(list)
+        for plugin in plugins:
+            for hook in PLUGIN_HOOKS:
+                if getattr(type(plugin), hook, None) is not None:
+                    implementations[hook].append(plugin)
+        return dict(implementations)
+
     def _get_db_plugin_configs(self):
         with opentracing.global_tracer().start_active_span("_get_db_plugin_configs"):
             qs = (
@@ -145,8 +176,15 @@ class PluginsManager(PaymentInterface):
     ):
         """Try to run a method with the given name on each declared active plugin."""
         value = default_value
-        plugins = self.get_plugins(channel_slug=channel_slug, active_only=True)
+        if method_name in PLUGIN_HOOKS:
+            channel_hooks = self.dispatch_table.get(channel_slug or None, {})
+            plugins = channel_hooks.get(method_name, [])
+        else:
+            # methods of the base plugin have to run on every plugin
+            plugins = self.get_plugins(channel_slug=channel_slug)
         for plugin in plugins:
+            if not plugin.active:
+                continue
             value = self.__run_method_on_single_plugin(
                 plugin, method_name, value, *args, **kwargs
             )
@@ -169,7 +207,18 @@ class PluginsManager(PaymentInterface):
         plugin_method = getattr(plugin, method_name, NotImplemented)
         if plugin_method == NotImplemented:
             return previous_value
-        returned_value = plugin_method(*args, **kwargs, previous_value=previous_value)
+        if (
+            settings.PLUGINS_HOOK_METRICS_ENABLED
+            or settings.PLUGINS_HOOK_TRACING_ENABLED
+        ):
+            with observe_plugin_hook(plugin.PLUGIN_ID, method_name):  # type: ignore
+                returned_value = plugin_method(
+                    *args, **kwargs, previous_value=previous_value
+                )
+        else:
+            returned_value = plugin_method(
+                *args, **kwargs, previous_value=previous_value
+            )
         if returned_value == NotImplemented:
             return previous_value
         return returned_value
@@ -1103,6 +1152,31 @@ class PluginsManager(PaymentInterface):
         )
 
 
+# plugins manager of the process, rebuilt when a plugin configuration or a channel
+# changes
+plugins_manager_cache = ProcessCache(CachePrefix.PLUGINS_MANAGER)
+
+
 def get_plugins_manager() -> PluginsManager:
     with opentracing.global_tracer().start_active_span("get_plugins_manager"):
-        return PluginsManager(settings.PLUGINS)
+        if not settings.PLUGINS_MANAGER_CACHE_ENABLED:
+            return PluginsManager(settings.PLUGINS)
+        return get_cached_plugins_manager(settings.PLUGINS)
+
+
+def get_cached_plugins_manager(plugins: List[str]) -> PluginsManager:
+    """Return the plugins manager of the process.
+
+    The manager is built once and reused by all requests until the plugins
+    version changes, i.e. a plugin configuration or a channel is saved or deleted
+    in any process. Checking the version costs a single cache lookup instead of
+    loading the configurations and channels from the database.
+    """
+    return plugins_manager_cache.get(
+        lambda version: PluginsManager(plugins), key=tuple(plugins)
+    )
+
+
+def invalidate_plugins_manager():
+    """Make all processes rebuild their plugins manager on the next request."""
+    plugins_manager_cache.invalidate()
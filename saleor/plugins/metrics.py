@@ -0,0 +1,251 @@
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+import opentracing
+import opentracing.tags
+from django.conf import settings
+from django.core.cache import cache
+
+from ..core.caching import CachePrefix, get_redis_client, is_redis_cache
+
+# upper bounds of the buckets of the latency histogram, in seconds
+HOOK_DURATION_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# stats shared by the processes are dropped when a process stops flushing them
+PROCESS_METRICS_TIMEOUT = 24 * 60 * 60
+
+HookKey = Tuple[str, str]
+
+
+@dataclass
+class HookStats:
+    calls: int = 0
+    errors: int = 0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    # number of calls per histogram bucket, without the calls above the last bound
+    buckets: List[int] = field(
+        default_factory=lambda: [0] * len(HOOK_DURATION_BUCKETS)
+    )
+
+    @property
+    def avg_duration(self) -> float:
+        return self.total_duration / self.calls if self.calls else 0.0
+
+    def add(self, duration: float, failed: bool):
+        self.calls += 1
+        self.errors += int(failed)
+        self.total_duration += duration
+        self.max_duration = max(self.max_duration, duration)
+        for index, bound in enumerate(HOOK_DURATION_BUCKETS):
+            if duration <= bound:
+                self.buckets[index] += 1
+                break
+
+    def merge(self, other: "HookStats"):
+        self.calls += other.calls
+        self.errors += other.errors
+        self.total_duration += other.total_duration
+        self.max_duration = max(self.max_duration, other.max_duration)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def copy(self) -> "HookStats":
+        return replace(self, buckets=list(self.buckets))
+
+
+class HookMetrics:
+    """Aggregate the durations and outcomes of the hook calls of the process.
+
+    Stats are keyed by the plugin ID and the hook name. They are flushed to the cache
+    periodically, so they can be read from any process, see `get_hook_metrics`.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats: Dict[HookKey, HookStats] = {}
+        self.last_flush = time.monotonic()
+
+    def record(self, plugin_id: str, hook: str, duration: float, failed=False):
+        with self.lock:
+            stats = self.stats.get((plugin_id, hook))
+            if stats is None:
+                stats = self.stats[(plugin_id, hook)] = HookStats()
+            stats.add(duration, failed)
+
+        interval = settings.PLUGINS_HOOK_METRICS_FLUSH_INTERVAL
+        if interval and time.monotonic() - self.last_flush >= interval:
+            self.flush()
+
+    def snapshot(self) -> Dict[HookKey, HookStats]:
+        with self.lock:
+            return {key: stats.copy() for key, stats in self.stats.items()}
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        key = get_process_metrics_key()
+        cache.set(key, self.snapshot(), timeout=PROCESS_METRICS_TIMEOUT)
+        register_process(key)
+
+
+hook_metrics = HookMetrics()
+
+
+def get_process_metrics_key() -> str:
+    return f"{CachePrefix.PLUGIN_HOOK_METRICS}:{socket.gethostname()}:{os.getpid()}"
+
+
+def get_processes_key() -> str:
+    return cache.make_key(f"{CachePrefix.PLUGIN_HOOK_METRICS}:processes")
+
+
+def register_process(process_key: str):
+    """Add the stats key of the process to the sorted set of the flushing processes.
+
+    Members are scored with the time of their last flush and dropped once their
+    stats expire, so stopped processes don't pile up. Stats are shared only
+    through Redis, other caches are local to the process.
+    """
+    if not is_redis_cache():
+        return
+    now = time.time()
+    processes_key = get_processes_key()
+    pipeline = get_redis_client().pipeline()
+    pipeline.zadd(processes_key, {process_key: now})
+    pipeline.zremrangebyscore(processes_key, "-inf", now - PROCESS_METRICS_TIMEOUT)
+    pipeline.expire(processes_key, PROCESS_METRICS_TIMEOUT)
+    pipeline.execute()
+
+
+def get_process_keys() -> List[str]:
+    """Return the stats keys of the processes which flushed them recently."""
+    if not is_redis_cache():
+        return []
+    keys = get_redis_client().zrangebyscore(
+        get_processes_key(), time.time() - PROCESS_METRICS_TIMEOUT, "+inf"
+    )
+    return [key.decode() for key in keys]
+
+
+@contextmanager
+def observe_plugin_hook(plugin_id: str, hook: str):
+    """Record the duration and the outcome of a hook call.
+
+    The call is traced with an opentracing span when the hook tracing is enabled.
+    """
+    scope = None
+    if settings.PLUGINS_HOOK_TRACING_ENABLED:
+        scope = opentracing.global_tracer().start_active_span(f"plugins.{hook}")
+        scope.span.set_tag(opentracing.tags.COMPONENT, "plugins")
+        scope.span.set_tag("plugin.id", plugin_id)
+
+    failed = False
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        failed = True
+        if scope:
+            scope.span.set_tag(opentracing.tags.ERROR, True)
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        if scope:
+            scope.close()
+        if settings.PLUGINS_HOOK_METRICS_ENABLED:
+            hook_metrics.record(plugin_id, hook, duration, failed)
+
+
+def get_hook_metrics(local_only=False) -> Dict[HookKey, HookStats]:
+    """Return the stats of the process merged with the ones flushed by the others."""
+    stats = hook_metrics.snapshot()
+    if local_only:
+        return stats
+
+    process_key = get_process_metrics_key()
+    processes_stats = cache.get_many(
+        [key for key in get_process_keys() if key != process_key]
+    )
+    for other_stats in processes_stats.values():
+        for key, hook_stats in other_stats.items():
+            if key in stats:
+                stats[key].merge(hook_stats)
+            else:
+                stats[key] = hook_stats
+    return stats
+
+
+def get_slowest_hooks(
+    stats: Dict[HookKey, HookStats],
+    limit: Optional[int] = None,
+    sort_by: str = "total_duration",
+) -> List[Tuple[HookKey, HookStats]]:
+    slowest = sorted(
+        stats.items(), key=lambda item: getattr(item[1], sort_by), reverse=True
+    )
+    return slowest[:limit]
+
+
+def render_prometheus_metrics(stats: Dict[HookKey, HookStats]) -> str:
+    """Render the stats in the Prometheus text exposition format."""
+    lines = [
+        "# HELP saleor_plugin_hook_calls_total Number of plugin hook calls.",
+        "# TYPE saleor_plugin_hook_calls_total counter",
+    ]
+    for (plugin_id, hook), hook_stats in sorted(stats.items()):
+        labels = f'plugin="{plugin_id}",hook="{hook}"'
+        lines.append(
+            f'saleor_plugin_hook_calls_total{{{labels},outcome="success"}} '
+            f"{hook_stats.calls - hook_stats.errors}"
+        )
+        lines.append(
+            f'saleor_plugin_hook_calls_total{{{labels},outcome="error"}} '
+            f"{hook_stats.errors}"
+        )
+
+    lines += [
+        "# HELP saleor_plugin_hook_duration_seconds Duration of plugin hook calls.",
+        "# TYPE saleor_plugin_hook_duration_seconds histogram",
+    ]
+    for (plugin_id, hook), hook_stats in sorted(stats.items()):
+        labels = f'plugin="{plugin_id}",hook="{hook}"'
+        cumulative_count = 0
+        for bound, count in zip(HOOK_DURATION_BUCKETS, hook_stats.buckets):
+            cumulative_count += count
+            lines.append(
+                f'saleor_plugin_hook_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                f"{cumulative_count}"
+            )
+        lines.append(
+            f'saleor_plugin_hook_duration_seconds_bucket{{{labels},le="+Inf"}} '
+            f"{hook_stats.calls}"
+        )
+        lines.append(
+            f"saleor_plugin_hook_duration_seconds_sum{{{labels}}} "
+            f"{hook_stats.total_duration}"
+        )
+        lines.append(
+            f"saleor_plugin_hook_duration_seconds_count{{{labels}}} {hook_stats.calls}"
+        )
+    return "\n".join(lines) + "\n"
@@ -7,6 +7,7 @@ from ...discount import DiscountInfo
 from ...order.models import Order
 from ...streaming.stream_ticket import validate_stream_ticket_checkout, \
     create_stream_ticket_from_order
+from ...streaming.tasks import enqueue_user_watch_log
 from ...streaming.user_watch_log import create_user_watch_log_from_stream_ticket
 
 logger = logging.getLogger(__name__)
@@ -39,7 +40,9 @@ class StreamingPlugin(BasePlugin):
     def order_created(self, order: "Order", previous_value: Any) -> Any:
         try:
             stream_ticket = create_stream_ticket_from_order(order)
-            create_user_watch_log_from_stream_ticket(stream_ticket)
+            user_watch_log = create_user_watch_log_from_stream_ticket(stream_ticket)
+            if user_watch_log is not None:
+                enqueue_user_watch_log(user_watch_log)
         except Exception as exc:
             logger.exception(
                 f"[stream checkout] FATAL error after creating order with id {order.pk}",
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+import pytest
+
+from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
+from ...manager import PluginsManager
+from ..sample_plugins import ALL_PLUGINS
+
+ALL_PLUGINS_PATHS = [f"{plugin.__module__}.{plugin.__name__}" for plugin in ALL_PLUGINS]
+
+
+def count_plugin_method_lookups(func, *args) -> int:
+    """Return the number of plugin methods looked up while running the function."""
+    run_on_plugin = PluginsManager._PluginsManager__run_method_on_single_plugin
+    with patch.object(
+        PluginsManager,
+        "_PluginsManager__run_method_on_single_plugin",
+        autospec=True,
+        side_effect=run_on_plugin,
+    ) as mocked_run_on_plugin:
+        func(*args)
+    return mocked_run_on_plugin.call_count
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+@pytest.mark.parametrize("lines_count", [1, 10])
+def test_calculate_checkout_total(
+    lines_count, checkout_with_item, count_queries, monkeypatch
+):
+    manager = PluginsManager(plugins=ALL_PLUGINS_PATHS)
+    lines, _ = fetch_checkout_lines(checkout_with_item)
+    lines = lines * lines_count
+    checkout_info = fetch_checkout_info(checkout_with_item, lines, [], manager)
+    args = (checkout_info, lines, None, [])
+
+    dispatched_lookups = count_plugin_method_lookups(
+        manager.calculate_checkout_total, *args
+    )
+    # without the dispatch table every hook scans all plugins of the channel
+    monkeypatch.setattr("saleor.plugins.manager.PLUGIN_HOOKS", frozenset())
+    scanned_lookups = count_plugin_method_lookups(
+        manager.calculate_checkout_total, *args
+    )
+
+    assert dispatched_lookups < scanned_lookups
@@ -3,17 +3,22 @@ from decimal import Decimal
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
 from django.http import HttpResponseNotFound, JsonResponse
+from django.test import TestCase
 from django_countries.fields import Country
 from prices import Money, TaxedMoney
 
+from ...channel.models import Channel
 from ...checkout.fetch import fetch_checkout_info, fetch_checkout_lines
+from ...core.caching import CachePrefix, get_cache_version_key
+from ...core.middleware import plugins as plugins_middleware
 from ...core.prices import quantize_price
 from ...core.taxes import TaxType, zero_taxed_money
 from ...payment.interface import PaymentGateway
 from ...product.models import Product
-from ..base_plugin import ExternalAccessTokens
-from ..manager import PluginsManager, get_plugins_manager
+from ..base_plugin import ExternalAccessTokens, plugins_request_scope
+from ..manager import PluginsManager, get_plugins_manager, plugins_manager_cache
 from ..models import PluginConfiguration
 from ..tests.sample_plugins import (
     ACTIVE_PLUGINS,
@@ -1034,3 +1039,122 @@ def test_calculate_checkout_total_zero_default_value(
     # then
     assert "calculate_checkout_total" not in mocked_run_method.call_args_list
     assert taxed_total == zero_taxed_money(currency)
+
+
+@pytest.fixture
+def cached_plugins_manager(settings):
+    settings.PLUGINS_MANAGER_CACHE_ENABLED = True
+    settings.PLUGINS = [
+        "saleor.plugins.tests.sample_plugins.PluginSample",
+        "saleor.plugins.tests.sample_plugins.ChannelPluginSample",
+    ]
+    plugins_manager_cache.clear()
+    cache.delete(get_cache_version_key(CachePrefix.PLUGINS_MANAGER))
+    yield
+    plugins_manager_cache.clear()
+    cache.delete(get_cache_version_key(CachePrefix.PLUGINS_MANAGER))
+
+
+def test_get_plugins_manager_reuses_cached_manager(
+    cached_plugins_manager, channel_USD, django_assert_num_queries
+):
+    manager = get_plugins_manager()
+
+    with django_assert_num_queries(0):
+        assert get_plugins_manager() is manager
+
+
+def test_cached_plugins_manager_rebuilt_after_channel_created(
+    cached_plugins_manager, channel_USD
+):
+    manager = get_plugins_manager()
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        channel = Channel.objects.create(
+            name="New channel", slug="new-channel", currency_code="USD"
+        )
+
+    new_manager = get_plugins_manager()
+    assert new_manager is not manager
+    assert new_manager.get_plugin(ChannelPluginSample.PLUGIN_ID, channel.slug)
+
+
+def test_cached_plugins_manager_rebuilt_after_configuration_saved(
+    cached_plugins_manager, plugin_configuration
+):
+    manager = get_plugins_manager()
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        manager.save_plugin_configuration(
+            PluginSample.PLUGIN_ID, None, {"active": False}
+        )
+
+    new_manager = get_plugins_manager()
+    assert new_manager is not manager
+    assert not new_manager.get_plugin(PluginSample.PLUGIN_ID).active
+
+
+def test_cached_plugins_manager_shared_by_requests(
+    cached_plugins_manager, rf, django_assert_num_queries
+):
+    def get_response(request):
+        return request.plugins.get_plugin(PluginSample.PLUGIN_ID)
+
+    handler = plugins_middleware(get_response)
+    plugin = handler(rf.get("/"))
+
+    with django_assert_num_queries(0):
+        assert handler(rf.get("/")) is plugin
+
+
+def test_plugin_request_state_is_scoped_to_request():
+    plugin = PluginSample(configuration=[], active=True)
+
+    with plugins_request_scope():
+        plugin.request_state["value"] = 1
+        assert plugin.request_state == {"value": 1}
+
+    with plugins_request_scope():
+        assert plugin.request_state == {}
+    assert plugin.request_state == {}
+
+
+def test_dispatch_table_contains_only_hook_implementations(channel_USD):
+    plugins = [
+        "saleor.plugins.tests.sample_plugins.PluginSample",
+        "saleor.plugins.tests.sample_plugins.ActivePlugin",
+    ]
+
+    manager = PluginsManager(plugins=plugins)
+
+    # ActivePlugin doesn't implement any hook
+    for channel_slug in [None, channel_USD.slug]:
+        hooks = manager.dispatch_table[channel_slug]
+        implementations = hooks["calculate_checkout_total"]
+        assert [plugin.PLUGIN_ID for plugin in implementations] == [
+            PluginSample.PLUGIN_ID
+        ]
+
+
+def test_run_method_on_plugins_calls_only_hook_implementations(
+    checkout_with_item, all_plugins_manager
+):
+    run_method = PluginsManager._PluginsManager__run_method_on_single_plugin
+    lines, _ = fetch_checkout_lines(checkout_with_item)
+    checkout_info = fetch_checkout_info(
+        checkout_with_item, lines, [], all_plugins_manager
+    )
+
+    with mock.patch.object(
+        PluginsManager,
+        "_PluginsManager__run_method_on_single_plugin",
+        autospec=True,
+        side_effect=run_method,
+    ) as mocked_run_method:
+        all_plugins_manager.calculate_checkout_total(checkout_info, lines, None, [])
+
+    assert mocked_run_method.called
+    for call in mocked_run_method.call_args_list:
+        _, plugin, method_name, *_ = call.args
+        assert plugin.active
+        assert getattr(type(plugin), method_name, None) is not None
@@ -0,0 +1,175 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from ..manager import PluginsManager
+from ..metrics import (
+    PROCESS_METRICS_TIMEOUT,
+    HookMetrics,
+    get_hook_metrics,
+    get_process_metrics_key,
+    get_slowest_hooks,
+    hook_metrics,
+    register_process,
+    render_prometheus_metrics,
+)
+from ..views import plugin_hook_metrics as plugin_hook_metrics_view
+
+SAMPLE_PLUGIN = "saleor.plugins.tests.sample_plugins.PluginSample"
+
+
+@pytest.fixture
+def plugin_hook_metrics(settings):
+    settings.PLUGINS_HOOK_METRICS_ENABLED = True
+    settings.PLUGINS_HOOK_METRICS_FLUSH_INTERVAL = 0
+    hook_metrics.reset()
+    yield hook_metrics
+    hook_metrics.reset()
+
+
+def test_hook_metrics_record():
+    metrics = HookMetrics()
+
+    metrics.record("plugin.sample", "show_taxes_on_storefront", 0.002)
+    metrics.record("plugin.sample", "show_taxes_on_storefront", 0.2, failed=True)
+
+    stats = metrics.snapshot()[("plugin.sample", "show_taxes_on_storefront")]
+    assert stats.calls == 2
+    assert stats.errors == 1
+    assert stats.max_duration == 0.2
+    assert stats.avg_duration == pytest.approx(0.101)
+    assert sum(stats.buckets) == 2
+
+
+def test_get_slowest_hooks():
+    metrics = HookMetrics()
+    metrics.record("plugin.a", "hook", 0.5)
+    metrics.record("plugin.b", "hook", 0.1)
+    metrics.record("plugin.b", "hook", 0.1)
+    metrics.record("plugin.b", "hook", 0.1)
+    stats = metrics.snapshot()
+
+    assert [key for key, _ in get_slowest_hooks(stats, 1)] == [("plugin.a", "hook")]
+    assert [key for key, _ in get_slowest_hooks(stats, 1, sort_by="calls")] == [
+        ("plugin.b", "hook")
+    ]
+
+
+def test_manager_records_hook_calls(plugin_hook_metrics):
+    manager = PluginsManager(plugins=[SAMPLE_PLUGIN])
+
+    manager.show_taxes_on_storefront()
+
+    stats = plugin_hook_metrics.snapshot()
+    assert stats[("plugin.sample", "show_taxes_on_storefront")].calls == 1
+
+
+@patch(
+    "saleor.plugins.tests.sample_plugins.PluginSample.show_taxes_on_storefront",
+    side_effect=ValueError,
+)
+def test_manager_records_failed_hook_calls(_mocked_hook, plugin_hook_metrics):
+    manager = PluginsManager(plugins=[SAMPLE_PLUGIN])
+
+    with pytest.raises(ValueError):
+        manager.show_taxes_on_storefront()
+
+    stats = plugin_hook_metrics.snapshot()
+    assert stats[("plugin.sample", "show_taxes_on_storefront")].errors == 1
+
+
+def test_manager_skips_hook_metrics_when_disabled(settings):
+    settings.PLUGINS_HOOK_METRICS_ENABLED = False
+    hook_metrics.reset()
+    manager = PluginsManager(plugins=[SAMPLE_PLUGIN])
+
+    manager.show_taxes_on_storefront()
+
+    assert hook_metrics.snapshot() == {}
+
+
+def test_get_hook_metrics_merges_flushed_processes(
+    plugin_hook_metrics, redis_client
+):
+    other_process = HookMetrics()
+    other_process.record("plugin.sample", "show_taxes_on_storefront", 0.1)
+    cache.set("PluginHookMetrics:other", other_process.snapshot())
+    register_process("PluginHookMetrics:other")
+    plugin_hook_metrics.record("plugin.sample", "show_taxes_on_storefront", 0.1)
+
+    stats = get_hook_metrics()
+
+    assert stats[("plugin.sample", "show_taxes_on_storefront")].calls == 2
+    assert get_hook_metrics(local_only=True)[
+        ("plugin.sample", "show_taxes_on_storefront")
+    ].calls == 1
+    cache.delete("PluginHookMetrics:other")
+
+
+def test_register_process_drops_stopped_processes(redis_client, monkeypatch):
+    monkeypatch.setattr("saleor.plugins.metrics.time.time", lambda: 1000.0)
+    register_process("PluginHookMetrics:stopped")
+    monkeypatch.setattr(
+        "saleor.plugins.metrics.time.time", lambda: 1000.0 + PROCESS_METRICS_TIMEOUT + 1
+    )
+
+    register_process(get_process_metrics_key())
+
+    members = list(redis_client.sorted_sets.values())[0]
+    assert list(members) == [get_process_metrics_key()]
+
+
+def test_plugin_hook_metrics_view_requires_token(rf, settings):
+    settings.METRICS_TOKEN = "secret"
+
+    response = plugin_hook_metrics_view(
+        rf.get("/metrics/plugins/", HTTP_AUTHORIZATION="Bearer secret")
+    )
+    wrong_token_response = plugin_hook_metrics_view(
+        rf.get("/metrics/plugins/", HTTP_AUTHORIZATION="Bearer other")
+    )
+
+    assert response.status_code == 200
+    assert wrong_token_response.status_code == 403
+
+
+def test_plugin_hook_metrics_view_refused_without_configured_token(rf, settings):
+    settings.METRICS_TOKEN = None
+
+    response = plugin_hook_metrics_view(rf.get("/metrics/plugins/"))
+
+    assert response.status_code == 403
+
+
+def test_render_prometheus_metrics():
+    metrics = HookMetrics()
+    metrics.record("plugin.sample", "hook", 0.003)
+    metrics.record("plugin.sample", "hook", 20, failed=True)
+
+    output = render_prometheus_metrics(metrics.snapshot())
+
+    labels = 'plugin="plugin.sample",hook="hook"'
+    assert f'saleor_plugin_hook_calls_total{{{labels},outcome="success"}} 1' in output
+    assert f'saleor_plugin_hook_calls_total{{{labels},outcome="error"}} 1' in output
+    assert f'saleor_plugin_hook_duration_seconds_bucket{{{labels},le="0.001"}} 0' in (
+        output
+    )
+    assert f'saleor_plugin_hook_duration_seconds_bucket{{{labels},le="10.0"}} 1' in (
+        output
+    )
+    assert f'saleor_plugin_hook_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in (
+        output
+    )
+    assert f"saleor_plugin_hook_duration_seconds_count{{{labels}}} 2" in output
+
+
+def test_plugin_hook_stats_command(plugin_hook_metrics, capsys):
+    plugin_hook_metrics.record("plugin.sample", "show_taxes_on_storefront", 0.1)
+
+    call_command("plugin_hook_stats", local_only=True, limit=5)
+
+    output = capsys.readouterr().out
+    assert "plugin.sample" in output
+    assert "show_taxes_on_storefront" in output
@@ -125,7 +125,6 @@ class VatlayerPlugin(BasePlugin):
             excluded_countries=excluded_countries,
             countries_from_origin=countries_from_origin,
         )
-        self._cached_taxes = {}
 
     def _skip_plugin(
         self,
@@ -219,12 +218,13 @@ class VatlayerPlugin(BasePlugin):
         if country_code in self.config.excluded_countries:
             return None
 
-        if country_code in self._cached_taxes:
-            return self._cached_taxes[country_code]
+        cached_taxes = self.request_state.setdefault("taxes", {})
+        if country_code in cached_taxes:
+            return cached_taxes[country_code]
 
         country = Country(country_code)
         taxes = get_taxes_for_country(country)
-        self._cached_taxes[country_code] = taxes
+        cached_taxes[country_code] = taxes
         return taxes
 
     def calculate_checkout_shipping(
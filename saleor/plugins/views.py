@@ -1,7 +1,14 @@
+import hmac
+from functools import wraps
+
+from django.conf import settings
 from django.core.handlers.wsgi import WSGIRequest
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseForbidden
 
+from ..webhook.models import Webhook
 from .manager import get_plugins_manager
+from .metrics import get_hook_metrics, render_prometheus_metrics
+from .webhook.delivery import get_delivery_metrics, render_prometheus_delivery_metrics
 
 
 def handle_plugin_webhook(request: WSGIRequest, plugin_id: str) -> HttpResponse:
@@ -19,3 +26,40 @@ def handle_plugin_per_channel_webhook(
 ) -> HttpResponse:
     manager = get_plugins_manager()
     return manager.webhook(request, plugin_id, channel_slug=channel_slug)
+
+
+def metrics_token_required(view):
+    """Serve the metrics only to the scrapers sending `METRICS_TOKEN`.
+
+    The token is expected in the `Authorization: Bearer <token>` header. All
+    requests are refused without a configured token.
+    """
+
+    @wraps(view)
+    def wrapper(request: WSGIRequest, *args, **kwargs) -> HttpResponse:
+        token = settings.METRICS_TOKEN
+        authorization = request.META.get("HTTP_AUTHORIZATION", "")
+        if not token or not hmac.compare_digest(
+            authorization.encode(), f"Bearer {token}".encode()
+        ):
+            return HttpResponseForbidden()
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@metrics_token_required
+def plugin_hook_metrics(request: WSGIRequest) -> HttpResponse:
+    return HttpResponse(
+        render_prometheus_metrics(get_hook_metrics()),
+        content_type="text/plain; version=0.0.4",
+    )
+
+
+@metrics_token_required
+def webhook_delivery_metrics(request: WSGIRequest) -> HttpResponse:
+    webhooks = Webhook.objects.select_related("app")
+    return HttpResponse(
+        render_prometheus_delivery_metrics(get_delivery_metrics(webhooks)),
+        content_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,154 @@
+"""Buffers coalescing the events of a webhook into batch requests.
+
+Events of a webhook are kept in a Redis hash keyed by the event type and the ID of
+the object in the payload, so repeated updates of an object within the batch
+window replace each other and only its latest state is sent. Every event gets a
+sequence number, the batch is sent in the order the latest events were added.
+
+Batches of a webhook are sent one flush at a time. While the batches of a flush
+are in flight, including their retries, the next flush waits, so newer events
+never overtake the retried ones. A single flush is kept pending per webhook while
+they wait.
+"""
+import json
+from typing import List, Optional, Tuple
+
+from django.core.cache import cache
+
+from ...core.caching import CachePrefix, get_redis_client, is_redis_cache
+
+# event type sent in the headers of batch requests
+BATCH_EVENT_TYPE = "batch"
+
+# SQS accepts up to 10 messages in a single request
+SQS_MAX_BATCH_SIZE = 10
+
+# the longest the next flush waits for the batches of the previous one
+IN_FLIGHT_TIMEOUT = 15 * 60
+
+BatchEvent = Tuple[str, str]
+
+
+def is_batching_available() -> bool:
+    """Return whether events can be buffered; without Redis they are sent one by one."""
+    return is_redis_cache()
+
+
+def get_batch_key(webhook_id: int, suffix: str) -> str:
+    return cache.make_key(f"{CachePrefix.WEBHOOK_BATCH}:{webhook_id}:{suffix}")
+
+
+def get_payload_object_id(data: str) -> Optional[str]:
+    """Return the ID of the object the payload describes.
+
+    Payloads of a single instance are lists of a single serialized object.
+    """
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return None
+    if isinstance(payload, list) and len(payload) == 1:
+        payload = payload[0]
+    if isinstance(payload, dict) and payload.get("id") is not None:
+        return str(payload["id"])
+    return None
+
+
+def add_to_batch(
+    webhook_id: int, event_type: str, data: str, window: int
+) -> Tuple[int, bool]:
+    """Add the event to the batch of the webhook.
+
+    Return the number of events in the batch and whether it's the first event
+    since the batch was last sent, so the flush has to be scheduled.
+    """
+    client = get_redis_client()
+    seq = client.incr(get_batch_key(webhook_id, "seq"))
+    object_id = get_payload_object_id(data)
+    field = f"{event_type}:{object_id if object_id is not None else f'#{seq}'}"
+    events_key = get_batch_key(webhook_id, "events")
+
+    pipeline = client.pipeline()
+    pipeline.hset(events_key, field, json.dumps([seq, event_type, data]))
+    pipeline.hlen(events_key)
+    # events outlive the window in case the flush task is delayed
+    pipeline.expire(events_key, max(window * 10, 60))
+    _, size, _ = pipeline.execute()
+
+    scheduled = client.set(
+        get_batch_key(webhook_id, "scheduled"), 1, nx=True, ex=max(window * 2, 1)
+    )
+    return size, bool(scheduled)
+
+
+def pop_batch(webhook_id: int) -> List[BatchEvent]:
+    """Remove the events of the webhook batch and return them in order."""
+    client = get_redis_client()
+    pipeline = client.pipeline(transaction=True)
+    pipeline.hgetall(get_batch_key(webhook_id, "events"))
+    pipeline.delete(get_batch_key(webhook_id, "events"))
+    pipeline.delete(get_batch_key(webhook_id, "scheduled"))
+    entries, _, _ = pipeline.execute()
+
+    events = sorted(json.loads(entry) for entry in entries.values())
+    return [(event_type, data) for _seq, event_type, data in events]
+
+
+def mark_batch_flush_pending(
+    webhook_id: int, window: int, refresh: bool = False
+) -> bool:
+    """Mark a flush of the webhook batch as pending, return False if one already is.
+
+    The pending flush refreshes the mark when it's postponed, and keeps the events
+    in the buffer until it runs.
+    """
+    client = get_redis_client()
+    pipeline = client.pipeline()
+    pipeline.set(
+        get_batch_key(webhook_id, "scheduled"),
+        1,
+        nx=not refresh,
+        ex=max(window * 2, 1),
+    )
+    pipeline.expire(get_batch_key(webhook_id, "events"), max(window * 10, 60))
+    marked, _ = pipeline.execute()
+    return bool(marked)
+
+
+def start_batch_delivery(webhook_id: int) -> bool:
+    """Mark the webhook batches as in flight, return False if they already are."""
+    client = get_redis_client()
+    key = get_batch_key(webhook_id, "in_flight")
+    return bool(client.set(key, 0, nx=True, ex=IN_FLIGHT_TIMEOUT))
+
+
+def set_batches_in_flight(webhook_id: int, count: int):
+    """Store the number of batches sent by the flush; none ends the delivery."""
+    client = get_redis_client()
+    key = get_batch_key(webhook_id, "in_flight")
+    if count:
+        client.set(key, count, ex=IN_FLIGHT_TIMEOUT)
+    else:
+        client.delete(key)
+
+
+def finish_batch_delivery(webhook_id: int):
+    """Count the batch as delivered or dropped, the last one ends the delivery."""
+    if not is_batching_available():
+        return
+    client = get_redis_client()
+    key = get_batch_key(webhook_id, "in_flight")
+    if client.decr(key) <= 0:
+        client.delete(key)
+
+
+def generate_batch_payload(events: List[BatchEvent]) -> str:
+    """Wrap the payloads of the events in a single list, without parsing them."""
+    return "[%s]" % ", ".join(
+        '{"event_type": %s, "payload": %s}' % (json.dumps(event_type), data)
+        for event_type, data in events
+    )
+
+
+def split_batch(events: List[BatchEvent], size: int) -> List[List[BatchEvent]]:
+    return [events[i:i + size] for i in range(0, len(events), size)]
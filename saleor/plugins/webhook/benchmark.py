@@ -0,0 +1,77 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import override_settings
+
+from .tasks import send_webhook_using_http
+
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    """Accept every webhook, keeping the connection alive like most targets."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubWebhookServer:
+    """Local HTTP server receiving the webhooks of the benchmark."""
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubWebhookHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/webhook/"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_deliveries(
+    target_url: str, deliveries: int, workers: int, payload_size: int
+) -> float:
+    """Deliver the webhooks from the worker threads and return the elapsed time."""
+    message = b"x" * payload_size
+
+    def deliver(_):
+        send_webhook_using_http(target_url, message, "localhost", "", "benchmark")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(deliver, range(deliveries)))
+    return time.perf_counter() - start
+
+
+def benchmark_http_transport(
+    deliveries: int = 500, workers: int = 4, payload_size: int = 2048
+) -> dict:
+    """Compare HTTP deliveries per second with and without pooled connections."""
+    results = {}
+    with StubWebhookServer() as server:
+        for name, pooling in [("unpooled", False), ("pooled", True)]:
+            with override_settings(WEBHOOK_TRANSPORT_POOLING_ENABLED=pooling):
+                elapsed = run_deliveries(server.url, deliveries, workers, payload_size)
+            results[name] = {
+                "deliveries": deliveries,
+                "elapsed_s": round(elapsed, 3),
+                "deliveries_per_s": round(deliveries / elapsed, 1) if elapsed else 0,
+            }
+    return results
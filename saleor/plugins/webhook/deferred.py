@@ -0,0 +1,61 @@
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from django.apps import apps
+from django.conf import settings
+
+from ...webhook.payloads import (
+    generate_checkout_payload,
+    generate_customer_payload,
+    generate_fulfillment_payload,
+    generate_invoice_payload,
+    generate_order_payload,
+    generate_page_payload,
+    generate_product_payload,
+    generate_product_variant_payload,
+)
+
+logger = logging.getLogger(__name__)
+
+# payload generators of the instances by model label
+PAYLOAD_GENERATORS: Dict[str, Callable[[Any], str]] = {
+    "account.User": generate_customer_payload,
+    "checkout.Checkout": generate_checkout_payload,
+    "invoice.Invoice": generate_invoice_payload,
+    "order.Fulfillment": generate_fulfillment_payload,
+    "order.Order": generate_order_payload,
+    "page.Page": generate_page_payload,
+    "product.Product": generate_product_payload,
+    "product.ProductVariant": lambda variant: generate_product_variant_payload(
+        [variant]
+    ),
+}
+
+
+def should_defer_payload(event_type: str) -> bool:
+    """Return whether the payload of the event is generated by the worker.
+
+    Events listed in `WEBHOOK_SNAPSHOT_EVENTS` capture the state of the instance
+    when they are emitted, the others send its state at the time of delivery.
+    """
+    return (
+        settings.WEBHOOK_DEFERRED_PAYLOADS_ENABLED
+        and event_type not in settings.WEBHOOK_SNAPSHOT_EVENTS
+    )
+
+
+def generate_instance_payload(instance) -> str:
+    return PAYLOAD_GENERATORS[instance._meta.label](instance)
+
+
+def generate_deferred_payload(model_label: str, pk: str) -> Optional[str]:
+    """Load the instance and generate its payload.
+
+    Return None if the instance was deleted before the payload was generated.
+    """
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        logger.info("[Webhook] %s %s no longer exists.", model_label, pk)
+        return None
+    return generate_instance_payload(instance)
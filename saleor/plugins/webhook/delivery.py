@@ -0,0 +1,282 @@
+"""Delivery attempts, circuit breakers and delivery metrics of webhooks.
+
+Deliveries to a webhook are paused when the share of failed attempts within the
+recent window exceeds `WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE`. While paused, a
+single delivery probes the target every `WEBHOOK_CIRCUIT_BREAKER_PROBE_INTERVAL`
+and deliveries resume once a probe succeeds. The state of the breakers is kept in
+the cache, so it's shared by all workers.
+"""
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db.models import Avg, Count, Max, Q
+from django.utils import timezone
+
+from ...core.caching import CachePrefix
+from ...webhook import WebhookDeliveryStatus
+from ...webhook.models import Webhook, WebhookDeliveryAttempt
+
+# attempts the latency metrics are computed from
+DELIVERY_METRICS_WINDOW = timedelta(minutes=5)
+
+
+def get_circuit_key(webhook_id: int, suffix: str) -> str:
+    return f"{CachePrefix.WEBHOOK_CIRCUIT}:{webhook_id}:{suffix}"
+
+
+def get_queue_depth_key(webhook_id: int) -> str:
+    return f"{CachePrefix.WEBHOOK_QUEUE_DEPTH}:{webhook_id}"
+
+
+def record_delivery_attempt(
+    webhook_id: int,
+    event_type: str,
+    duration: float,
+    failed: bool,
+    response_code: Optional[int] = None,
+):
+    """Store the outcome of a delivery and update the circuit breaker of the webhook."""
+    store_delivery_attempt(webhook_id, event_type, duration, failed, response_code)
+    if settings.WEBHOOK_CIRCUIT_BREAKER_ENABLED:
+        record_circuit_outcome(webhook_id, failed)
+
+
+def record_dropped_delivery(webhook_id: int, event_type: str):
+    """Store the delivery dropped without an attempt as a failed one.
+
+    The target wasn't reached, so the circuit breaker of the webhook is left as is.
+    """
+    store_delivery_attempt(webhook_id, event_type, 0.0, failed=True)
+
+
+def store_delivery_attempt(
+    webhook_id: int,
+    event_type: str,
+    duration: float,
+    failed: bool,
+    response_code: Optional[int] = None,
+):
+    if not settings.WEBHOOK_DELIVERY_ATTEMPTS_ENABLED:
+        return
+    status = WebhookDeliveryStatus.FAILED if failed else WebhookDeliveryStatus.SUCCESS
+    try:
+        WebhookDeliveryAttempt.objects.create(
+            webhook_id=webhook_id,
+            event_type=event_type,
+            status=status,
+            duration=duration,
+            response_code=response_code,
+        )
+    except IntegrityError:
+        # the webhook was deleted during the delivery
+        pass
+
+
+def get_response_code(response_or_error) -> Optional[int]:
+    """Return the HTTP status of a response or of the error raised for it."""
+    if isinstance(response_or_error, Exception):
+        response_or_error = getattr(response_or_error, "response", None)
+    return getattr(response_or_error, "status_code", None)
+
+
+def delete_old_delivery_attempts() -> int:
+    created_before = timezone.now() - timedelta(
+        seconds=settings.WEBHOOK_DELIVERY_ATTEMPTS_RETENTION
+    )
+    count, _ = WebhookDeliveryAttempt.objects.filter(
+        created__lt=created_before
+    ).delete()
+    return count
+
+
+def get_paused_until(webhook_id: int) -> Optional[float]:
+    """Return the time of the next probe of the webhook, None if it isn't paused."""
+    return cache.get(get_circuit_key(webhook_id, "paused"))
+
+
+def is_delivery_allowed(webhook_id: int) -> bool:
+    """Return whether a delivery to the webhook can be attempted.
+
+    Once the probe interval passes, a single delivery is let through to probe the
+    target.
+    """
+    if not settings.WEBHOOK_CIRCUIT_BREAKER_ENABLED:
+        return True
+    paused_until = get_paused_until(webhook_id)
+    if paused_until is None:
+        return True
+    if time.time() < paused_until:
+        return False
+    return cache.add(
+        get_circuit_key(webhook_id, "probe"),
+        1,
+        timeout=settings.WEBHOOK_CIRCUIT_BREAKER_PROBE_INTERVAL,
+    )
+
+
+def get_pause_delay(webhook_id: int) -> int:
+    """Return the number of seconds a paused delivery waits before another try."""
+    paused_until = get_paused_until(webhook_id) or 0
+    delay = int(paused_until - time.time())
+    # the probe is already in progress, so wait for the next one
+    return max(delay, 0) or settings.WEBHOOK_CIRCUIT_BREAKER_PROBE_INTERVAL
+
+
+def pause_deliveries(webhook_id: int):
+    paused_until = time.time() + settings.WEBHOOK_CIRCUIT_BREAKER_PROBE_INTERVAL
+    cache.set(get_circuit_key(webhook_id, "paused"), paused_until, timeout=None)
+    cache.delete(get_circuit_key(webhook_id, "probe"))
+
+
+def resume_deliveries(webhook_id: int):
+    cache.delete_many(
+        [
+            get_circuit_key(webhook_id, "paused"),
+            get_circuit_key(webhook_id, "probe"),
+            *get_window_keys(webhook_id),
+        ]
+    )
+
+
+def get_window_keys(webhook_id: int) -> List[str]:
+    """Return the keys of the attempt counters of the current and previous window."""
+    window = int(time.time() // settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW)
+    return [
+        get_circuit_key(webhook_id, f"{bucket}:{counter}")
+        for bucket in (window, window - 1)
+        for counter in ("attempts", "failures")
+    ]
+
+
+def increment_counter(key: str, timeout: int) -> int:
+    cache.add(key, 0, timeout=timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # the key expired in between
+        cache.set(key, 1, timeout=timeout)
+        return 1
+
+
+def record_circuit_outcome(webhook_id: int, failed: bool):
+    """Count the attempt and pause the deliveries if too many of them failed.
+
+    Failure rate is computed from the attempts of the current and the previous
+    window, so it doesn't drop to zero at the beginning of every window.
+    """
+    if get_paused_until(webhook_id) is not None:
+        # outcome of a probe or of a delivery started before the pause
+        if failed:
+            pause_deliveries(webhook_id)
+        else:
+            resume_deliveries(webhook_id)
+        return
+
+    keys = get_window_keys(webhook_id)
+    attempts_key, failures_key, previous_attempts_key, previous_failures_key = keys
+    timeout = settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW * 2
+    attempts = increment_counter(attempts_key, timeout)
+    if not failed:
+        return
+    failures = increment_counter(failures_key, timeout)
+
+    previous = cache.get_many([previous_attempts_key, previous_failures_key])
+    attempts += previous.get(previous_attempts_key, 0)
+    failures += previous.get(previous_failures_key, 0)
+    if (
+        attempts >= settings.WEBHOOK_CIRCUIT_BREAKER_MIN_ATTEMPTS
+        and failures / attempts >= settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE
+    ):
+        pause_deliveries(webhook_id)
+
+
+def increment_queue_depth(webhook_id: int, delta: int = 1):
+    """Count the deliveries of the webhook waiting in the queue.
+
+    The counter is approximate, deliveries lost by the broker are never
+    subtracted.
+    """
+    if not settings.WEBHOOK_DELIVERY_METRICS_ENABLED:
+        return
+    key = get_queue_depth_key(webhook_id)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, max(delta, 0), timeout=None)
+
+
+def decrement_queue_depth(webhook_id: int):
+    increment_queue_depth(webhook_id, -1)
+
+
+def get_delivery_metrics(webhooks: Iterable[Webhook]) -> Dict[str, dict]:
+    """Return the recent delivery stats and the queue depth of the webhooks by app."""
+    webhooks = list(webhooks)
+    metrics: Dict[str, dict] = defaultdict(
+        lambda: {
+            "deliveries": 0,
+            "failures": 0,
+            "avg_duration": 0.0,
+            "max_duration": 0.0,
+            "queue_depth": 0,
+            "paused_webhooks": 0,
+        }
+    )
+    since = timezone.now() - DELIVERY_METRICS_WINDOW
+    attempts = (
+        WebhookDeliveryAttempt.objects.filter(created__gte=since)
+        .values("webhook__app__name")
+        .annotate(
+            deliveries=Count("pk"),
+            failures=Count("pk", filter=Q(status=WebhookDeliveryStatus.FAILED)),
+            avg_duration=Avg("duration"),
+            max_duration=Max("duration"),
+        )
+        .order_by()
+    )
+    for row in attempts:
+        metrics[row.pop("webhook__app__name")].update(row)
+
+    depths = cache.get_many([get_queue_depth_key(webhook.pk) for webhook in webhooks])
+    paused = cache.get_many(
+        [get_circuit_key(webhook.pk, "paused") for webhook in webhooks]
+    )
+    for webhook in webhooks:
+        app_metrics = metrics[webhook.app.name]
+        app_metrics["queue_depth"] += max(
+            depths.get(get_queue_depth_key(webhook.pk), 0), 0
+        )
+        if get_circuit_key(webhook.pk, "paused") in paused:
+            app_metrics["paused_webhooks"] += 1
+    return dict(metrics)
+
+
+def format_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus_delivery_metrics(metrics: Dict[str, dict]) -> str:
+    """Render the delivery metrics in the Prometheus text exposition format."""
+    gauges = [
+        ("deliveries", "Webhook deliveries attempted within the last 5 minutes."),
+        ("failures", "Failed webhook deliveries within the last 5 minutes."),
+        ("avg_duration", "Average latency of webhook deliveries in seconds."),
+        ("max_duration", "Maximal latency of webhook deliveries in seconds."),
+        ("queue_depth", "Webhook deliveries waiting in the queue."),
+        ("paused_webhooks", "Webhooks with paused deliveries."),
+    ]
+    lines = []
+    for name, description in gauges:
+        metric = f"saleor_webhook_{name}"
+        lines += [f"# HELP {metric} {description}", f"# TYPE {metric} gauge"]
+        for app_name, app_metrics in sorted(metrics.items()):
+            lines.append(
+                f'{metric}{{app="{format_label(app_name)}"}} {app_metrics[name] or 0}'
+            )
+    return "\n".join(lines) + "\n"
@@ -2,32 +2,32 @@ import json
 import logging
 from typing import TYPE_CHECKING, Any, List, Optional
 
+from django.db import transaction
+
 from ...app.models import App
 from ...core.utils.json_serializer import CustomJsonEncoder
 from ...payment import PaymentError, TransactionKind
 from ...shipping.interface import ShippingMethodData
 from ...webhook.event_types import WebhookEventType
 from ...webhook.payloads import (
-    generate_checkout_payload,
-    generate_customer_payload,
     generate_excluded_shipping_methods_for_checkout_payload,
     generate_excluded_shipping_methods_for_order_payload,
-    generate_fulfillment_payload,
     generate_invoice_payload,
     generate_list_gateways_payload,
     generate_order_payload,
     generate_page_payload,
     generate_payment_payload,
     generate_product_deleted_payload,
-    generate_product_payload,
     generate_product_variant_payload,
     generate_translation_payload,
 )
 from ..base_plugin import BasePlugin, ExcludedShippingMethod
 from .const import CACHE_EXCLUDED_SHIPPING_KEY
+from .deferred import generate_instance_payload, should_defer_payload
 from .tasks import (
     _get_webhooks_for_event,
     trigger_webhook_sync,
+    trigger_webhooks_for_deferred_event,
     trigger_webhooks_for_event,
 )
 from .utils import (
@@ -70,33 +70,45 @@ class WebhookPlugin(BasePlugin):
         super().__init__(*args, **kwargs)
         self.active = True
 
+    def _trigger_instance_webhooks(self, event_type: str, instance: Any):
+        """Send the payload of the instance to the webhooks of the event.
+
+        With deferred payloads only the instance is passed to the worker once the
+        transaction is committed, the worker generates the payload.
+        """
+        if not _get_webhooks_for_event(event_type):
+            return
+        if should_defer_payload(event_type):
+            model_label, pk = instance._meta.label, str(instance.pk)
+            transaction.on_commit(
+                lambda: trigger_webhooks_for_deferred_event.delay(
+                    event_type, model_label, pk
+                )
+            )
+        else:
+            trigger_webhooks_for_event.delay(
+                event_type, generate_instance_payload(instance)
+            )
+
     def order_created(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.ORDER_CREATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_order_payload(order))
+        self._trigger_instance_webhooks(WebhookEventType.ORDER_CREATED, order)
 
     def order_confirmed(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.ORDER_CONFIRMED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_order_payload(order))
+        self._trigger_instance_webhooks(WebhookEventType.ORDER_CONFIRMED, order)
 
     def order_fully_paid(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.ORDER_FULLY_PAID
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_order_payload(order))
+        self._trigger_instance_webhooks(WebhookEventType.ORDER_FULLY_PAID, order)
 
     def order_updated(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.ORDER_UPDATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_order_payload(order))
+        self._trigger_instance_webhooks(WebhookEventType.ORDER_UPDATED, order)
 
     def invoice_request(
         self,
@@ -107,11 +119,7 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.INVOICE_REQUESTED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type, generate_invoice_payload(invoice)
-            )
+        self._trigger_instance_webhooks(WebhookEventType.INVOICE_REQUESTED, invoice)
 
     def invoice_delete(self, invoice: "Invoice", previous_value: Any):
         if not self.active:
@@ -125,39 +133,27 @@ class WebhookPlugin(BasePlugin):
     def invoice_sent(self, invoice: "Invoice", email: str, previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.INVOICE_SENT
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type, generate_invoice_payload(invoice)
-            )
+        self._trigger_instance_webhooks(WebhookEventType.INVOICE_SENT, invoice)
 
     def order_cancelled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.ORDER_CANCELLED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_order_payload(order))
+        self._trigger_instance_webhooks(WebhookEventType.ORDER_CANCELLED, order)
 
     def order_fulfilled(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.ORDER_FULFILLED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_order_payload(order))
+        self._trigger_instance_webhooks(WebhookEventType.ORDER_FULFILLED, order)
 
     def draft_order_created(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.DRAFT_ORDER_CREATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_order_payload(order))
+        self._trigger_instance_webhooks(WebhookEventType.DRAFT_ORDER_CREATED, order)
 
     def draft_order_updated(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.DRAFT_ORDER_UPDATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_order_payload(order))
+        self._trigger_instance_webhooks(WebhookEventType.DRAFT_ORDER_UPDATED, order)
 
     def draft_order_deleted(self, order: "Order", previous_value: Any) -> Any:
         if not self.active:
@@ -169,47 +165,29 @@ class WebhookPlugin(BasePlugin):
     def fulfillment_created(self, fulfillment: "Fulfillment", previous_value):
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.FULFILLMENT_CREATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type, generate_fulfillment_payload(fulfillment)
-            )
+        self._trigger_instance_webhooks(
+            WebhookEventType.FULFILLMENT_CREATED, fulfillment
+        )
 
     def customer_created(self, customer: "User", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.CUSTOMER_CREATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type, generate_customer_payload(customer)
-            )
+        self._trigger_instance_webhooks(WebhookEventType.CUSTOMER_CREATED, customer)
 
     def customer_updated(self, customer: "User", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.CUSTOMER_UPDATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type, generate_customer_payload(customer)
-            )
+        self._trigger_instance_webhooks(WebhookEventType.CUSTOMER_UPDATED, customer)
 
     def product_created(self, product: "Product", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.PRODUCT_CREATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type, generate_product_payload(product)
-            )
+        self._trigger_instance_webhooks(WebhookEventType.PRODUCT_CREATED, product)
 
     def product_updated(self, product: "Product", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.PRODUCT_UPDATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type, generate_product_payload(product)
-            )
+        self._trigger_instance_webhooks(WebhookEventType.PRODUCT_UPDATED, product)
 
     def product_deleted(
         self, product: "Product", variants: List[int], previous_value: Any
@@ -228,24 +206,18 @@ class WebhookPlugin(BasePlugin):
     ) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.PRODUCT_VARIANT_CREATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type,
-                generate_product_variant_payload([product_variant]),
-            )
+        self._trigger_instance_webhooks(
+            WebhookEventType.PRODUCT_VARIANT_CREATED, product_variant
+        )
 
     def product_variant_updated(
         self, product_variant: "ProductVariant", previous_value: Any
     ) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.PRODUCT_VARIANT_UPDATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type,
-                generate_product_variant_payload([product_variant]),
-            )
+        self._trigger_instance_webhooks(
+            WebhookEventType.PRODUCT_VARIANT_UPDATED, product_variant
+        )
 
     def product_variant_deleted(
         self, product_variant: "ProductVariant", previous_value: Any
@@ -262,20 +234,12 @@ class WebhookPlugin(BasePlugin):
     def checkout_created(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.CHECKOUT_CREATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type, generate_checkout_payload(checkout)
-            )
+        self._trigger_instance_webhooks(WebhookEventType.CHECKOUT_CREATED, checkout)
 
     def checkout_updated(self, checkout: "Checkout", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.CHECKOUT_UPDATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(
-                event_type, generate_checkout_payload(checkout)
-            )
+        self._trigger_instance_webhooks(WebhookEventType.CHECKOUT_UPDATED, checkout)
 
     def notify(self, event: "NotifyEventType", payload: dict, previous_value) -> Any:
         if not self.active:
@@ -288,16 +252,12 @@ class WebhookPlugin(BasePlugin):
     def page_created(self, page: "Page", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.PAGE_CREATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_page_payload(page))
+        self._trigger_instance_webhooks(WebhookEventType.PAGE_CREATED, page)
 
     def page_updated(self, page: "Page", previous_value: Any) -> Any:
         if not self.active:
             return previous_value
-        event_type = WebhookEventType.PAGE_UPDATED
-        if _get_webhooks_for_event(event_type):
-            trigger_webhooks_for_event.delay(event_type, generate_page_payload(page))
+        self._trigger_instance_webhooks(WebhookEventType.PAGE_UPDATED, page)
 
     def page_deleted(self, page: "Page", previous_value: Any) -> Any:
         if not self.active:
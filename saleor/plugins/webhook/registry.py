@@ -0,0 +1,78 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from django.core.cache import cache
+
+from ...core.caching import CachePrefix, ProcessCache
+from ...webhook.event_types import WebhookEventType
+from ...webhook.models import Webhook
+
+EVENT_TYPES = [
+    event_type
+    for event_type, _label in WebhookEventType.CHOICES
+    if event_type != WebhookEventType.ANY
+]
+
+# webhooks of the process by event type
+webhook_registry_cache = ProcessCache(CachePrefix.WEBHOOK_REGISTRY)
+
+
+def get_webhooks_for_event(event_type: str) -> List[Webhook]:
+    """Return the active webhooks subscribed to the event, ordered by pk.
+
+    The registry of subscriptions is kept in process memory and in the cache until
+    a webhook, its events, its app or the app permissions change. Events without
+    subscribers cost a single cache lookup of the registry version.
+    """
+    return get_webhook_registry().get(event_type, [])
+
+
+def get_webhook_registry() -> Dict[str, List[Webhook]]:
+    return webhook_registry_cache.get(load_webhook_registry)
+
+
+def load_webhook_registry(version: str) -> Dict[str, List[Webhook]]:
+    """Return the registry of the version from the cache or build it."""
+    cache_key = get_webhook_registry_cache_key(version)
+    registry = cache.get(cache_key)
+    if registry is None:
+        registry = build_webhook_registry()
+        cache.set(cache_key, registry)
+    return registry
+
+
+def build_webhook_registry() -> Dict[str, List[Webhook]]:
+    """Map the event types to the webhooks allowed to receive them.
+
+    Webhooks subscribed to any event are registered for every event type their
+    app has the permissions for.
+    """
+    webhooks = (
+        Webhook.objects.filter(is_active=True, app__is_active=True)
+        .select_related("app")
+        .prefetch_related("events", "app__permissions__content_type")
+        .order_by("pk")
+    )
+    registry: Dict[str, List[Webhook]] = defaultdict(list)
+    for webhook in webhooks:
+        events = {event.event_type for event in webhook.events.all()}
+        permissions = {
+            f"{permission.content_type.app_label}.{permission.codename}"
+            for permission in webhook.app.permissions.all()
+        }
+        # prefetched rows are not needed to send the webhook
+        webhook._prefetched_objects_cache = {}
+        webhook.app._prefetched_objects_cache = {}
+
+        if WebhookEventType.ANY in events:
+            events = set(EVENT_TYPES)
+        for event_type in events:
+            required_permission = WebhookEventType.PERMISSIONS.get(event_type)
+            if required_permission and required_permission.value not in permissions:
+                continue
+            registry[event_type].append(webhook)
+    return dict(registry)
+
+
+def get_webhook_registry_cache_key(version: str) -> str:
+    return f"{CachePrefix.WEBHOOK_REGISTRY}:{version}"
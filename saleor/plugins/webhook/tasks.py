@@ -1,14 +1,14 @@
 import logging
+import time
 from enum import Enum
 from json import JSONDecodeError
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse, urlunparse
 
-import boto3
-import requests
 from botocore.exceptions import ClientError
 from celery.exceptions import MaxRetriesExceededError
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from google.cloud import pubsub_v1
 from requests.exceptions import RequestException
 
@@ -20,6 +20,36 @@ from ...site.models import Site
 from ...webhook.event_types import WebhookEventType
 from ...webhook.models import Webhook
 from . import signature_for_payload
+from .batching import (
+    BATCH_EVENT_TYPE,
+    SQS_MAX_BATCH_SIZE,
+    add_to_batch,
+    finish_batch_delivery,
+    generate_batch_payload,
+    is_batching_available,
+    mark_batch_flush_pending,
+    pop_batch,
+    set_batches_in_flight,
+    split_batch,
+    start_batch_delivery,
+)
+from .delivery import (
+    decrement_queue_depth,
+    delete_old_delivery_attempts,
+    get_pause_delay,
+    get_response_code,
+    increment_queue_depth,
+    is_delivery_allowed,
+    record_delivery_attempt,
+    record_dropped_delivery,
+)
+from .registry import get_webhooks_for_event
+from .transports import (
+    get_pubsub_client,
+    get_sqs_client,
+    limit_target_concurrency,
+    send_http_request,
+)
 
 if TYPE_CHECKING:
     from ...app.models import App
@@ -37,7 +67,14 @@ class WebhookSchemes(str, Enum):
 
 @app.task(compression="zlib")
 def _get_webhooks_for_event(event_type, webhooks=None):
-    """Get active webhooks from the database for an event."""
+    """Get active webhooks for an event.
+
+    Without the webhooks to filter, they are taken from the webhook registry if
+    it's enabled.
+    """
+    if webhooks is None and settings.WEBHOOK_REGISTRY_ENABLED:
+        return get_webhooks_for_event(event_type)
+
     permissions = {}
     required_permission = WebhookEventType.PERMISSIONS.get(event_type)
     if required_permission:
@@ -65,6 +102,10 @@ def trigger_webhooks_for_event(event_type, data):
     """Send a webhook request for an event as an async task."""
     if webhooks := _get_webhooks_for_event(event_type):
         for webhook in webhooks:
+            if webhook.batch_size > 1 and is_batching_available():
+                add_webhook_event_to_batch(webhook, event_type, data)
+                continue
+            increment_queue_depth(webhook.pk)
             send_webhook_request.delay(
                 webhook.app.name,
                 webhook.pk,
@@ -75,6 +116,87 @@ def trigger_webhooks_for_event(event_type, data):
             )
 
 
+@app.task(compression="zlib")
+def trigger_webhooks_for_deferred_event(event_type, model_label, pk):
+    """Generate the payload of the instance and send it to the event webhooks.
+
+    The payload is generated once by the worker instead of the request emitting
+    the event, and shared by all webhooks subscribed to the event.
+    """
+    from .deferred import generate_deferred_payload
+
+    if not _get_webhooks_for_event(event_type):
+        return
+    data = generate_deferred_payload(model_label, pk)
+    if data is not None:
+        trigger_webhooks_for_event(event_type, data)
+
+
+def add_webhook_event_to_batch(webhook: Webhook, event_type: str, data: str):
+    """Buffer the event and schedule sending the batch of the webhook.
+
+    The batch is sent when it's full or when the batch window of its first event
+    passes.
+    """
+    size, is_first = add_to_batch(webhook.pk, event_type, data, webhook.batch_window)
+    if size == webhook.batch_size:
+        flush_webhook_batch.delay(webhook.pk, scheduled=False)
+    elif is_first:
+        flush_webhook_batch.apply_async((webhook.pk,), countdown=webhook.batch_window)
+
+
+@app.task
+def flush_webhook_batch(webhook_id, scheduled=True):
+    """Send the buffered events of the webhook in batches of its batch size.
+
+    While the batches of the previous flush are in flight, the flush is postponed
+    by the batch window, so retried events aren't overtaken by the newer ones.
+    Scheduled flushes hold the pending mark of the batch; a flush of a full batch
+    is only postponed if no other flush is pending.
+    """
+    webhook = (
+        Webhook.objects.filter(pk=webhook_id, is_active=True, app__is_active=True)
+        .select_related("app")
+        .first()
+    )
+    if webhook is None:
+        if events := pop_batch(webhook_id):
+            task_logger.info(
+                "[Webhook ID:%r] Dropped %s events of inactive webhook.",
+                webhook_id,
+                len(events),
+            )
+        return
+    if not start_batch_delivery(webhook_id):
+        window = webhook.batch_window
+        if mark_batch_flush_pending(webhook_id, window, refresh=scheduled):
+            flush_webhook_batch.apply_async((webhook_id,), countdown=max(window, 1))
+        return
+    batches = split_batch(pop_batch(webhook_id), max(webhook.batch_size, 1))
+    set_batches_in_flight(webhook_id, len(batches))
+    for batch in batches:
+        increment_queue_depth(webhook.pk)
+        send_webhook_batch_request.delay(
+            webhook.app.name,
+            webhook.pk,
+            webhook.target_url,
+            webhook.secret_key,
+            batch,
+        )
+
+
+def finish_webhook_batch_request(webhook_id):
+    decrement_queue_depth(webhook_id)
+    finish_batch_delivery(webhook_id)
+
+
+@app.task
+def delete_old_webhook_delivery_attempts_task():
+    count = delete_old_delivery_attempts()
+    if count:
+        task_logger.debug("Removed %s webhook delivery attempts", count)
+
+
 def trigger_webhook_sync(event_type: str, data: str, app: "App"):
     """Send a synchronous webhook request."""
     webhooks = _get_webhooks_for_event(event_type, app.webhooks.all())
@@ -113,7 +235,10 @@ def send_webhook_using_http(
         "Saleor-Signature": signature,
     }
 
-    response = requests.post(target_url, data=message, headers=headers, timeout=timeout)
+    with limit_target_concurrency(target_url):
+        response = send_http_request(
+            target_url, data=message, headers=headers, timeout=timeout
+        )
     response.raise_for_status()
     return response
 
@@ -124,12 +249,7 @@ def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_typ
     hostname_parts = parts.hostname.split(".")
     if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
         region = hostname_parts[1]
-    client = boto3.client(
-        "sqs",
-        region_name=region,
-        aws_access_key_id=parts.username,
-        aws_secret_access_key=parts.password,
-    )
+    client = get_sqs_client(region, parts.username, parts.password)
     queue_url = urlunparse(
         ("https", parts.hostname, parts.path, parts.params, parts.query, parts.fragment)
     )
@@ -149,22 +269,201 @@ def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_typ
     }
     if is_fifo:
         message_kwargs["MessageGroupId"] = domain
-    client.send_message(**message_kwargs)
+    with limit_target_concurrency(target_url):
+        client.send_message(**message_kwargs)
 
 
 def send_webhook_using_google_cloud_pubsub(
     target_url, message, domain, signature, event_type
 ):
     parts = urlparse(target_url)
-    client = pubsub_v1.PublisherClient()
+    client = get_pubsub_client()
     topic_name = parts.path[1:]  # drop the leading slash
-    client.publish(
-        topic_name,
-        message,
-        saleorDomain=domain,
-        eventType=event_type,
-        signature=signature,
+    with limit_target_concurrency(target_url):
+        client.publish(
+            topic_name,
+            message,
+            saleorDomain=domain,
+            eventType=event_type,
+            signature=signature,
+        )
+
+
+def postpone_paused_delivery(
+    task, webhook_id, target_url, event_type, args, on_drop=decrement_queue_depth
+) -> bool:
+    """Postpone the delivery until the next probe if the webhook is paused.
+
+    Postponements count as retries of the delivery. Once the retries are used up,
+    or without a broker to hold the delivery, it's dropped, stored as a failed
+    attempt and `on_drop` is called with the webhook ID.
+    """
+    if is_delivery_allowed(webhook_id):
+        return False
+    max_retries = task.retry_kwargs.get("max_retries", task.max_retries)
+    if task.request.is_eager or task.request.retries >= max_retries:
+        task_logger.warning(
+            "[Webhook ID:%r] Deliveries to %r are paused, payload dropped.",
+            webhook_id,
+            target_url,
+        )
+        record_dropped_delivery(webhook_id, event_type)
+        on_drop(webhook_id)
+    else:
+        task.apply_async(
+            args=args,
+            countdown=get_pause_delay(webhook_id),
+            retries=task.request.retries + 1,
+        )
+        task_logger.info(
+            "[Webhook ID:%r] Deliveries to %r are paused, delivery postponed.",
+            webhook_id,
+            target_url,
+        )
+    return True
+
+
+def send_webhook_batch_using_http(target_url, events, domain, secret):
+    message = generate_batch_payload(events).encode("utf-8")
+    signature = signature_for_payload(message, secret)
+    response = send_webhook_using_http(
+        target_url, message, domain, signature, BATCH_EVENT_TYPE
     )
+    return [], response
+
+
+def send_webhook_batch_using_aws_sqs(target_url, events, domain, secret):
+    """Send the events as separate messages, in requests of up to 10 messages.
+
+    Return the events SQS failed to accept.
+    """
+    parts = urlparse(target_url)
+    region = "us-east-1"
+    hostname_parts = parts.hostname.split(".")
+    if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
+        region = hostname_parts[1]
+    client = get_sqs_client(region, parts.username, parts.password)
+    queue_url = urlunparse(
+        ("https", parts.hostname, parts.path, parts.params, parts.query, parts.fragment)
+    )
+    is_fifo = parts.path.endswith(".fifo")
+
+    failed_events = []
+    for chunk in split_batch(events, SQS_MAX_BATCH_SIZE):
+        entries = []
+        for index, (event_type, data) in enumerate(chunk):
+            message = data.encode("utf-8")
+            signature = signature_for_payload(message, secret)
+            msg_attributes = {
+                "SaleorDomain": {"DataType": "String", "StringValue": domain},
+                "EventType": {"DataType": "String", "StringValue": event_type},
+            }
+            if signature:
+                msg_attributes["Signature"] = {
+                    "DataType": "String",
+                    "StringValue": signature,
+                }
+            entry = {
+                "Id": str(index),
+                "MessageAttributes": msg_attributes,
+                "MessageBody": data,
+            }
+            if is_fifo:
+                entry["MessageGroupId"] = domain
+            entries.append(entry)
+        with limit_target_concurrency(target_url):
+            response = client.send_message_batch(QueueUrl=queue_url, Entries=entries)
+        failed_events.extend(
+            chunk[int(failure["Id"])] for failure in response.get("Failed", [])
+        )
+    return failed_events, None
+
+
+def send_webhook_batch_using_google_cloud_pubsub(target_url, events, domain, secret):
+    # the publisher client batches the messages on its own
+    for event_type, data in events:
+        message = data.encode("utf-8")
+        signature = signature_for_payload(message, secret)
+        send_webhook_using_google_cloud_pubsub(
+            target_url, message, domain, signature, event_type
+        )
+    return [], None
+
+
+@app.task(
+    bind=True,
+    retry_backoff=10,
+    retry_kwargs={"max_retries": 5},
+    compression="zlib",
+)
+def send_webhook_batch_request(self, app_name, webhook_id, target_url, secret, events):
+    """Send the batch of events, retrying the ones the target failed to accept."""
+    parts = urlparse(target_url)
+    domain = Site.objects.get_current().domain
+
+    scheme_matrix = {
+        WebhookSchemes.HTTP: (send_webhook_batch_using_http, RequestException),
+        WebhookSchemes.HTTPS: (send_webhook_batch_using_http, RequestException),
+        WebhookSchemes.AWS_SQS: (send_webhook_batch_using_aws_sqs, ClientError),
+        WebhookSchemes.GOOGLE_CLOUD_PUBSUB: (
+            send_webhook_batch_using_google_cloud_pubsub,
+            pubsub_v1.publisher.exceptions.MessageTooLargeError,
+        ),
+    }
+
+    if methods := scheme_matrix.get(parts.scheme.lower()):
+        args = (app_name, webhook_id, target_url, secret, events)
+        if postpone_paused_delivery(
+            self,
+            webhook_id,
+            target_url,
+            BATCH_EVENT_TYPE,
+            args,
+            on_drop=finish_webhook_batch_request,
+        ):
+            return
+        send_method, send_exception = methods
+        start = time.perf_counter()
+        try:
+            with webhooks_opentracing_trace(
+                BATCH_EVENT_TYPE, domain, app_name=app_name
+            ):
+                failed_events, response = send_method(
+                    target_url, events, domain, secret
+                )
+        except send_exception as e:
+            task_logger.info("[Webhook] Failed request to %r: %r.", target_url, e)
+            failed_events, response = events, e
+        record_delivery_attempt(
+            webhook_id,
+            BATCH_EVENT_TYPE,
+            time.perf_counter() - start,
+            failed=bool(failed_events),
+            response_code=get_response_code(response),
+        )
+        if failed_events:
+            try:
+                countdown = self.retry_backoff * (2 ** self.request.retries)
+                self.retry(
+                    args=(app_name, webhook_id, target_url, secret, failed_events),
+                    countdown=countdown,
+                    **self.retry_kwargs,
+                )
+            except MaxRetriesExceededError:
+                task_logger.warning(
+                    "[Webhook] Failed request to %r: exceeded retry limit.",
+                    target_url,
+                )
+        finish_webhook_batch_request(webhook_id)
+        task_logger.info(
+            "[Webhook ID:%r] Batch of %s events sent to %r",
+            webhook_id,
+            len(events) - len(failed_events),
+            target_url,
+        )
+    else:
+        finish_webhook_batch_request(webhook_id)
+        raise ValueError("Unknown webhook scheme: %r" % (parts.scheme,))
 
 
 @app.task(
@@ -192,11 +491,24 @@ def send_webhook_request(
     }
 
     if methods := scheme_matrix.get(parts.scheme.lower()):
+        args = (app_name, webhook_id, target_url, secret, event_type, data)
+        if postpone_paused_delivery(self, webhook_id, target_url, event_type, args):
+            return
         send_method, send_exception = methods
+        start = time.perf_counter()
         try:
             with webhooks_opentracing_trace(event_type, domain, app_name=app_name):
-                send_method(target_url, message, domain, signature, event_type)
+                response = send_method(
+                    target_url, message, domain, signature, event_type
+                )
         except send_exception as e:
+            record_delivery_attempt(
+                webhook_id,
+                event_type,
+                time.perf_counter() - start,
+                failed=True,
+                response_code=get_response_code(e),
+            )
             task_logger.info("[Webhook] Failed request to %r: %r.", target_url, e)
             try:
                 countdown = self.retry_backoff * (2 ** self.request.retries)
@@ -206,6 +518,15 @@ def send_webhook_request(
                     "[Webhook] Failed request to %r: exceeded retry limit.",
                     target_url,
                 )
+        else:
+            record_delivery_attempt(
+                webhook_id,
+                event_type,
+                time.perf_counter() - start,
+                failed=False,
+                response_code=get_response_code(response),
+            )
+        decrement_queue_depth(webhook_id)
         task_logger.info(
             "[Webhook ID:%r] Payload sent to %r for event %r",
             webhook_id,
@@ -213,6 +534,7 @@ def send_webhook_request(
             event_type,
         )
     else:
+        decrement_queue_depth(webhook_id)
         raise ValueError("Unknown webhook scheme: %r" % (parts.scheme,))
 
 
@@ -0,0 +1,99 @@
+from unittest import mock
+
+import pytest
+from django.test import TestCase
+
+from ....webhook.event_types import WebhookEventType
+from ....webhook.payloads import generate_order_payload, generate_product_payload
+from ...manager import get_plugins_manager
+from ..tasks import trigger_webhooks_for_deferred_event
+
+
+@pytest.fixture
+def webhook_plugin_manager(settings):
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    return get_plugins_manager()
+
+
+@mock.patch("saleor.plugins.webhook.plugin._get_webhooks_for_event")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_deferred_event.delay")
+def test_product_updated_deferred_payload(
+    mocked_deferred_trigger,
+    mocked_webhook_trigger,
+    mocked_get_webhooks_for_event,
+    any_webhook,
+    settings,
+    webhook_plugin_manager,
+    product,
+):
+    settings.WEBHOOK_DEFERRED_PAYLOADS_ENABLED = True
+    mocked_get_webhooks_for_event.return_value = [any_webhook]
+
+    with TestCase.captureOnCommitCallbacks(execute=False) as callbacks:
+        webhook_plugin_manager.product_updated(product)
+
+    mocked_deferred_trigger.assert_not_called()
+    for callback in callbacks:
+        callback()
+    mocked_deferred_trigger.assert_called_once_with(
+        WebhookEventType.PRODUCT_UPDATED, "product.Product", str(product.pk)
+    )
+    mocked_webhook_trigger.assert_not_called()
+
+
+@mock.patch("saleor.plugins.webhook.plugin._get_webhooks_for_event")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_event.delay")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_for_deferred_event.delay")
+def test_product_updated_snapshot_event(
+    mocked_deferred_trigger,
+    mocked_webhook_trigger,
+    mocked_get_webhooks_for_event,
+    any_webhook,
+    settings,
+    webhook_plugin_manager,
+    product,
+):
+    settings.WEBHOOK_DEFERRED_PAYLOADS_ENABLED = True
+    settings.WEBHOOK_SNAPSHOT_EVENTS = [WebhookEventType.PRODUCT_UPDATED]
+    mocked_get_webhooks_for_event.return_value = [any_webhook]
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        webhook_plugin_manager.product_updated(product)
+
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventType.PRODUCT_UPDATED, generate_product_payload(product)
+    )
+    mocked_deferred_trigger.assert_not_called()
+
+
+@mock.patch("saleor.plugins.webhook.tasks._get_webhooks_for_event")
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_deferred_event(
+    mocked_webhook_trigger, mocked_get_webhooks_for_event, any_webhook, order_with_lines
+):
+    mocked_get_webhooks_for_event.return_value = [any_webhook]
+
+    trigger_webhooks_for_deferred_event(
+        WebhookEventType.ORDER_CREATED, "order.Order", str(order_with_lines.pk)
+    )
+
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventType.ORDER_CREATED, generate_order_payload(order_with_lines)
+    )
+
+
+@mock.patch("saleor.plugins.webhook.tasks._get_webhooks_for_event")
+@mock.patch("saleor.plugins.webhook.tasks.trigger_webhooks_for_event")
+def test_trigger_webhooks_for_deferred_event_deleted_instance(
+    mocked_webhook_trigger, mocked_get_webhooks_for_event, any_webhook, product
+):
+    mocked_get_webhooks_for_event.return_value = [any_webhook]
+    product_pk = str(product.pk)
+    product.delete()
+
+    trigger_webhooks_for_deferred_event(
+        WebhookEventType.PRODUCT_UPDATED, "product.Product", product_pk
+    )
+
+    mocked_webhook_trigger.assert_not_called()
@@ -128,7 +128,7 @@ def test_send_webhook_request_sync(
     "target_url",
     ("http://payment-gateway.com/api/", "https://payment-gateway.com/api/"),
 )
-@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+@mock.patch("saleor.plugins.webhook.transports.requests.post")
 def test_send_webhook_request_with_proper_timeout(
     mock_post, target_url, site_settings, webhook_data
 ):
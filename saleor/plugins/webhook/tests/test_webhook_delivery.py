@@ -0,0 +1,248 @@
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from django.core.cache import cache
+from django.utils import timezone
+from freezegun import freeze_time
+
+from ....webhook import WebhookDeliveryStatus
+from ....webhook.event_types import WebhookEventType
+from ....webhook.models import Webhook, WebhookDeliveryAttempt
+from ...views import webhook_delivery_metrics
+from ..delivery import (
+    decrement_queue_depth,
+    delete_old_delivery_attempts,
+    get_delivery_metrics,
+    get_pause_delay,
+    get_response_code,
+    increment_queue_depth,
+    is_delivery_allowed,
+    record_delivery_attempt,
+    render_prometheus_delivery_metrics,
+)
+from ..tasks import postpone_paused_delivery, send_webhook_request
+
+
+@pytest.fixture
+def circuit_breaker(settings):
+    settings.WEBHOOK_CIRCUIT_BREAKER_ENABLED = True
+    settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE = 0.5
+    settings.WEBHOOK_CIRCUIT_BREAKER_MIN_ATTEMPTS = 4
+    settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW = 300
+    settings.WEBHOOK_CIRCUIT_BREAKER_PROBE_INTERVAL = 60
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def send_webhook(webhook):
+    send_webhook_request(
+        webhook.app.name,
+        webhook.pk,
+        webhook.target_url,
+        webhook.secret_key,
+        WebhookEventType.ORDER_CREATED,
+        "{}",
+    )
+
+
+def test_record_delivery_attempt(webhook, settings):
+    settings.WEBHOOK_DELIVERY_ATTEMPTS_ENABLED = True
+
+    record_delivery_attempt(webhook.pk, "order_created", 0.25, False, 200)
+
+    attempt = webhook.delivery_attempts.get()
+    assert attempt.status == WebhookDeliveryStatus.SUCCESS
+    assert attempt.event_type == "order_created"
+    assert attempt.duration == 0.25
+    assert attempt.response_code == 200
+
+
+def test_get_response_code():
+    response = Mock(spec=requests.Response, status_code=503)
+
+    assert get_response_code(response) == 503
+    assert get_response_code(requests.HTTPError(response=response)) == 503
+    assert get_response_code(None) is None
+
+
+def test_delete_old_delivery_attempts(webhook):
+    old_attempt = WebhookDeliveryAttempt.objects.create(
+        webhook=webhook, event_type="order_created", status="success", duration=0.1
+    )
+    WebhookDeliveryAttempt.objects.filter(pk=old_attempt.pk).update(
+        created=timezone.now() - timedelta(days=8)
+    )
+    WebhookDeliveryAttempt.objects.create(
+        webhook=webhook, event_type="order_created", status="success", duration=0.1
+    )
+
+    assert delete_old_delivery_attempts() == 1
+    assert webhook.delivery_attempts.count() == 1
+
+
+def test_circuit_breaker_pauses_failing_webhook(circuit_breaker):
+    with freeze_time("2021-09-27 10:00:00") as frozen_time:
+        record_delivery_attempt(1, "order_created", 0.1, failed=False)
+        record_delivery_attempt(1, "order_created", 0.1, failed=True)
+        record_delivery_attempt(1, "order_created", 0.1, failed=True)
+        # not enough attempts to judge the target
+        assert is_delivery_allowed(1)
+
+        record_delivery_attempt(1, "order_created", 0.1, failed=True)
+
+        assert not is_delivery_allowed(1)
+        assert get_pause_delay(1) == 60
+        assert is_delivery_allowed(2)
+
+        frozen_time.tick(timedelta(seconds=61))
+
+        # a single delivery probes the target
+        assert is_delivery_allowed(1)
+        assert not is_delivery_allowed(1)
+
+
+def test_circuit_breaker_failed_probe_pauses_again(circuit_breaker):
+    with freeze_time("2021-09-27 10:00:00") as frozen_time:
+        for _ in range(4):
+            record_delivery_attempt(1, "order_created", 0.1, failed=True)
+        frozen_time.tick(timedelta(seconds=61))
+        assert is_delivery_allowed(1)
+
+        record_delivery_attempt(1, "order_created", 0.1, failed=True)
+
+        assert not is_delivery_allowed(1)
+        frozen_time.tick(timedelta(seconds=61))
+        assert is_delivery_allowed(1)
+
+
+def test_circuit_breaker_successful_probe_resumes(circuit_breaker):
+    with freeze_time("2021-09-27 10:00:00") as frozen_time:
+        for _ in range(4):
+            record_delivery_attempt(1, "order_created", 0.1, failed=True)
+        frozen_time.tick(timedelta(seconds=61))
+        assert is_delivery_allowed(1)
+
+        record_delivery_attempt(1, "order_created", 0.1, failed=False)
+
+        assert is_delivery_allowed(1)
+        # failures before the pause are not counted anymore
+        record_delivery_attempt(1, "order_created", 0.1, failed=True)
+        assert is_delivery_allowed(1)
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_send_webhook_request_records_attempt(
+    mocked_send, webhook, site_settings, settings
+):
+    settings.WEBHOOK_DELIVERY_ATTEMPTS_ENABLED = True
+    mocked_send.return_value = Mock(status_code=200)
+
+    send_webhook(webhook)
+
+    attempt = webhook.delivery_attempts.get()
+    assert attempt.status == WebhookDeliveryStatus.SUCCESS
+    assert attempt.response_code == 200
+
+
+@patch.object(send_webhook_request, "apply_async")
+@patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_send_webhook_request_postponed_while_paused(
+    mocked_send, mocked_apply_async, webhook, site_settings, circuit_breaker
+):
+    with freeze_time("2021-09-27 10:00:00"):
+        for _ in range(4):
+            record_delivery_attempt(webhook.pk, "order_created", 0.1, failed=True)
+
+        send_webhook(webhook)
+
+    mocked_send.assert_not_called()
+    mocked_apply_async.assert_called_once_with(
+        args=(
+            webhook.app.name,
+            webhook.pk,
+            webhook.target_url,
+            webhook.secret_key,
+            WebhookEventType.ORDER_CREATED,
+            "{}",
+        ),
+        countdown=60,
+        retries=1,
+    )
+
+
+def test_postpone_paused_delivery_drops_after_max_retries(
+    webhook, circuit_breaker, settings
+):
+    settings.WEBHOOK_DELIVERY_ATTEMPTS_ENABLED = True
+    task = Mock(retry_kwargs={"max_retries": 5})
+    task.request.is_eager = False
+    task.request.retries = 5
+    on_drop = Mock()
+    with freeze_time("2021-09-27 10:00:00"):
+        for _ in range(4):
+            record_delivery_attempt(webhook.pk, "order_created", 0.1, failed=True)
+        webhook.delivery_attempts.all().delete()
+
+        postponed = postpone_paused_delivery(
+            task, webhook.pk, webhook.target_url, "order_created", (), on_drop=on_drop
+        )
+
+        # the pause isn't prolonged by the dropped delivery
+        assert get_pause_delay(webhook.pk) == 60
+
+    assert postponed
+    task.apply_async.assert_not_called()
+    on_drop.assert_called_once_with(webhook.pk)
+    attempt = webhook.delivery_attempts.get()
+    assert attempt.status == WebhookDeliveryStatus.FAILED
+    assert attempt.event_type == "order_created"
+
+
+def test_get_delivery_metrics(webhook, settings):
+    settings.WEBHOOK_DELIVERY_METRICS_ENABLED = True
+    cache.clear()
+    for status, duration in [("success", 0.1), ("success", 0.3), ("failed", 0.5)]:
+        WebhookDeliveryAttempt.objects.create(
+            webhook=webhook,
+            event_type="order_created",
+            status=status,
+            duration=duration,
+        )
+    increment_queue_depth(webhook.pk)
+    increment_queue_depth(webhook.pk)
+    decrement_queue_depth(webhook.pk)
+
+    metrics = get_delivery_metrics(Webhook.objects.select_related("app"))
+
+    app_metrics = metrics[webhook.app.name]
+    assert app_metrics["deliveries"] == 3
+    assert app_metrics["failures"] == 1
+    assert app_metrics["avg_duration"] == pytest.approx(0.3)
+    assert app_metrics["max_duration"] == 0.5
+    assert app_metrics["queue_depth"] == 1
+    assert app_metrics["paused_webhooks"] == 0
+    rendered = render_prometheus_delivery_metrics(metrics)
+    assert f'saleor_webhook_queue_depth{{app="{webhook.app.name}"}} 1' in rendered
+    cache.clear()
+
+
+def test_webhook_delivery_metrics_view(webhook, rf, settings):
+    settings.METRICS_TOKEN = "token"
+    request = rf.get("/metrics/webhooks/", HTTP_AUTHORIZATION="Bearer token")
+
+    response = webhook_delivery_metrics(request)
+
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert f'saleor_webhook_deliveries{{app="{webhook.app.name}"}} 0' in content
+
+
+def test_webhook_delivery_metrics_view_without_token(webhook, rf, settings):
+    settings.METRICS_TOKEN = "token"
+
+    response = webhook_delivery_metrics(rf.get("/metrics/webhooks/"))
+
+    assert response.status_code == 403
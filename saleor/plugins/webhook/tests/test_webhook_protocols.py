@@ -30,7 +30,7 @@ def test_trigger_webhooks_with_aws_sqs(
     mocked_client_constructor = MagicMock(spec=boto3.client, return_value=mocked_client)
 
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.boto3.client",
+        "saleor.plugins.webhook.transports.boto3.client",
         mocked_client_constructor,
     )
 
@@ -79,7 +79,7 @@ def test_trigger_webhooks_with_aws_sqs_and_secret_key(
     mocked_client_constructor = MagicMock(spec=boto3.client, return_value=mocked_client)
 
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.boto3.client",
+        "saleor.plugins.webhook.transports.boto3.client",
         mocked_client_constructor,
     )
 
@@ -129,7 +129,7 @@ def test_trigger_webhooks_with_google_pub_sub(
 ):
     mocked_publisher = MagicMock(spec=PublisherClient)
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.pubsub_v1.PublisherClient",
+        "saleor.plugins.webhook.transports.pubsub_v1.PublisherClient",
         lambda: mocked_publisher,
     )
     webhook.app.permissions.add(permission_manage_orders)
@@ -158,7 +158,7 @@ def test_trigger_webhooks_with_google_pub_sub_and_secret_key(
 ):
     mocked_publisher = MagicMock(spec=PublisherClient)
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.pubsub_v1.PublisherClient",
+        "saleor.plugins.webhook.transports.pubsub_v1.PublisherClient",
         lambda: mocked_publisher,
     )
     webhook.app.permissions.add(permission_manage_orders)
@@ -181,7 +181,7 @@ def test_trigger_webhooks_with_google_pub_sub_and_secret_key(
 
 
 @pytest.mark.vcr
-@patch("saleor.plugins.webhook.tasks.requests.post", wraps=requests.post)
+@patch("saleor.plugins.webhook.transports.requests.post", wraps=requests.post)
 def test_trigger_webhooks_with_http(
     mock_request,
     webhook,
@@ -218,7 +218,7 @@ def test_trigger_webhooks_with_http(
 
 
 @pytest.mark.vcr
-@patch("saleor.plugins.webhook.tasks.requests.post", wraps=requests.post)
+@patch("saleor.plugins.webhook.transports.requests.post", wraps=requests.post)
 def test_trigger_webhooks_with_http_and_secret_key(
     mock_request, webhook, order_with_lines, permission_manage_orders
 ):
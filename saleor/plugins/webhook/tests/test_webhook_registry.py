@@ -0,0 +1,87 @@
+import pytest
+from django.core.cache import cache
+from django.test import TestCase
+
+from ....core.caching import CachePrefix, get_cache_version_key
+from ....webhook.event_types import WebhookEventType
+from ....webhook.models import Webhook
+from ..registry import (
+    build_webhook_registry,
+    get_webhooks_for_event,
+    webhook_registry_cache,
+)
+from ..tasks import _get_webhooks_for_event
+
+
+@pytest.fixture
+def webhook_registry(settings):
+    settings.WEBHOOK_REGISTRY_ENABLED = True
+    webhook_registry_cache.clear()
+    cache.delete(get_cache_version_key(CachePrefix.WEBHOOK_REGISTRY))
+    yield
+    webhook_registry_cache.clear()
+    cache.delete(get_cache_version_key(CachePrefix.WEBHOOK_REGISTRY))
+
+
+def test_build_webhook_registry_requires_app_permissions(
+    webhook, any_webhook, permission_manage_orders
+):
+    registry = build_webhook_registry()
+
+    assert WebhookEventType.ORDER_CREATED not in registry
+
+    webhook.app.permissions.add(permission_manage_orders)
+    registry = build_webhook_registry()
+
+    assert registry[WebhookEventType.ORDER_CREATED] == [webhook, any_webhook]
+    assert registry[WebhookEventType.ORDER_UPDATED] == [any_webhook]
+    assert WebhookEventType.PRODUCT_CREATED not in registry
+
+
+def test_build_webhook_registry_skips_inactive_webhooks(
+    webhook, permission_manage_orders
+):
+    webhook.app.permissions.add(permission_manage_orders)
+    webhook.is_active = False
+    webhook.save(update_fields=["is_active"])
+
+    assert build_webhook_registry() == {}
+
+
+def test_get_webhooks_for_event_matches_database_query(
+    webhook_registry, webhook, any_webhook, permission_manage_orders
+):
+    webhook.app.permissions.add(permission_manage_orders)
+
+    for event_type in [WebhookEventType.ORDER_CREATED, WebhookEventType.ORDER_UPDATED]:
+        database_webhooks = _get_webhooks_for_event(event_type, Webhook.objects.all())
+        assert get_webhooks_for_event(event_type) == list(database_webhooks)
+
+
+def test_get_webhooks_for_event_served_from_memory(
+    webhook_registry, webhook, permission_manage_orders, django_assert_num_queries
+):
+    webhook.app.permissions.add(permission_manage_orders)
+    get_webhooks_for_event(WebhookEventType.ORDER_CREATED)
+
+    with django_assert_num_queries(0):
+        webhooks = get_webhooks_for_event(WebhookEventType.ORDER_CREATED)
+        no_webhooks = get_webhooks_for_event(WebhookEventType.PRODUCT_CREATED)
+
+    assert webhooks == [webhook]
+    assert webhooks[0].app.name == webhook.app.name
+    assert no_webhooks == []
+
+
+def test_get_webhooks_for_event_rebuilt_after_webhook_change(
+    webhook_registry, webhook, permission_manage_orders
+):
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        webhook.app.permissions.add(permission_manage_orders)
+    assert get_webhooks_for_event(WebhookEventType.ORDER_CREATED) == [webhook]
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        webhook.is_active = False
+        webhook.save(update_fields=["is_active"])
+
+    assert get_webhooks_for_event(WebhookEventType.ORDER_CREATED) == []
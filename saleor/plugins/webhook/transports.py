@@ -0,0 +1,150 @@
+"""Clients used to deliver webhooks, pooled per worker process.
+
+Without pooling every delivery opens a new HTTP connection, or builds a new SQS
+or Pub/Sub client, which costs a TCP and TLS handshake or a credentials lookup
+per message.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Tuple
+from urllib.parse import urlparse
+
+import boto3
+import requests
+from botocore.config import Config
+from django.conf import settings
+from google.cloud import pubsub_v1
+from requests.adapters import HTTPAdapter
+
+_lock = threading.Lock()
+_http_sessions: Dict[str, requests.Session] = {}
+_sqs_clients: Dict[Tuple[str, str, str], Any] = {}
+_pubsub_clients: Dict[str, pubsub_v1.PublisherClient] = {}
+_target_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def reset_transports():
+    """Drop the pooled clients, e.g. in a forked worker process.
+
+    Connections opened by the parent process must not be shared with children.
+    """
+    global _lock
+    _lock = threading.Lock()
+    _http_sessions.clear()
+    _sqs_clients.clear()
+    _pubsub_clients.clear()
+    _target_semaphores.clear()
+
+
+os.register_at_fork(after_in_child=reset_transports)
+
+
+def get_target_key(target_url: str) -> str:
+    """Return the scheme and host of the target, without credentials."""
+    parts = urlparse(target_url)
+    host = parts.hostname or ""
+    if parts.port:
+        host = f"{host}:{parts.port}"
+    return f"{parts.scheme.lower()}://{host}"
+
+
+@contextmanager
+def limit_target_concurrency(target_url: str):
+    """Limit the concurrent deliveries of the process to a single target.
+
+    The limit is kept by a semaphore of the process, so it applies to the threads
+    of a worker running with a threaded or gevent pool. With the prefork pool each
+    process runs a single task at a time and the target gets up to
+    `WEBHOOK_TARGET_MAX_CONCURRENCY` deliveries per process, not per worker.
+    """
+    if not settings.WEBHOOK_TRANSPORT_POOLING_ENABLED:
+        yield
+        return
+
+    key = get_target_key(target_url)
+    semaphore = _target_semaphores.get(key)
+    if semaphore is None:
+        with _lock:
+            semaphore = _target_semaphores.setdefault(
+                key, threading.BoundedSemaphore(settings.WEBHOOK_TARGET_MAX_CONCURRENCY)
+            )
+    with semaphore:
+        yield
+
+
+def create_http_session() -> requests.Session:
+    session = requests.Session()
+    # targets are shared by apps, so they must not pass cookies to each other
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=settings.WEBHOOK_TARGET_MAX_CONCURRENCY
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_http_session(target_url: str) -> requests.Session:
+    """Return the session keeping alive the connections to the target host."""
+    key = get_target_key(target_url)
+    session = _http_sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _http_sessions.get(key)
+            if session is None:
+                session = _http_sessions[key] = create_http_session()
+    return session
+
+
+def send_http_request(target_url: str, **kwargs) -> requests.Response:
+    if not settings.WEBHOOK_TRANSPORT_POOLING_ENABLED:
+        return requests.post(target_url, **kwargs)
+    return get_http_session(target_url).post(target_url, **kwargs)
+
+
+def get_sqs_client(region: str, access_key_id: str, secret_access_key: str):
+    """Return the SQS client of the region and credentials.
+
+    boto3 clients are thread-safe, so a single client per credentials is shared by
+    all threads of the process.
+    """
+    if not settings.WEBHOOK_TRANSPORT_POOLING_ENABLED:
+        return boto3.client(
+            "sqs",
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+
+    key = (region, access_key_id, secret_access_key)
+    client = _sqs_clients.get(key)
+    if client is None:
+        with _lock:
+            client = _sqs_clients.get(key)
+            if client is None:
+                client = _sqs_clients[key] = boto3.client(
+                    "sqs",
+                    region_name=region,
+                    aws_access_key_id=access_key_id,
+                    aws_secret_access_key=secret_access_key,
+                    config=Config(
+                        max_pool_connections=settings.WEBHOOK_TARGET_MAX_CONCURRENCY
+                    ),
+                )
+    return client
+
+
+def get_pubsub_client() -> pubsub_v1.PublisherClient:
+    if not settings.WEBHOOK_TRANSPORT_POOLING_ENABLED:
+        return pubsub_v1.PublisherClient()
+
+    # the client uses the credentials of the environment, one per process is enough
+    client = _pubsub_clients.get("default")
+    if client is None:
+        with _lock:
+            client = _pubsub_clients.get("default")
+            if client is None:
+                client = _pubsub_clients["default"] = pubsub_v1.PublisherClient()
+    return client
@@ -2,11 +2,10 @@ import decimal
 import logging
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
 
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import QuerySet
 from graphql import GraphQLError
 
 from ...graphql.core.utils import from_global_id_or_error
@@ -18,6 +17,7 @@ from .tasks import _get_webhooks_for_event, send_webhook_request_sync
 if TYPE_CHECKING:
     from ...app.models import App
     from ...payment.interface import PaymentData
+    from ...webhook.models import Webhook
 
 
 APP_GATEWAY_ID_PREFIX = "app"
@@ -154,7 +154,7 @@ def parse_excluded_shipping_methods(
 
 
 def get_excluded_shipping_methods_or_fetch(
-    webhooks: QuerySet, event_type: str, payload: str, cache_key: str
+    webhooks: Iterable["Webhook"], event_type: str, payload: str, cache_key: str
 ) -> Dict[str, List[ExcludedShippingMethod]]:
     """Return data of all excluded shipping methods.
 
@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from ...models import Product
+from ...search import get_products_for_search_index, update_products_search_vector
+
+
+def reindex_products_batch(pks: List[int]) -> int:
+    qs = get_products_for_search_index(Product.objects.filter(pk__in=pks))
+    return update_products_search_vector(qs)
+
+
+def reindex_products_batch_in_thread(pks: List[int]) -> int:
+    try:
+        return reindex_products_batch(pks)
+    finally:
+        # each thread opens its own connection
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the search vectors of products in parallel batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of products indexed in a single batch.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of batches indexed in parallel.",
+        )
+        parser.add_argument(
+            "--dirty-only",
+            action="store_true",
+            help="Index only the products marked as dirty.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        qs = Product.objects.all()
+        if options["dirty_only"]:
+            qs = qs.filter(search_index_dirty=True)
+        pks = list(qs.order_by("pk").values_list("pk", flat=True))
+        batches = [pks[i:i + batch_size] for i in range(0, len(pks), batch_size)]
+        self.stdout.write(
+            f"Indexing {len(pks)} products in {len(batches)} batches "
+            f"with {options['workers']} workers."
+        )
+
+        start = time.monotonic()
+        indexed_count = 0
+        for count in self.run_batches(batches, options["workers"]):
+            indexed_count += count
+            elapsed = time.monotonic() - start
+            self.stdout.write(
+                f"Indexed {indexed_count}/{len(pks)} products "
+                f"({indexed_count / elapsed:.1f} products/s)."
+            )
+
+        elapsed = time.monotonic() - start
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {indexed_count} products in {elapsed:.1f}s.")
+        )
+
+    def run_batches(self, batches: List[List[int]], workers: int):
+        if workers <= 1:
+            yield from map(reindex_products_batch, batches)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(reindex_products_batch_in_thread, batches)
@@ -1,23 +1,91 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List
 
 from django.core.management.base import BaseCommand
+from django.db import connection
 
+from ....channel.models import Channel
 from ....discount.utils import fetch_active_discounts
 from ...models import Product
-from ...utils.variant_prices import update_product_discounted_price
+from ...utils.variant_prices import (
+    DISCOUNTED_PRICES_BATCH_SIZE,
+    update_products_discounted_prices_batch,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def update_products_discounted_prices_batch_in_thread(
+    pks: List[int], discounts, channels
+) -> int:
+    try:
+        return update_products_discounted_prices_batch(pks, discounts, channels)
+    finally:
+        # each thread opens its own connection
+        connection.close()
+
+
 class Command(BaseCommand):
     help = "Recalculates the discounted prices for products in all channels."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DISCOUNTED_PRICES_BATCH_SIZE,
+            help="Number of products recalculated in a single batch.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of batches recalculated in parallel.",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write('Updating "discounted_price" field of all the products.')
-        # Fetching the discounts just once and reusing them
+        # Fetching the discounts and channels just once and reusing them
         discounts = fetch_active_discounts()
-        # Run the update on all the products
-        qs = Product.objects.all()
-        for product in qs.iterator():
-            self.stdout.write(f"Updating product PK: {product.pk}")
-            update_product_discounted_price(product, discounts=discounts)
+        channels = Channel.objects.in_bulk()
+
+        batch_size = options["batch_size"]
+        pks = list(Product.objects.order_by("pk").values_list("pk", flat=True))
+        batches = [pks[i:i + batch_size] for i in range(0, len(pks), batch_size)]
+
+        start = time.monotonic()
+        updated_count = 0
+        processed_count = 0
+        for batch, count in zip(
+            batches, self.run_batches(batches, discounts, channels, options["workers"])
+        ):
+            updated_count += count
+            processed_count += len(batch)
+            self.stdout.write(f"Updated {processed_count}/{len(pks)} products.")
+
+        elapsed = time.monotonic() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {updated_count} channel listings of {len(pks)} products "
+                f"in {elapsed:.1f}s."
+            )
+        )
+
+    def run_batches(self, batches: List[List[int]], discounts, channels, workers):
+        if workers <= 1:
+            update_batch = partial(
+                update_products_discounted_prices_batch,
+                discounts=discounts,
+                channels=channels,
+            )
+            yield from map(update_batch, batches)
+            return
+        update_batch = partial(
+            update_products_discounted_prices_batch_in_thread,
+            discounts=discounts,
+            channels=channels,
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(update_batch, batches)
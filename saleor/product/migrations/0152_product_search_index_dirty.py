@@ -0,0 +1,26 @@
+# Generated by Django 3.2.6 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0151_productchannellisting_product_pro_discoun_3145f3_btree"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_index_dirty",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("search_index_dirty", True)),
+                fields=["search_index_dirty"],
+                name="product_search_index_dirty",
+            ),
+        ),
+    ]
@@ -3,7 +3,6 @@ from typing import TYPE_CHECKING, Iterable, Optional, Union
 from uuid import uuid4
 
 from django.conf import settings
-from django.contrib.postgres.aggregates import StringAgg
 from django.contrib.postgres.indexes import BTreeIndex, GinIndex
 from django.contrib.postgres.search import SearchVectorField
 from django.db import models
@@ -11,7 +10,6 @@ from django.db.models import JSONField  # type: ignore
 from django.db.models import (
     BooleanField,
     Case,
-    Count,
     DateField,
     Exists,
     ExpressionWrapper,
@@ -277,7 +275,7 @@ class ProductsQueryset(models.QuerySet):
                              to sort by.
         :param descending: The sorting direction.
         """
-        from ..attribute.models import AttributeProduct, AttributeValue
+        from ..attribute.models import AttributeProduct
 
         qs: models.QuerySet = self
         # If the passed attribute ID is valid, execute the sorting
@@ -289,15 +287,14 @@ class ProductsQueryset(models.QuerySet):
                 concatenated_values=Value(None, output_field=models.CharField()),
             )
 
-        # Retrieve all the products' attribute data IDs (assignments) and
-        # product types that have the given attribute associated to them
-        associated_values = tuple(
+        # Retrieve the product types that have the given attribute associated to them
+        product_types_associated_to_attribute = tuple(
             AttributeProduct.objects.filter(attribute_id=attribute_pk).values_list(
-                "pk", "product_type_id"
+                "product_type_id", flat=True
             )
         )
 
-        if not associated_values:
+        if not product_types_associated_to_attribute:
             qs = qs.annotate(
                 concatenated_values_order=Value(
                     None, output_field=models.IntegerField()
@@ -306,39 +303,24 @@ class ProductsQueryset(models.QuerySet):
             )
 
         else:
-            attribute_associations, product_types_associated_to_attribute = zip(
-                *associated_values
-            )
-
             qs = qs.annotate(
-                # Contains to retrieve the attribute data (singular) of each product
-                # Refer to `AttributeProduct`.
-                filtered_attribute=FilteredRelation(
-                    relation_name="attributes",
-                    condition=Q(attributes__assignment_id__in=attribute_associations),
+                # Contains the sort key (singular) of the attribute of each product,
+                # i.e. its values concatenated in the values order.
+                # Refer to `AssignedProductAttributeSortKey`.
+                filtered_sort_key=FilteredRelation(
+                    relation_name="attribute_sort_keys",
+                    condition=Q(attribute_sort_keys__attribute_id=attribute_pk),
                 ),
-                # Implicit `GROUP BY` required for the `StringAgg` aggregation
-                grouped_ids=Count("id"),
-                # String aggregation of the attribute's values to efficiently sort them
                 concatenated_values=Case(
                     # If the product has no association data but has
                     # the given attribute associated to its product type,
                     # then consider the concatenated values as empty (non-null).
                     When(
                         Q(product_type_id__in=product_types_associated_to_attribute)
-                        & Q(filtered_attribute=None),
+                        & Q(filtered_sort_key=None),
                         then=models.Value(""),
                     ),
-                    default=StringAgg(
-                        F("filtered_attribute__values__name"),
-                        delimiter=",",
-                        ordering=(
-                            [
-                                f"filtered_attribute__values__{field_name}"
-                                for field_name in AttributeValue._meta.ordering or []
-                            ]
-                        ),
-                    ),
+                    default=F("filtered_sort_key__values"),
                     output_field=models.CharField(),
                 ),
                 concatenated_values_order=Case(
@@ -390,6 +372,8 @@ class Product(SeoModel, ModelWithMetadata):
     description = SanitizedJSONField(blank=True, null=True, sanitizer=clean_editor_js)
     description_plaintext = TextField(blank=True)
     search_vector = SearchVectorField(null=True, blank=True)
+    # set when the search vector has to be rebuilt, see `product.search`
+    search_index_dirty = models.BooleanField(default=True)
 
     category = models.ForeignKey(
         Category,
@@ -424,7 +408,14 @@ class Product(SeoModel, ModelWithMetadata):
         permissions = (
             (ProductPermissions.MANAGE_PRODUCTS.codename, "Manage products."),
         )
-        indexes = [GinIndex(fields=["search_vector"])]
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+            models.Index(
+                name="product_search_index_dirty",
+                fields=["search_index_dirty"],
+                condition=Q(search_index_dirty=True),
+            ),
+        ]
         indexes.extend(ModelWithMetadata.Meta.indexes)
 
     def __iter__(self):
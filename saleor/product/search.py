@@ -0,0 +1,121 @@
+from typing import Iterable, List
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Value
+
+from ..attribute.models import AssignedProductAttribute, AssignedVariantAttribute
+from ..core.utils.editorjs import clean_editor_js
+from .models import Product
+
+SEARCH_CONFIG = "english"
+SEARCH_INDEX_SCHEDULED_KEY = "ProductSearchIndex:scheduled"
+
+
+def prepare_product_search_vector_value(product: "Product") -> SearchVector:
+    """Return the weighted search vector of a product.
+
+    Names and SKUs weigh the most, then attribute values and the description.
+    Expects the variants and attribute values to be prefetched, see
+    `get_products_for_search_index`.
+    """
+    description = product.description_plaintext or (
+        clean_editor_js(product.description, to_string=True)
+        if product.description
+        else ""
+    )
+    variants = product.variants.all()
+    attribute_values = [
+        value.name
+        for assignment in product.attributes.all()
+        for value in assignment.values.all()
+    ]
+    attribute_values.extend(
+        value.name
+        for variant in variants
+        for assignment in variant.attributes.all()
+        for value in assignment.values.all()
+    )
+
+    vectors = [
+        (product.name, "A"),
+        (" ".join(variant.sku for variant in variants), "A"),
+        (" ".join(variant.name for variant in variants), "B"),
+        (" ".join(attribute_values), "B"),
+        (description, "C"),
+    ]
+    search_vector = None
+    for text, weight in vectors:
+        vector = SearchVector(Value(text), config=SEARCH_CONFIG, weight=weight)
+        search_vector = vector if search_vector is None else search_vector + vector
+    return search_vector
+
+
+def get_products_for_search_index(qs):
+    return qs.prefetch_related(
+        "variants__attributes__values", "attributes__values"
+    ).only("id", "name", "description", "description_plaintext")
+
+
+def update_products_search_vector(products: Iterable["Product"]) -> int:
+    """Write the search vectors of the products and mark them as indexed."""
+    products = list(products)
+    for product in products:
+        product.search_vector = prepare_product_search_vector_value(product)
+        product.search_index_dirty = False
+    Product.objects.bulk_update(products, ["search_vector", "search_index_dirty"])
+    return len(products)
+
+
+def update_dirty_products_search_vector(batch_size: int) -> int:
+    """Index a batch of the products marked as dirty.
+
+    Rows locked by another run are skipped, so concurrent runs don't index the
+    same products.
+    """
+    with transaction.atomic():
+        pks = list(
+            Product.objects.filter(search_index_dirty=True)
+            .order_by("pk")
+            .select_for_update(skip_locked=True)
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        qs = get_products_for_search_index(Product.objects.filter(pk__in=pks))
+        return update_products_search_vector(qs)
+
+
+def mark_products_search_index_dirty(product_ids: Iterable[int]):
+    """Mark the products to be reindexed by the debounced search index task."""
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    Product.objects.filter(pk__in=product_ids).update(search_index_dirty=True)
+    transaction.on_commit(schedule_products_search_index_update)
+
+
+def schedule_products_search_index_update():
+    """Run the search index task once after a burst of changes.
+
+    Changes made while the task is scheduled are picked up by the same run.
+    """
+    from .tasks import update_products_search_vector_task
+
+    delay = settings.PRODUCT_SEARCH_INDEX_DELAY
+    if cache.add(SEARCH_INDEX_SCHEDULED_KEY, True, timeout=delay):
+        update_products_search_vector_task.apply_async(countdown=delay)
+
+
+def get_product_ids_with_attribute_values(value_ids: Iterable[int]) -> List[int]:
+    product_ids = set(
+        AssignedProductAttribute.objects.filter(values__in=value_ids).values_list(
+            "product_id", flat=True
+        )
+    )
+    product_ids.update(
+        AssignedVariantAttribute.objects.filter(values__in=value_ids).values_list(
+            "variant__product_id", flat=True
+        )
+    )
+    return list(product_ids)
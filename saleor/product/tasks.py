@@ -1,12 +1,14 @@
 import logging
 from typing import Iterable, List, Optional
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 
 from ..attribute.models import Attribute
 from ..celeryconf import app
 from ..discount.models import Sale
 from .models import Product, ProductType, ProductVariant
+from .search import update_dirty_products_search_vector
 from .utils.variant_prices import (
     update_product_discounted_price,
     update_products_discounted_prices,
@@ -86,3 +88,15 @@ def update_products_discounted_prices_of_discount_task(discount_pk: int):
 def update_products_discounted_prices_task(product_ids: List[int]):
     products = Product.objects.filter(pk__in=product_ids)
     update_products_discounted_prices(products)
+
+
+@app.task
+def update_products_search_vector_task():
+    batch_size = settings.PRODUCT_SEARCH_INDEX_BATCH_SIZE
+    updated_count = 0
+    while True:
+        batch_count = update_dirty_products_search_vector(batch_size)
+        updated_count += batch_count
+        if batch_count < batch_size:
+            break
+    logger.info("Updated search vectors of %s products.", updated_count)
@@ -1,13 +1,19 @@
 from unittest.mock import patch
 
 from django.core.management import call_command
+from django.utils import timezone
 from prices import Money
 
+from ...discount.utils import fetch_discounts
+from ..models import ProductVariantChannelListing
 from ..tasks import (
     update_products_discounted_prices_of_catalogues,
     update_products_discounted_prices_task,
 )
-from ..utils.variant_prices import update_product_discounted_price
+from ..utils.variant_prices import (
+    update_product_discounted_price,
+    update_products_discounted_prices_batch,
+)
 
 
 def test_update_product_discounted_price(product, channel_USD):
@@ -128,12 +134,54 @@ def test_update_products_discounted_prices_task(product_list):
 @patch(
     "saleor.product.management.commands"
     ".update_all_products_discounted_prices"
-    ".update_product_discounted_price"
+    ".update_products_discounted_prices_batch"
 )
 def test_management_commmand_update_all_products_discounted_price(
-    mock_update_product_discounted_price, product_list
+    mock_update_products_discounted_prices_batch, product_list
 ):
-    call_command("update_all_products_discounted_prices")
-    call_args_list = mock_update_product_discounted_price.call_args_list
-    for (args, kwargs), product in zip(call_args_list, product_list):
-        assert args[0] == product
+    call_command("update_all_products_discounted_prices", batch_size=2)
+
+    pks = sorted(product.pk for product in product_list)
+    batches = [
+        args[0]
+        for args, _ in mock_update_products_discounted_prices_batch.call_args_list
+    ]
+    assert batches == [pks[i:i + 2] for i in range(0, len(pks), 2)]
+
+
+def test_management_commmand_update_all_products_discounted_price_applies_sale(
+    product_list, sale, channel_USD
+):
+    call_command("update_all_products_discounted_prices", batch_size=1)
+
+    for product in product_list:
+        product_channel_listing = product.channel_listings.get(channel=channel_USD)
+        variant_prices = ProductVariantChannelListing.objects.filter(
+            variant__product=product, channel=channel_USD
+        ).values_list("price_amount", flat=True)
+        assert product_channel_listing.discounted_price_amount == (
+            min(variant_prices) - 5
+        )
+
+
+def test_update_products_discounted_prices_batch(
+    product_list, sale, channel_USD, django_assert_num_queries
+):
+    discounts = fetch_discounts(timezone.now())
+    product_ids = [product.pk for product in product_list]
+
+    # channels, products, collections, variant prices, listings and the update
+    with django_assert_num_queries(6):
+        updated_count = update_products_discounted_prices_batch(
+            product_ids, discounts
+        )
+
+    assert updated_count == len(product_list)
+    for product in product_list:
+        product_channel_listing = product.channel_listings.get(channel=channel_USD)
+        variant_prices = ProductVariantChannelListing.objects.filter(
+            variant__product=product, channel=channel_USD
+        ).values_list("price_amount", flat=True)
+        assert product_channel_listing.discounted_price_amount == (
+            min(variant_prices) - 5
+        )
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+from django.contrib.postgres.search import SearchQuery
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..models import Product
+from ..search import (
+    SEARCH_CONFIG,
+    get_product_ids_with_attribute_values,
+    get_products_for_search_index,
+    mark_products_search_index_dirty,
+    update_dirty_products_search_vector,
+    update_products_search_vector,
+)
+from ..tasks import update_products_search_vector_task
+
+
+def search_products(phrase):
+    query = SearchQuery(phrase, config=SEARCH_CONFIG)
+    return Product.objects.filter(search_vector=query)
+
+
+def test_update_products_search_vector(product):
+    variant = product.variants.first()
+    attribute_value = product.attributes.first().values.first()
+
+    update_products_search_vector(
+        get_products_for_search_index(Product.objects.filter(pk=product.pk))
+    )
+
+    product.refresh_from_db()
+    assert not product.search_index_dirty
+    assert list(search_products(product.name)) == [product]
+    assert list(search_products(variant.sku)) == [product]
+    assert list(search_products(attribute_value.name)) == [product]
+
+
+def test_update_dirty_products_search_vector(product_list):
+    clean_product, *dirty_products = product_list
+    Product.objects.filter(pk=clean_product.pk).update(search_index_dirty=False)
+
+    updated_count = update_dirty_products_search_vector(batch_size=100)
+
+    assert updated_count == len(dirty_products)
+    assert not Product.objects.filter(search_index_dirty=True).exists()
+    clean_product.refresh_from_db()
+    assert clean_product.search_vector is None
+
+
+@patch("saleor.product.tasks.update_products_search_vector_task.apply_async")
+def test_mark_products_search_index_dirty_schedules_task_once(
+    mocked_apply_async, product_list
+):
+    cache.clear()
+    Product.objects.update(search_index_dirty=False)
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        mark_products_search_index_dirty([product_list[0].pk])
+        mark_products_search_index_dirty([product_list[1].pk])
+
+    assert Product.objects.filter(search_index_dirty=True).count() == 2
+    mocked_apply_async.assert_called_once()
+    cache.clear()
+
+
+def test_update_products_search_vector_task(product_list, settings):
+    settings.PRODUCT_SEARCH_INDEX_BATCH_SIZE = 1
+
+    update_products_search_vector_task()
+
+    assert not Product.objects.filter(search_index_dirty=True).exists()
+
+
+def test_get_product_ids_with_attribute_values(product):
+    attribute_value = product.attributes.first().values.first()
+
+    assert get_product_ids_with_attribute_values([attribute_value.pk]) == [product.pk]
+
+
+def test_reindex_products_command(product_list):
+    call_command("reindex_products", workers=1, batch_size=2)
+
+    assert not Product.objects.filter(search_index_dirty=True).exists()
+    for product in product_list:
+        assert product in search_products(product.name)
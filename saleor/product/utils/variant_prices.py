@@ -1,23 +1,26 @@
 import operator
 from collections import defaultdict
 from functools import reduce
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
 from django.db.models.query_utils import Q
 from prices import Money
 
+from ...channel.models import Channel
+from ...core.caching import CachePrefix, invalidate_instances_cache
 from ...discount.utils import calculate_discounted_price, fetch_active_discounts
-from ..models import Product, ProductChannelListing, ProductVariantChannelListing
+from ..models import (
+    Collection,
+    CollectionProduct,
+    Product,
+    ProductChannelListing,
+    ProductVariantChannelListing,
+)
 
+if TYPE_CHECKING:
+    from ...discount import DiscountInfo
 
-def _get_variant_prices_in_channels_dict(product):
-    prices_dict = defaultdict(list)
-    for variant_channel_listing in ProductVariantChannelListing.objects.filter(
-        variant__product_id=product, price_amount__isnull=False
-    ):
-        channel_id = variant_channel_listing.channel_id
-        prices_dict[channel_id].append(variant_channel_listing.price)
-    return prices_dict
+DISCOUNTED_PRICES_BATCH_SIZE = 1000
 
 
 def _get_product_discounted_price(
@@ -39,20 +42,54 @@ def _get_product_discounted_price(
 def update_product_discounted_price(product, discounts=None):
     if discounts is None:
         discounts = fetch_active_discounts()
-    collections = list(product.collections.all())
-    variant_prices_in_channels_dict = _get_variant_prices_in_channels_dict(product)
+    update_products_discounted_prices_batch([product.pk], discounts)
+
+
+def update_products_discounted_prices(products, discounts=None):
+    if discounts is None:
+        discounts = fetch_active_discounts()
+
+    pks = list(products.order_by("pk").values_list("pk", flat=True))
+    channels = Channel.objects.in_bulk()
+    for i in range(0, len(pks), DISCOUNTED_PRICES_BATCH_SIZE):
+        update_products_discounted_prices_batch(
+            pks[i:i + DISCOUNTED_PRICES_BATCH_SIZE], discounts, channels
+        )
+
+
+def update_products_discounted_prices_batch(
+    product_ids: List[int],
+    discounts: Iterable["DiscountInfo"],
+    channels: Optional[Dict[int, Channel]] = None,
+) -> int:
+    """Recalculate the discounted prices of the products in a few queries.
+
+    Variant prices, collections and channel listings of all the products are fetched
+    at once and the changed listings are saved with a single `bulk_update`.
+    Return the number of updated channel listings.
+    """
+    if channels is None:
+        channels = Channel.objects.in_bulk()
+    products = Product.objects.filter(pk__in=product_ids).only("id", "category_id")
+    products_dict = {product.pk: product for product in products}
+    collections_dict = _get_products_collections_dict(product_ids)
+    variant_prices_dict = _get_products_variant_prices_dict(product_ids)
+
     changed_products_channels_to_update = []
-    for product_channel_listing in product.channel_listings.all():
+    for product_channel_listing in ProductChannelListing.objects.filter(
+        product_id__in=product_ids
+    ):
+        product_id = product_channel_listing.product_id
         channel_id = product_channel_listing.channel_id
-        variant_prices_dict = variant_prices_in_channels_dict.get(channel_id)
-        if not variant_prices_dict:
+        variant_prices = variant_prices_dict.get((product_id, channel_id))
+        if not variant_prices:
             continue
         product_discounted_price = _get_product_discounted_price(
-            variant_prices_dict,
-            product,
-            collections,
+            variant_prices,
+            products_dict[product_id],
+            collections_dict.get(product_id, []),
             discounts,
-            product_channel_listing.channel,
+            channels[channel_id],
         )
         if product_channel_listing.discounted_price != product_discounted_price:
             product_channel_listing.discounted_price_amount = (
@@ -62,14 +99,41 @@ def update_product_discounted_price(product, discounts=None):
     ProductChannelListing.objects.bulk_update(
         changed_products_channels_to_update, ["discounted_price_amount"]
     )
+    invalidate_instances_cache(
+        CachePrefix.PRODUCT,
+        [listing.product_id for listing in changed_products_channels_to_update],
+    )
+    return len(changed_products_channels_to_update)
 
 
-def update_products_discounted_prices(products, discounts=None):
-    if discounts is None:
-        discounts = fetch_active_discounts()
+def _get_products_collections_dict(product_ids) -> Dict[int, List[Collection]]:
+    # only the IDs of the collections are needed to match the discounts
+    collections: Dict[int, Collection] = {}
+    collections_dict = defaultdict(list)
+    for product_id, collection_id in CollectionProduct.objects.filter(
+        product_id__in=product_ids
+    ).values_list("product_id", "collection_id"):
+        collection = collections.setdefault(collection_id, Collection(id=collection_id))
+        collections_dict[product_id].append(collection)
+    return collections_dict
+
 
-    for product in products.prefetch_related("channel_listings"):
-        update_product_discounted_price(product, discounts)
+def _get_products_variant_prices_dict(
+    product_ids,
+) -> Dict[Tuple[int, int], List[Money]]:
+    prices_dict = defaultdict(list)
+    for (
+        product_id,
+        channel_id,
+        price_amount,
+        currency,
+    ) in ProductVariantChannelListing.objects.filter(
+        variant__product_id__in=product_ids, price_amount__isnull=False
+    ).values_list(
+        "variant__product_id", "channel_id", "price_amount", "currency"
+    ):
+        prices_dict[(product_id, channel_id)].append(Money(price_amount, currency))
+    return prices_dict
 
 
 def update_products_discounted_prices_of_catalogues(
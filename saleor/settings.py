@@ -1,4 +1,5 @@
 import ast
+import json
 import os.path
 import sys
 import warnings
@@ -417,6 +418,50 @@ TEST_RUNNER = "saleor.tests.runner.PytestTestRunner"
 
 PLAYGROUND_ENABLED = get_bool_from_env("PLAYGROUND_ENABLED", True)
 
+# Number of parsed and validated GraphQL documents kept in memory per process
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 1000))
+# Apollo automatic persisted queries
+GRAPHQL_PERSISTED_QUERIES_ENABLED = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ENABLED", True
+)
+GRAPHQL_PERSISTED_QUERIES_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_PERSISTED_QUERIES_TIMEOUT", "7 days")
+)
+# Responses of queries resolved by cached resolvers, used only with Redis
+GRAPHQL_RESPONSE_CACHE_ENABLED = get_bool_from_env(
+    "GRAPHQL_RESPONSE_CACHE_ENABLED", True
+)
+# responses nest prices of sales which start and end without any write, so the
+# timeout is short
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", "5 minutes")
+)
+# `totalCount` of connections, see `graphql.core.total_count`
+GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_CACHE_TIMEOUT", "1 minute")
+)
+GRAPHQL_TOTAL_COUNT_CAP = int(os.environ.get("GRAPHQL_TOTAL_COUNT_CAP", 10000))
+GRAPHQL_TOTAL_COUNT_EXACT_THRESHOLD = int(
+    os.environ.get("GRAPHQL_TOTAL_COUNT_EXACT_THRESHOLD", 1000)
+)
+# Count the SQL queries of every GraphQL operation, see `graphql.query_budget`.
+# Budgets map operation names to their maximum number of queries, e.g.
+# GRAPHQL_QUERY_BUDGETS='{"checkoutComplete": 80}'. Exceeding a budget is logged.
+GRAPHQL_QUERY_ACCOUNTING_ENABLED = get_bool_from_env(
+    "GRAPHQL_QUERY_ACCOUNTING_ENABLED", False
+)
+GRAPHQL_QUERY_BUDGETS = json.loads(os.environ.get("GRAPHQL_QUERY_BUDGETS", "{}"))
+GRAPHQL_DEFAULT_QUERY_BUDGET = (
+    int(os.environ["GRAPHQL_DEFAULT_QUERY_BUDGET"])
+    if "GRAPHQL_DEFAULT_QUERY_BUDGET" in os.environ
+    else None
+)
+# Budgets are checked after the execution, when mutations are already committed,
+# so exceeding them fails the operation only in tests
+GRAPHQL_QUERY_BUDGET_RAISE = False
+# Statements executed this many times by a single operation are logged as N+1
+GRAPHQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get("GRAPHQL_N_PLUS_ONE_THRESHOLD", 10))
+
 ALLOWED_HOSTS = get_list(os.environ.get("ALLOWED_HOSTS", "localhost,127.0.0.1"))
 ALLOWED_GRAPHQL_ORIGINS = get_list(os.environ.get("ALLOWED_GRAPHQL_ORIGINS", "*"))
 
@@ -547,7 +592,28 @@ CELERY_BEAT_SCHEDULE = {
         "task": "saleor.warehouse.tasks.update_stocks_quantity_allocated_task",
         "schedule": timedelta(days=1),
     },
+    # picks up products marked as dirty outside of the mutations
+    "update-products-search-vectors": {
+        "task": "saleor.product.tasks.update_products_search_vector_task",
+        "schedule": timedelta(minutes=10),
+    },
+    "delete-old-webhook-delivery-attempts": {
+        "task": (
+            "saleor.plugins.webhook.tasks.delete_old_webhook_delivery_attempts_task"
+        ),
+        "schedule": timedelta(hours=1),
+    },
 }
+stream_settings.add_celery_beat_schedule(CELERY_BEAT_SCHEDULE)  # VALCOME
+
+# Product search vectors are rebuilt in batches by a task, run once after
+# the delay following a burst of product changes.
+PRODUCT_SEARCH_INDEX_DELAY = parse(
+    os.environ.get("PRODUCT_SEARCH_INDEX_DELAY", "10 seconds")
+)
+PRODUCT_SEARCH_INDEX_BATCH_SIZE = int(
+    os.environ.get("PRODUCT_SEARCH_INDEX_BATCH_SIZE", 500)
+)
 
 # Change this value if your application is running behind a proxy,
 # e.g. HTTP_CF_Connecting_IP for Cloudflare or X_FORWARDED_FOR
@@ -633,6 +699,39 @@ for entry_point in installed_plugins:
 
 PLUGINS = BUILTIN_PLUGINS + EXTERNAL_PLUGINS
 
+# The plugins manager is built once per process and rebuilt when a plugin
+# configuration or a channel changes. Processes learn about changes through the
+# cache, so it has to be shared by all of them, i.e. it's used only with Redis.
+PLUGINS_MANAGER_CACHE_ENABLED = get_bool_from_env("PLUGINS_MANAGER_CACHE_ENABLED", True)
+
+# Metrics endpoints are served only to requests with the
+# `Authorization: Bearer <METRICS_TOKEN>` header and refuse all without the token.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+# Durations and outcomes of the plugin hook calls, aggregated per plugin and hook.
+# Processes flush their stats to the cache, where they are read by the
+# `plugin_hook_stats` command and the Prometheus metrics endpoint. Stats are shared
+# by the processes only with Redis. A flush interval of 0 keeps the stats in
+# process memory only.
+PLUGINS_HOOK_METRICS_ENABLED = get_bool_from_env("PLUGINS_HOOK_METRICS_ENABLED", False)
+PLUGINS_HOOK_METRICS_FLUSH_INTERVAL = parse(
+    os.environ.get("PLUGINS_HOOK_METRICS_FLUSH_INTERVAL", "1 minute")
+)
+PLUGINS_HOOK_TRACING_ENABLED = get_bool_from_env("PLUGINS_HOOK_TRACING_ENABLED", False)
+
+# Sites with their settings and channels are kept in process memory and reloaded
+# when any of them changes. Like the plugins manager, processes learn about
+# changes through the shared cache, so it's used only with Redis.
+CONFIGURATION_CACHE_ENABLED = get_bool_from_env("CONFIGURATION_CACHE_ENABLED", True)
+
+# Sales active within a time bucket are kept in process memory and in the cache.
+# Sales starting or ending within the bucket are filtered by their dates. Used only
+# with Redis, see below.
+DISCOUNTS_SNAPSHOT_ENABLED = get_bool_from_env("DISCOUNTS_SNAPSHOT_ENABLED", True)
+DISCOUNTS_SNAPSHOT_BUCKET = parse(
+    os.environ.get("DISCOUNTS_SNAPSHOT_BUCKET", "5 minutes")
+)
+
 if (
     not DEBUG
     and ENABLE_ACCOUNT_CONFIRMATION_BY_EMAIL
@@ -653,6 +752,68 @@ WEBHOOK_EXCLUDED_SHIPPING_REQUEST_TIMEOUT = int(
     os.environ.get("WEBHOOK_EXCLUDED_SHIPPING_REQUEST_TIMEOUT", 2)
 )
 
+# Webhook subscriptions by event type are kept in process memory and in the
+# cache, and rebuilt when a webhook, its app or the app permissions change. Used
+# only with Redis, see below.
+WEBHOOK_REGISTRY_ENABLED = get_bool_from_env("WEBHOOK_REGISTRY_ENABLED", True)
+
+# Payloads of webhook events are generated by the worker after the transaction
+# is committed, with the state of the instance at that time. Events listed in
+# WEBHOOK_SNAPSHOT_EVENTS capture the state when they are emitted instead.
+WEBHOOK_DEFERRED_PAYLOADS_ENABLED = get_bool_from_env(
+    "WEBHOOK_DEFERRED_PAYLOADS_ENABLED", True
+)
+WEBHOOK_SNAPSHOT_EVENTS = get_list(os.environ.get("WEBHOOK_SNAPSHOT_EVENTS", ""))
+
+# Webhook deliveries reuse HTTP connections and SQS / Pub/Sub clients pooled per
+# worker process. Concurrent deliveries of a process to a single target are
+# limited to WEBHOOK_TARGET_MAX_CONCURRENCY, which also bounds the pools. The limit
+# is not shared between processes, it takes effect only for workers running with
+# a threaded or gevent pool (e.g. `celery worker --pool=threads`), the prefork
+# pool runs a single task per process.
+WEBHOOK_TRANSPORT_POOLING_ENABLED = get_bool_from_env(
+    "WEBHOOK_TRANSPORT_POOLING_ENABLED", True
+)
+WEBHOOK_TARGET_MAX_CONCURRENCY = int(
+    os.environ.get("WEBHOOK_TARGET_MAX_CONCURRENCY", 10)
+)
+
+# Webhook delivery attempts are recorded with their status, latency and response
+# code, and deleted after WEBHOOK_DELIVERY_ATTEMPTS_RETENTION.
+WEBHOOK_DELIVERY_ATTEMPTS_ENABLED = get_bool_from_env(
+    "WEBHOOK_DELIVERY_ATTEMPTS_ENABLED", True
+)
+WEBHOOK_DELIVERY_ATTEMPTS_RETENTION = parse(
+    os.environ.get("WEBHOOK_DELIVERY_ATTEMPTS_RETENTION", "7 days")
+)
+
+# Deliveries to a webhook are paused when the share of its failed attempts within
+# WEBHOOK_CIRCUIT_BREAKER_WINDOW reaches WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE, once
+# it made at least WEBHOOK_CIRCUIT_BREAKER_MIN_ATTEMPTS attempts. Paused webhooks
+# are probed by a single delivery every WEBHOOK_CIRCUIT_BREAKER_PROBE_INTERVAL and
+# resumed once the probe succeeds.
+WEBHOOK_CIRCUIT_BREAKER_ENABLED = get_bool_from_env(
+    "WEBHOOK_CIRCUIT_BREAKER_ENABLED", True
+)
+WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE = float(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE", 0.5)
+)
+WEBHOOK_CIRCUIT_BREAKER_MIN_ATTEMPTS = int(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_MIN_ATTEMPTS", 10)
+)
+WEBHOOK_CIRCUIT_BREAKER_WINDOW = parse(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_WINDOW", "5 minutes")
+)
+WEBHOOK_CIRCUIT_BREAKER_PROBE_INTERVAL = parse(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_PROBE_INTERVAL", "1 minute")
+)
+
+# Delivery latency, queue depth and paused webhooks per app are exposed for
+# Prometheus at /metrics/webhooks/ to the requests with `METRICS_TOKEN`.
+WEBHOOK_DELIVERY_METRICS_ENABLED = get_bool_from_env(
+    "WEBHOOK_DELIVERY_METRICS_ENABLED", False
+)
+
 # Initialize a simple and basic Jaeger Tracing integration
 # for open-tracing if enabled.
 #
@@ -684,6 +845,14 @@ if REDIS_URL:
 CACHES = {"default": django_cache_url.config()}
 CACHES["default"]["TIMEOUT"] = parse(os.environ.get("CACHE_TIMEOUT", "7 days"))
 
+# Data kept in process memory is invalidated through the cache, so other processes
+# would keep outdated data with a cache of their own, e.g. locmem
+if "RedisCache" not in CACHES["default"]["BACKEND"]:
+    PLUGINS_MANAGER_CACHE_ENABLED = False
+    CONFIGURATION_CACHE_ENABLED = False
+    WEBHOOK_REGISTRY_ENABLED = False
+    DISCOUNTS_SNAPSHOT_ENABLED = False
+
 # Default False because storefront and dashboard don't support expiration of token
 JWT_EXPIRE = get_bool_from_env("JWT_EXPIRE", False)
 JWT_TTL_ACCESS = timedelta(seconds=parse(os.environ.get("JWT_TTL_ACCESS", "5 minutes")))
@@ -691,6 +860,8 @@ JWT_TTL_APP_ACCESS = timedelta(
     seconds=parse(os.environ.get("JWT_TTL_APP_ACCESS", "5 minutes"))
 )
 JWT_TTL_REFRESH = timedelta(seconds=parse(os.environ.get("JWT_TTL_REFRESH", "30 days")))
+# users of access tokens are cached for a short time, only with Redis
+JWT_USER_CACHE_TIMEOUT = parse(os.environ.get("JWT_USER_CACHE_TIMEOUT", "1 minute"))
 
 
 JWT_TTL_REQUEST_EMAIL_CHANGE = timedelta(
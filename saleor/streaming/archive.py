@@ -0,0 +1,64 @@
+from datetime import timedelta
+from typing import Iterator, List, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import stream_settings
+from .models import ArchivedStreamTicket, StreamTicket
+
+# view over the hot and the archive table, meant for analytics queries
+STREAM_TICKET_HISTORY_VIEW = "streaming_streamticket_history"
+
+
+def archive_expired_stream_tickets(
+    older_than_days: Optional[int] = None, chunk_size: Optional[int] = None
+) -> int:
+    return sum(iter_archive_expired_stream_tickets(older_than_days, chunk_size))
+
+
+def iter_archive_expired_stream_tickets(
+    older_than_days: Optional[int] = None, chunk_size: Optional[int] = None
+) -> Iterator[int]:
+    """Move tickets expired more than the given days ago to the archive table.
+
+    Tickets are moved in chunks, paginated by their id, and every chunk is moved in
+    its own transaction. Yields the number of tickets archived per chunk.
+    """
+    if older_than_days is None:
+        older_than_days = stream_settings.STREAM_TICKET_ARCHIVE_AFTER_DAYS
+    chunk_size = chunk_size or stream_settings.STREAM_TICKET_ARCHIVE_CHUNK_SIZE
+    expired_before = timezone.now() - timedelta(days=older_than_days)
+    last_id = 0
+
+    while True:
+        ticket_ids = list(
+            StreamTicket.objects.filter(expires__lt=expired_before, pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not ticket_ids:
+            return
+
+        yield move_stream_tickets_to_archive(ticket_ids)
+        last_id = ticket_ids[-1]
+
+
+def move_stream_tickets_to_archive(ticket_ids: List[int]) -> int:
+    columns = ", ".join(
+        connection.ops.quote_name(field.column)
+        for field in StreamTicket._meta.concrete_fields
+    )
+    query = f"""
+        WITH moved AS (
+            DELETE FROM {StreamTicket._meta.db_table}
+            WHERE id = ANY(%s)
+            RETURNING {columns}
+        )
+        INSERT INTO {ArchivedStreamTicket._meta.db_table} ({columns}, archived_at)
+        SELECT {columns}, %s FROM moved
+    """
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(query, [ticket_ids, timezone.now()])
+        return cursor.rowcount
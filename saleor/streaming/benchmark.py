@@ -0,0 +1,336 @@
+import json
+import math
+import statistics
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+
+import graphene
+from django.db import connection
+from django.db.models import Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from ..checkout.models import Checkout
+from ..core.jwt import create_access_token
+from ..order.models import Order
+from ..payment.models import Payment
+from .entitlement import (
+    StreamGame,
+    get_cached_entitlement,
+    has_access,
+    invalidate_user_entitlements,
+)
+from .models import StreamTicket
+
+if TYPE_CHECKING:
+    from ..account.models import User
+    from ..product.models import ProductVariant
+
+PERCENTILES = (50, 95, 99)
+
+CHECKOUT_CREATE_MUTATION = """
+mutation BenchmarkCheckoutCreate(
+    $channel: String!, $email: String!, $variantId: ID!, $address: AddressInput
+) {
+    checkoutCreate(
+        input: {
+            channel: $channel
+            email: $email
+            lines: [{ quantity: 1, variantId: $variantId }]
+            billingAddress: $address
+        }
+    ) {
+        checkout {
+            token
+            totalPrice {
+                gross {
+                    amount
+                }
+            }
+        }
+        errors {
+            field
+            code
+            message
+        }
+    }
+}
+"""
+
+CHECKOUT_METADATA_MUTATION = """
+mutation BenchmarkCheckoutMetadata($token: ID!, $input: [MetadataInput!]!) {
+    updateMetadata(id: $token, input: $input) {
+        errors {
+            field
+            code
+            message
+        }
+    }
+}
+"""
+
+CHECKOUT_PAYMENT_CREATE_MUTATION = """
+mutation BenchmarkCheckoutPaymentCreate($token: UUID, $input: PaymentInput!) {
+    checkoutPaymentCreate(token: $token, input: $input) {
+        payment {
+            chargeStatus
+        }
+        errors {
+            field
+            code
+            message
+        }
+    }
+}
+"""
+
+CHECKOUT_COMPLETE_MUTATION = """
+mutation BenchmarkCheckoutComplete($token: UUID) {
+    checkoutComplete(token: $token) {
+        order {
+            token
+        }
+        errors {
+            field
+            code
+            message
+        }
+    }
+}
+"""
+
+
+@dataclass
+class OperationStats:
+    durations: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    errors: int = 0
+
+    def add(self, duration: float, queries: int, failed: bool):
+        self.durations.append(duration)
+        self.queries.append(queries)
+        self.errors += int(failed)
+
+    def summary(self) -> dict:
+        total_duration = sum(self.durations)
+        summary = {
+            "count": len(self.durations),
+            "errors": self.errors,
+            "mean_ms": round(statistics.mean(self.durations) * 1000, 2),
+            "queries_avg": round(statistics.mean(self.queries), 2),
+            "queries_max": max(self.queries),
+            "throughput_per_s": round(len(self.durations) / total_duration, 2)
+            if total_duration
+            else 0.0,
+        }
+        for pct in PERCENTILES:
+            summary[f"p{pct}_ms"] = round(percentile(self.durations, pct) * 1000, 2)
+        return summary
+
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    """Return the nearest-rank percentile of the values."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class StreamCheckoutBenchmark:
+    """Replay the checkout of a stream ticket followed by entitlement checks.
+
+    Every user creates a checkout for the ticket, adds the stream metadata, pays
+    and completes it through the GraphQL API, then checks the access to the game
+    the given number of times. Latencies and queries are recorded per operation.
+
+    The flows are committed, so the order is processed by the plugins as in
+    production. Data created by the run is removed by `cleanup`.
+    """
+
+    def __init__(
+        self,
+        *,
+        channel_slug: str,
+        variant: "ProductVariant",
+        game_id: str,
+        gateway: str,
+        payment_token: str,
+        entitlement_checks: int = 10,
+        host: str = "localhost",
+    ):
+        self.channel_slug = channel_slug
+        self.variant = variant
+        self.game_id = game_id
+        self.gateway = gateway
+        self.payment_token = payment_token
+        self.entitlement_checks = entitlement_checks
+        self.client = Client(HTTP_HOST=host)
+        self.stats: Dict[str, OperationStats] = defaultdict(OperationStats)
+        self.checkout_tokens: List[str] = []
+        self.order_tokens: List[str] = []
+
+    def run(self, users: Iterable["User"]) -> dict:
+        start = time.perf_counter()
+        for user in users:
+            self.run_user_flow(user)
+        elapsed = time.perf_counter() - start
+
+        operations_count = sum(len(stats.durations) for stats in self.stats.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "throughput_per_s": round(operations_count / elapsed, 2) if elapsed else 0,
+            "operations": {
+                name: stats.summary() for name, stats in sorted(self.stats.items())
+            },
+        }
+
+    def run_user_flow(self, user: "User"):
+        headers = {"HTTP_AUTHORIZATION": f"JWT {create_access_token(user)}"}
+        data = self.execute(
+            "checkoutCreate",
+            CHECKOUT_CREATE_MUTATION,
+            {
+                "channel": self.channel_slug,
+                "email": user.email,
+                "variantId": graphene.Node.to_global_id(
+                    "ProductVariant", self.variant.pk
+                ),
+                "address": get_address_input(user),
+            },
+            headers,
+        )
+        if not data or not data["checkout"]:
+            return
+        token = data["checkout"]["token"]
+        self.checkout_tokens.append(token)
+        amount = data["checkout"]["totalPrice"]["gross"]["amount"]
+
+        product_id = graphene.Node.to_global_id("Product", self.variant.product_id)
+        metadata = {
+            "PRODUCT_ID": product_id,
+            "GAME_ID": self.game_id,
+            "STREAM_TYPE": "g",
+        }
+        self.execute(
+            "updateMetadata",
+            CHECKOUT_METADATA_MUTATION,
+            {
+                "token": token,
+                "input": [{"key": k, "value": v} for k, v in metadata.items()],
+            },
+            headers,
+        )
+        self.execute(
+            "checkoutPaymentCreate",
+            CHECKOUT_PAYMENT_CREATE_MUTATION,
+            {
+                "token": token,
+                "input": {
+                    "gateway": self.gateway,
+                    "token": self.payment_token,
+                    "amount": amount,
+                },
+            },
+            headers,
+        )
+        data = self.execute(
+            "checkoutComplete", CHECKOUT_COMPLETE_MUTATION, {"token": token}, headers
+        )
+        if data and data["order"]:
+            self.order_tokens.append(data["order"]["token"])
+
+        game = StreamGame(game_id=self.game_id)
+        for _ in range(self.entitlement_checks):
+            self.measure("hasAccess", lambda: has_access(user, game))
+            self.measure(
+                "cachedEntitlement", lambda: get_cached_entitlement(user, game)
+            )
+
+    def cleanup(self):
+        """Delete the checkouts, orders and stream tickets created by the run."""
+        orders = Order.objects.filter(token__in=self.order_tokens)
+        tickets = StreamTicket.objects.filter(order__in=orders)
+        user_ids = list(tickets.values_list("user_id", flat=True))
+        tickets.delete()
+        Payment.objects.filter(
+            Q(order__in=orders) | Q(checkout__token__in=self.checkout_tokens)
+        ).delete()
+        orders.delete()
+        Checkout.objects.filter(token__in=self.checkout_tokens).delete()
+        invalidate_user_entitlements(user_ids)
+        self.checkout_tokens, self.order_tokens = [], []
+
+    def execute(
+        self, name: str, query: str, variables: dict, headers: dict
+    ) -> Optional[dict]:
+        """Post the operation to the API and return the data of the mutation."""
+
+        def post():
+            response = self.client.post(
+                "/graphql/",
+                {"query": query, "variables": variables},
+                content_type="application/json",
+                **headers,
+            )
+            return json.loads(response.content)
+
+        def is_failed(content):
+            data = (content.get("data") or {}).get(name)
+            return bool(content.get("errors") or not data or data.get("errors"))
+
+        content = self.measure(name, post, is_failed)
+        return (content.get("data") or {}).get(name)
+
+    def measure(self, name: str, func: Callable, is_failed: Optional[Callable] = None):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            result = func()
+            duration = time.perf_counter() - start
+        failed = bool(is_failed and is_failed(result))
+        self.stats[name].add(duration, len(queries), failed)
+        return result
+
+
+def get_address_input(user: "User") -> Optional[dict]:
+    address = user.default_billing_address
+    if address is None:
+        return None
+    return {
+        "firstName": address.first_name,
+        "lastName": address.last_name,
+        "streetAddress1": address.street_address_1,
+        "city": address.city,
+        "postalCode": address.postal_code,
+        "country": address.country.code,
+        "countryArea": address.country_area,
+    }
+
+
+def compare_with_baseline(
+    results: dict, baseline: dict, tolerance: float
+) -> List[str]:
+    """Return the regressions of the results against the baseline.
+
+    Latencies may grow by the tolerance, a fraction of the baseline value. Queries
+    per operation must not grow at all, as they don't depend on the machine.
+    """
+    regressions = []
+    baseline_operations = baseline.get("operations", {})
+    for name, summary in results["operations"].items():
+        expected = baseline_operations.get(name)
+        if expected is None:
+            continue
+        for key in ["queries_avg", "queries_max"]:
+            if summary[key] > expected[key]:
+                regressions.append(f"{name}: {key} {expected[key]} -> {summary[key]}")
+        for key in [f"p{pct}_ms" for pct in PERCENTILES]:
+            if summary[key] > expected[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {expected[key]} -> {summary[key]}")
+        if summary["errors"] > expected["errors"]:
+            regressions.append(
+                f"{name}: errors {expected['errors']} -> {summary['errors']}"
+            )
+    return regressions
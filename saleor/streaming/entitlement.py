@@ -0,0 +1,266 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from ..core.caching import CachePrefix, is_redis_cache
+from . import stream_settings
+from .models import AccessState, StreamTicket, TeamRestriction, TicketType
+
+if TYPE_CHECKING:
+    from ..account.models import User
+
+# ticket types are taken from the `ticket-type` attribute slugs
+SEASON_TICKET_TYPES = [TicketType.SEASON, TicketType.TIMED_SEASON, "timed-season"]
+
+ENTITLEMENT_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+@dataclass
+class StreamGame:
+    game_id: Optional[str] = None
+    video_id: Optional[str] = None
+    season_id: Optional[str] = None
+    league_id: Optional[str] = None
+    home_team_id: Optional[str] = None
+    guest_team_id: Optional[str] = None
+    start_time: Optional[datetime] = None
+
+
+@dataclass
+class StreamEntitlement:
+    """Cacheable snapshot of an active stream ticket."""
+
+    ticket_id: int
+    type: str
+    game_id: Optional[str] = None
+    video_id: Optional[str] = None
+    season_id: Optional[str] = None
+    league_ids: List[str] = field(default_factory=list)
+    team_ids: List[str] = field(default_factory=list)
+    team_restriction: str = TeamRestriction.ALLOW_BOTH
+    start_time: Optional[datetime] = None
+    expires: Optional[datetime] = None
+
+    @classmethod
+    def from_stream_ticket(cls, ticket: "StreamTicket") -> "StreamEntitlement":
+        return cls(
+            ticket_id=ticket.pk,
+            type=ticket.type,
+            game_id=ticket.game_id,
+            video_id=ticket.video_id,
+            season_id=ticket.season_id,
+            league_ids=list(ticket.league_id_list),
+            team_ids=list(ticket.team_id_list),
+            team_restriction=ticket.team_restriction,
+            start_time=ticket.start_time,
+            expires=ticket.expires,
+        )
+
+    def grants_access(self, game: "StreamGame", now: datetime) -> bool:
+        if self.expires is not None and self.expires <= now:
+            return False
+
+        if self.type == TicketType.SINGLE:
+            return bool(
+                (game.game_id and self.game_id == game.game_id)
+                or (game.video_id and self.video_id == game.video_id)
+            )
+        if self.type in SEASON_TICKET_TYPES:
+            return bool(
+                game.season_id
+                and self.season_id == game.season_id
+                and self.is_team_matching(game)
+            )
+        if self.type == TicketType.TIMED:
+            return bool(
+                game.league_id
+                and game.league_id in self.league_ids
+                and self.start_time is not None
+                and self.start_time <= (game.start_time or now)
+                and self.is_team_matching(game)
+            )
+        return False
+
+    def is_team_matching(self, game: "StreamGame") -> bool:
+        if not self.team_ids:
+            return True
+        if self.team_restriction == TeamRestriction.ALLOW_BOTH:
+            return game.home_team_id in self.team_ids or (
+                game.guest_team_id in self.team_ids
+            )
+        if self.team_restriction == TeamRestriction.HOME_ONLY:
+            return game.home_team_id in self.team_ids
+        if self.team_restriction == TeamRestriction.GUEST_ONLY:
+            return game.guest_team_id in self.team_ids
+        return False
+
+
+def has_access(
+    user: "User", game: "StreamGame", now: Optional[datetime] = None
+) -> Optional["StreamTicket"]:
+    """Return the ticket which grants the user access to the game.
+
+    The lookup is answered by a single query which uses the
+    (user, access_state, expires) index and the GIN indexes on the team and league
+    lists. Returns None if the user is not entitled to watch the game.
+    """
+    if user is None or not user.is_authenticated:
+        return None
+
+    now = now or timezone.now()
+    return (
+        get_active_stream_tickets(user.pk, now)
+        .filter(get_entitlement_lookup(game, now))
+        .first()
+    )
+
+
+def get_cached_entitlement(
+    user: "User", game: "StreamGame", now: Optional[datetime] = None
+) -> Optional["StreamEntitlement"]:
+    """Return the entitlement which grants the user access to the game.
+
+    Entitlements are read from the per user cache, which is rebuilt from the
+    database on a cache miss.
+    """
+    if user is None or not user.is_authenticated:
+        return None
+
+    now = now or timezone.now()
+    for entitlement in get_user_entitlements(user.pk, now):
+        if entitlement.grants_access(game, now):
+            return entitlement
+    return None
+
+
+def get_user_entitlements(user_id: int, now: datetime) -> List["StreamEntitlement"]:
+    if not is_redis_cache():
+        return load_user_entitlements(user_id, now)
+
+    entitlements = cache.get(get_entitlement_cache_key(user_id))
+
+    if entitlements is not None:
+        ENTITLEMENT_CACHE_STATS["hits"] += 1
+        return entitlements
+
+    ENTITLEMENT_CACHE_STATS["misses"] += 1
+    return cache_user_entitlements(user_id, now)
+
+
+def load_user_entitlements(user_id: int, now: datetime) -> List["StreamEntitlement"]:
+    return [
+        StreamEntitlement.from_stream_ticket(ticket)
+        for ticket in get_active_stream_tickets(user_id, now)
+    ]
+
+
+def cache_user_entitlements(
+    user_id: Optional[int], now: Optional[datetime] = None
+) -> List["StreamEntitlement"]:
+    """Rebuild the cached entitlements of the user.
+
+    The cache entry lives until the nearest ticket expires, so expired tickets
+    never have to be filtered out of a cached list.
+    """
+    if user_id is None:
+        return []
+
+    now = now or timezone.now()
+    entitlements = load_user_entitlements(user_id, now)
+
+    if is_redis_cache():
+        cache.set(
+            get_entitlement_cache_key(user_id),
+            entitlements,
+            timeout=get_entitlement_cache_timeout(entitlements, now),
+        )
+    return entitlements
+
+
+def invalidate_user_entitlements(user_ids: Iterable[Optional[int]]):
+    if not is_redis_cache():
+        return
+
+    keys = [get_entitlement_cache_key(user_id) for user_id in set(user_ids) if user_id]
+    if keys:
+        cache.delete_many(keys)
+
+
+def get_entitlement_cache_timeout(
+    entitlements: List["StreamEntitlement"], now: datetime
+) -> int:
+    timeout = stream_settings.ENTITLEMENT_CACHE_TIMEOUT
+    for entitlement in entitlements:
+        if entitlement.expires is not None:
+            seconds = int((entitlement.expires - now).total_seconds())
+            timeout = min(timeout, max(seconds, 1))
+    return timeout
+
+
+def get_entitlement_cache_key(user_id: int) -> str:
+    return f"{CachePrefix.STREAM_ENTITLEMENT}:{user_id}"
+
+
+def get_entitlement_cache_stats() -> dict:
+    return dict(ENTITLEMENT_CACHE_STATS)
+
+
+def get_active_stream_tickets(user_id: int, now: datetime):
+    return StreamTicket.objects.filter(
+        Q(expires__isnull=True) | Q(expires__gt=now),
+        user_id=user_id,
+        access_state=AccessState.ACTIVE,
+    )
+
+
+def get_entitlement_lookup(game: "StreamGame", now: datetime) -> Q:
+    lookup = Q(pk__in=[])
+
+    if game.game_id:
+        lookup |= Q(type=TicketType.SINGLE, game_id=game.game_id)
+    if game.video_id:
+        lookup |= Q(type=TicketType.SINGLE, video_id=game.video_id)
+    if game.season_id:
+        lookup |= (
+            Q(type__in=SEASON_TICKET_TYPES, season_id=game.season_id)
+            & get_team_lookup(game)
+        )
+    if game.league_id:
+        lookup |= (
+            Q(
+                type=TicketType.TIMED,
+                league_id_list__contains=[game.league_id],
+                start_time__lte=game.start_time or now,
+            )
+            & get_team_lookup(game)
+        )
+
+    return lookup
+
+
+def get_team_lookup(game: "StreamGame") -> Q:
+    # tickets without teams are valid for all teams
+    lookup = Q(team_id_list=[])
+    teams = [team for team in (game.home_team_id, game.guest_team_id) if team]
+
+    if teams:
+        lookup |= Q(
+            team_restriction=TeamRestriction.ALLOW_BOTH,
+            team_id_list__overlap=teams,
+        )
+    if game.home_team_id:
+        lookup |= Q(
+            team_restriction=TeamRestriction.HOME_ONLY,
+            team_id_list__contains=[game.home_team_id],
+        )
+    if game.guest_team_id:
+        lookup |= Q(
+            team_restriction=TeamRestriction.GUEST_ONLY,
+            team_id_list__contains=[game.guest_team_id],
+        )
+
+    return lookup
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from ... import stream_settings
+from ...archive import iter_archive_expired_stream_tickets
+
+
+class Command(BaseCommand):
+    help = "Move long expired stream tickets to the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=stream_settings.STREAM_TICKET_ARCHIVE_AFTER_DAYS,
+            help="Archive tickets which expired more than the given days ago.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=stream_settings.STREAM_TICKET_ARCHIVE_CHUNK_SIZE,
+            help="Number of tickets moved in a single transaction.",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for count in iter_archive_expired_stream_tickets(
+            options["days"], options["chunk_size"]
+        ):
+            total += count
+            self.stdout.write(f"Archived {total} stream tickets")
+
+        self.stdout.write(self.style.SUCCESS(f"Finished, archived {total} tickets"))
@@ -0,0 +1,151 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ....account.models import User
+from ....channel.models import Channel
+from ....core.utils.stream_data import create_gatling_test_user
+from ....product.models import ProductVariant
+from ...benchmark import StreamCheckoutBenchmark, compare_with_baseline
+
+DEFAULT_BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "benchmark_baseline.json",
+)
+
+
+def get_request_host() -> str:
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != "*"]
+    return hosts[0].lstrip(".") if hosts else "localhost"
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the stream ticket checkout and entitlement checks through the API "
+        "and compare their latency and queries with the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=20,
+            help="Number of Gatling test users going through the checkout.",
+        )
+        parser.add_argument(
+            "--entitlement-checks",
+            type=int,
+            default=10,
+            help="Number of entitlement checks per user after the checkout.",
+        )
+        parser.add_argument("--channel", help="Slug of the channel to buy in.")
+        parser.add_argument(
+            "--variant-sku",
+            help="SKU of the ticket, defaults to the first single ticket.",
+        )
+        parser.add_argument("--game-id", default="benchmark-game")
+        parser.add_argument("--gateway", default="mirumee.payments.dummy")
+        parser.add_argument("--payment-token", default="benchmark")
+        parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Store the results as the new baseline.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed latency growth as a fraction of the baseline.",
+        )
+        parser.add_argument(
+            "--keep-data",
+            action="store_true",
+            help="Keep the checkouts, orders and tickets instead of deleting them.",
+        )
+
+    def handle(self, *args, **options):
+        # flows are committed, so the callbacks run after the order is created
+        # are measured as well
+        benchmark, users = self.get_benchmark(options)
+        try:
+            results = benchmark.run(users)
+        finally:
+            if not options["keep_data"]:
+                benchmark.cleanup()
+
+        self.print_results(results)
+        if options["update_baseline"]:
+            with open(options["baseline"], "w") as baseline_file:
+                json.dump(results, baseline_file, indent=2, sort_keys=True)
+                baseline_file.write("\n")
+            self.stdout.write(f"Baseline stored in {options['baseline']}.")
+            return
+
+        if not os.path.exists(options["baseline"]):
+            self.stdout.write("No baseline found, run with --update-baseline.")
+            return
+        with open(options["baseline"]) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_with_baseline(results, baseline, options["tolerance"])
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            raise CommandError(f"Found {len(regressions)} regressions.")
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def get_benchmark(self, options):
+        channel = self.get_channel(options["channel"])
+        variant = self.get_variant(channel, options["variant_sku"])
+        for _ in create_gatling_test_user(options["users"]):
+            pass
+        users = (
+            User.objects.filter(email__startswith="gatling")
+            .select_related("default_billing_address")
+            .order_by("pk")[: options["users"]]
+        )
+
+        benchmark = StreamCheckoutBenchmark(
+            channel_slug=channel.slug,
+            variant=variant,
+            game_id=options["game_id"],
+            gateway=options["gateway"],
+            payment_token=options["payment_token"],
+            entitlement_checks=options["entitlement_checks"],
+            host=get_request_host(),
+        )
+        return benchmark, users
+
+    def get_channel(self, slug):
+        channels = Channel.objects.filter(is_active=True)
+        channel = channels.filter(slug=slug).first() if slug else channels.first()
+        if channel is None:
+            raise CommandError("No active channel found, run streamsetup first.")
+        return channel
+
+    def get_variant(self, channel, sku):
+        variants = ProductVariant.objects.filter(channel_listings__channel=channel)
+        if sku:
+            variants = variants.filter(sku=sku)
+        else:
+            variants = variants.filter(
+                product__attributes__assignment__attribute__slug="ticket-type",
+                product__attributes__values__slug="single",
+            )
+        variant = variants.first()
+        if variant is None:
+            raise CommandError("No ticket found, pass --variant-sku.")
+        return variant
+
+    def print_results(self, results):
+        columns = ["count", "errors", "p50_ms", "p95_ms", "p99_ms", "queries_avg"]
+        self.stdout.write(f"{'operation':<24}" + "".join(f"{c:>13}" for c in columns))
+        for name, summary in results["operations"].items():
+            self.stdout.write(
+                f"{name:<24}" + "".join(f"{summary[c]:>13}" for c in columns)
+            )
+        self.stdout.write(
+            f"{results['throughput_per_s']} operations/s in {results['elapsed_s']}s."
+        )
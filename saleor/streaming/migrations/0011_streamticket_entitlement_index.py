@@ -0,0 +1,48 @@
+# Generated by Django 3.2.12 on 2026-10-18 09:12
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('streaming', '0010_remove_streamticket_for_guests'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='streamticket',
+            name='league_id_list',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=256), blank=True, default=list, size=None),
+        ),
+        migrations.AddField(
+            model_name='streamticket',
+            name='team_id_list',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=256), blank=True, default=list, size=None),
+        ),
+        migrations.RunSQL("""
+            UPDATE streaming_streamticket
+            SET league_id_list = array_remove(
+                    string_to_array(replace(coalesce(league_ids, ''), ' ', ''), ','),
+                    ''
+                ),
+                team_id_list = array_remove(
+                    string_to_array(replace(coalesce(team_ids, ''), ' ', ''), ','),
+                    ''
+                )
+            """, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='streamticket',
+            index=models.Index(fields=['user', 'access_state', 'expires'], name='streaming_s_user_id_cbd80f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='streamticket',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['league_id_list'], name='streaming_s_league__d22144_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='streamticket',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['team_id_list'], name='streaming_s_team_id_10b30a_gin'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 3.2.12 on 2026-10-18 10:05
+
+from django.conf import settings
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+STREAM_TICKET_COLUMNS = """
+    id, type, user_id, order_id, access_code, version, stream_type, game_id,
+    video_id, season_id, league_ids, team_ids, league_id_list, team_id_list,
+    start_time, expires, hide_in_analytics, timed_type, team_restriction,
+    product_slug, access_state
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('order', '0116_auto_20211207_0705'),
+        ('streaming', '0011_streamticket_entitlement_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedStreamTicket',
+            fields=[
+                ('type', models.CharField(choices=[('SINGLE', 'single'), ('TIMED', 'timed'), ('SEASON', 'season'), ('TIMED_SEASON', 'timed_season')], max_length=256)),
+                ('access_code', models.CharField(blank=True, max_length=256, null=True)),
+                ('version', models.IntegerField(default=1)),
+                ('stream_type', models.CharField(max_length=256)),
+                ('game_id', models.CharField(blank=True, max_length=256, null=True)),
+                ('video_id', models.CharField(blank=True, max_length=256, null=True)),
+                ('season_id', models.CharField(blank=True, max_length=256, null=True)),
+                ('league_ids', models.CharField(blank=True, max_length=2048, null=True)),
+                ('team_ids', models.CharField(blank=True, max_length=2048, null=True)),
+                ('league_id_list', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=256), blank=True, default=list, size=None)),
+                ('team_id_list', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=256), blank=True, default=list, size=None)),
+                ('start_time', models.DateTimeField(blank=True, default=None, null=True)),
+                ('expires', models.DateTimeField(blank=True, default=None, null=True)),
+                ('hide_in_analytics', models.BooleanField(default=False)),
+                ('timed_type', models.CharField(default='none', max_length=256)),
+                ('team_restriction', models.CharField(choices=[('allow-both', 'allow-both'), ('home-only', 'home-only'), ('guest-only', 'guest-only')], default='home-only', max_length=256)),
+                ('product_slug', models.CharField(choices=[('single', 'single'), ('cup', 'cup'), ('season', 'season'), ('playoffs', 'playoffs'), ('regular-season', 'regular-season')], default=None, max_length=256, null=True)),
+                ('access_state', models.CharField(choices=[('active', 'active'), ('disabled', 'disabled'), ('fully-refunded', 'fully-refunded'), ('partially-refunded', 'partially-refunded')], default='active', max_length=256)),
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('order', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='order.order')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('expires',),
+            },
+        ),
+        # the view has to be recreated whenever the stream ticket columns change
+        migrations.RunSQL(
+            f"""
+            CREATE VIEW streaming_streamticket_history AS
+                SELECT {STREAM_TICKET_COLUMNS}, NULL::timestamptz AS archived_at
+                FROM streaming_streamticket
+                UNION ALL
+                SELECT {STREAM_TICKET_COLUMNS}, archived_at
+                FROM streaming_archivedstreamticket
+            """,
+            reverse_sql="DROP VIEW IF EXISTS streaming_streamticket_history",
+        ),
+    ]
@@ -1,3 +1,5 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 
 from ..account.models import User
@@ -60,7 +62,7 @@ class AccessState:
     ]
 
 
-class StreamTicket(models.Model):
+class BaseStreamTicket(models.Model):
     type = models.CharField(
         max_length=256,
         blank=False,
@@ -86,6 +88,13 @@ class StreamTicket(models.Model):
     season_id = models.CharField(max_length=256, blank=True, null=True)
     league_ids = models.CharField(max_length=2048, blank=True, null=True)
     team_ids = models.CharField(max_length=2048, blank=True, null=True)
+    # normalized copies of league_ids/team_ids used by the entitlement lookup
+    league_id_list = ArrayField(
+        models.CharField(max_length=256), blank=True, default=list
+    )
+    team_id_list = ArrayField(
+        models.CharField(max_length=256), blank=True, default=list
+    )
     start_time = models.DateTimeField(default=None, editable=True, blank=True,
                                       null=True)
     expires = models.DateTimeField(default=None, editable=True, blank=True, null=True)
@@ -108,5 +117,42 @@ class StreamTicket(models.Model):
         default="active"
     )
 
+    class Meta:
+        abstract = True
+
+
+class StreamTicket(BaseStreamTicket):
     class Meta:
         ordering = ("expires",)
+        indexes = [
+            models.Index(fields=["user", "access_state", "expires"]),
+            GinIndex(fields=["league_id_list"]),
+            GinIndex(fields=["team_id_list"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.league_id_list = split_ids(self.league_ids)
+        self.team_id_list = split_ids(self.team_ids)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields, "league_id_list", "team_id_list"
+            }
+        super().save(*args, **kwargs)
+
+
+class ArchivedStreamTicket(BaseStreamTicket):
+    """Stream ticket which expired long ago, moved out of the hot table."""
+
+    # archived tickets keep the id of the original stream ticket
+    id = models.IntegerField(primary_key=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("expires",)
+
+
+def split_ids(ids_string):
+    if not ids_string:
+        return []
+    return [value.strip() for value in ids_string.split(",") if value.strip()]
@@ -0,0 +1,104 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+
+from ..attribute.models import AssignedProductAttributeValue
+from ..core.caching import CachePrefix, get_cache_tag, is_redis_cache, tag_cache_key
+
+TEAMS_SLUG = 'teams'
+LEAGUES_SLUG = 'leagues'
+TICKET_TYPE_SLUG = 'ticket-type'
+PRODUCT_SLUG_SLUG = 'product-slug'
+TEAM_RESTRICTION_SLUG = 'team-restriction'
+STREAM_TYPE_SLUG = 'stream-type'
+
+STREAM_ATTRIBUTE_SLUGS = [
+    TEAMS_SLUG,
+    TICKET_TYPE_SLUG,
+    PRODUCT_SLUG_SLUG,
+    TEAM_RESTRICTION_SLUG,
+    STREAM_TYPE_SLUG,
+]
+
+
+@dataclass
+class StreamProductProfile:
+    """Stream attributes of a ticket product, resolved in a single query."""
+
+    product_id: int
+    stream_type: Optional[str] = None
+    ticket_type: Optional[str] = None
+    product_slug: Optional[str] = None
+    team_restriction: Optional[str] = None
+    # None if the product has no `teams` attribute assigned
+    team_slugs: Optional[List[str]] = field(default=None)
+
+    @property
+    def team_count(self) -> int:
+        return len(self.team_slugs or [])
+
+    @property
+    def is_restricted_to_teams(self) -> bool:
+        return bool(self.team_slugs) and self.team_slugs[0] != 'all-teams'
+
+
+def get_stream_product_profile(product_id: int) -> Optional["StreamProductProfile"]:
+    """Return the stream profile of a product or None if it is not a ticket.
+
+    Profiles are tagged with the product, so they are dropped together with the
+    other entries of the product by product and attribute mutations.
+    """
+    if not is_redis_cache():
+        return load_stream_product_profile(product_id)
+
+    key = get_stream_product_profile_cache_key(product_id)
+    profile = cache.get(key)
+    if profile is None:
+        profile = load_stream_product_profile(product_id)
+        if profile is not None:
+            cache.set(key, profile)
+            tag_cache_key(
+                key,
+                [
+                    get_cache_tag(CachePrefix.PRODUCT),
+                    get_cache_tag(CachePrefix.PRODUCT, product_id),
+                ],
+            )
+    return profile
+
+
+def load_stream_product_profile(product_id: int) -> Optional["StreamProductProfile"]:
+    values = (
+        AssignedProductAttributeValue.objects.filter(
+            assignment__product_id=product_id,
+            assignment__assignment__attribute__slug__in=STREAM_ATTRIBUTE_SLUGS,
+        )
+        .order_by("value__sort_order", "value__pk")
+        .values_list("assignment__assignment__attribute__slug", "value__slug")
+    )
+
+    values_by_attribute: Dict[str, List[str]] = defaultdict(list)
+    for attribute_slug, value_slug in values:
+        values_by_attribute[attribute_slug].append(value_slug)
+
+    if not values_by_attribute:
+        return None
+
+    return StreamProductProfile(
+        product_id=product_id,
+        stream_type=_first(values_by_attribute.get(STREAM_TYPE_SLUG)),
+        ticket_type=_first(values_by_attribute.get(TICKET_TYPE_SLUG)),
+        product_slug=_first(values_by_attribute.get(PRODUCT_SLUG_SLUG)),
+        team_restriction=_first(values_by_attribute.get(TEAM_RESTRICTION_SLUG)),
+        team_slugs=values_by_attribute.get(TEAMS_SLUG),
+    )
+
+
+def get_stream_product_profile_cache_key(product_id: int) -> str:
+    return f"{CachePrefix.STREAM_PRODUCT_PROFILE}:{product_id}"
+
+
+def _first(values: Optional[List[str]]) -> Optional[str]:
+    return values[0] if values else None
@@ -1,6 +1,7 @@
 import os
 import ast
 import os.path
+from datetime import timedelta
 
 from get_docker_secret import get_docker_secret
 
@@ -39,6 +40,17 @@ def add_backends(backends):
     backends.append("social_core.backends.facebook.FacebookOAuth2")
 
 
+def add_celery_beat_schedule(schedule):
+    schedule["archive-expired-stream-tickets"] = {
+        "task": "saleor.streaming.tasks.archive_expired_stream_tickets_task",
+        "schedule": timedelta(days=1),
+    }
+    schedule["flush-user-watch-logs"] = {
+        "task": "saleor.streaming.tasks.flush_user_watch_logs_task",
+        "schedule": timedelta(seconds=USER_WATCH_LOG_FLUSH_INTERVAL),
+    }
+
+
 def add_plugins(plugins):
     plugins.append("saleor.payment.gateways.paypal.plugin.PaypalGatewayPlugin")
     plugins.append("saleor.plugins.streaming.plugin.StreamingPlugin")
@@ -48,11 +60,29 @@ def add_plugins(plugins):
 MONTH_TICKET_DURATION_DAYS = 31
 DAY_TICKET_DURATION_DAYS = 1
 
+# Tickets expired for longer than this are moved to the archive table
+STREAM_TICKET_ARCHIVE_AFTER_DAYS = int(
+    os.environ.get("STREAM_TICKET_ARCHIVE_AFTER_DAYS", 90)
+)
+STREAM_TICKET_ARCHIVE_CHUNK_SIZE = int(
+    os.environ.get("STREAM_TICKET_ARCHIVE_CHUNK_SIZE", 1000)
+)
+
+# Upper bound for cached user entitlements, tickets expiring earlier shorten it
+ENTITLEMENT_CACHE_TIMEOUT = int(os.environ.get("ENTITLEMENT_CACHE_TIMEOUT", 60 * 60))
+
 DEFAULT_SENDER_NAME = os.environ.get("DEFAULT_SENDER_NAME", "")
 SUPPORT_EMAIL = os.environ.get("SUPPORT_EMAIL", None)
 
 APP_ID = os.environ.get("APP_ID", None)
 AWS_KINESIS_STREAM_NAME = os.environ.get("AWS_KINESIS_STREAM_NAME", None)
+AWS_KINESIS_MAX_RETRIES = int(os.environ.get("AWS_KINESIS_MAX_RETRIES", 3))
+# User watch logs are buffered in Redis and sent once the buffer holds
+# USER_WATCH_LOG_BATCH_SIZE logs or every USER_WATCH_LOG_FLUSH_INTERVAL seconds
+USER_WATCH_LOG_BATCH_SIZE = int(os.environ.get("USER_WATCH_LOG_BATCH_SIZE", 100))
+USER_WATCH_LOG_FLUSH_INTERVAL = int(
+    os.environ.get("USER_WATCH_LOG_FLUSH_INTERVAL", 10)
+)
 DEFAULT_CURRENCY = os.environ.get("DEFAULT_CURRENCY")
 
 # Invoicing
@@ -1,24 +1,22 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
 from django.core.exceptions import ValidationError
+from django.db import connection, transaction
 from django.utils.timezone import make_aware
 from graphql_relay import from_global_id
 
 from . import stream_settings
+from .entitlement import cache_user_entitlements, invalidate_user_entitlements
 from .models import StreamTicket, AccessState
+from .product_profile import get_stream_product_profile
 from ..checkout.models import Checkout
 from ..core.models import ModelWithMetadata
 from ..order.error_codes import OrderErrorCode
 from ..order.models import Order
 from ..payment import ChargeStatus
 from ..payment.models import Payment
-from ..product import models
-
-TEAMS_SLUG = 'teams'
-LEAGUES_SLUG = 'leagues'
-TICKET_TYPE_SLUG = 'ticket-type'
-PRODUCT_SLUG_SLUG = 'product-slug'
-TEAM_RESTRICTION_SLUG = 'team-restriction'
-STREAM_TYPE_SLUG = 'stream-type'
 
 INVALID_PRODUCT_CONFIGURATION_ERROR = ValidationError(
     "STREAM_PLUGIN: Invalid product configuration in checkout found.",
@@ -41,22 +39,20 @@ def create_stream_ticket_from_order(order: "Order") -> "StreamTicket":
 
     # load product reference from metadata
     _, product_id = from_global_id(global_product_id)
-    product = models.Product.objects.filter(id=product_id).first()
+    profile = get_stream_product_profile(int(product_id))
 
-    if product is None:
+    if profile is None:
         raise ValidationError("Cloud not find product during stream ticket creation")
 
     timed_type = 'none'
     start_time = None
     expires = None
 
-    attributes = product.attributes.all()
-
     # read attributes directly from product
-    stream_type = get_attribute_values(attributes, STREAM_TYPE_SLUG).first().slug
-    product_slug = get_attribute_values(attributes, PRODUCT_SLUG_SLUG).first().slug
-    ticket_type = get_attribute_values(attributes, TICKET_TYPE_SLUG).first().slug
-    team_restriction = get_attribute_values(attributes, TEAM_RESTRICTION_SLUG).first().slug
+    stream_type = profile.stream_type
+    product_slug = profile.product_slug
+    ticket_type = profile.ticket_type
+    team_restriction = profile.team_restriction
 
     if ticket_type == 'timed':
         timed_type = ticket_type
@@ -80,6 +76,10 @@ def create_stream_ticket_from_order(order: "Order") -> "StreamTicket":
     stream_ticket.team_restriction = team_restriction
     stream_ticket.save()
 
+    # a rolled back ticket must not grant access from the cache
+    user_id = stream_ticket.user_id
+    transaction.on_commit(lambda: cache_user_entitlements(user_id))
+
     return stream_ticket
 
 
@@ -112,36 +112,28 @@ def validate_stream_ticket_checkout(checkout: "Checkout", lines: "list"):
         start_time
     ) = get_stream_meta(checkout)
 
-    # there can only be one ticket per checkout. Tickets must have attributes
-    if len(lines) != 1 and lines[0].variant.product.attributes.count() == 0:
-        raise INVALID_PRODUCT_CONFIGURATION_ERROR
-
-    product = lines[0].variant.product
-    attributes = lines[0].variant.product.attributes.all()
+    product_id = lines[0].variant.product_id
+    profile = get_stream_product_profile(product_id)
 
-    ticket_type_attr = get_attribute_values(attributes, TICKET_TYPE_SLUG).first()
-    stream_type_attr = get_attribute_values(attributes, STREAM_TYPE_SLUG).first()
-
-    team_attr = get_attribute_values(attributes, TEAMS_SLUG)
+    # tickets must have stream attributes
+    if profile is None:
+        raise INVALID_PRODUCT_CONFIGURATION_ERROR
 
     do_attributes_match_type = True
     are_teams_matching = True
 
     # prevent teams from being altered in meta (single tickets do not need team-attr)
-    if ticket_type_attr.slug != 'single' \
-            and team_attr is not None \
-            and team_attr.first().slug != 'all-teams' \
-            and team_attr.count() > 0:
+    if profile.ticket_type != 'single' and profile.is_restricted_to_teams:
         are_teams_matching = team_ids_string is not None \
-                             and team_attr.count() == len(team_ids_string.split(','))
+                             and profile.team_count == len(team_ids_string.split(','))
 
     # check if stream type is matching with metadata
-    is_stream_type_matching = stream_type == 'g' and stream_type_attr.slug == 'game' \
-                              or stream_type == 'v' and stream_type_attr.slug == 'video'
+    is_stream_type_matching = stream_type == 'g' and profile.stream_type == 'game' \
+                              or stream_type == 'v' and profile.stream_type == 'video'
 
     # compare if ticket_type is matching with passed meta ids
     is_meta_matching = is_meta_matching_ticket_type(
-        ticket_type_attr.slug,
+        profile.ticket_type,
         game_id,
         video_id,
         season_id,
@@ -150,9 +142,9 @@ def validate_stream_ticket_checkout(checkout: "Checkout", lines: "list"):
         league_ids_string
     )
 
-    _, product_id = from_global_id(global_product_id)
+    _, meta_product_id = from_global_id(global_product_id)
 
-    is_product_matching = product.id == int(product_id)
+    is_product_matching = product_id == int(meta_product_id)
 
     if is_product_matching \
             and is_meta_matching \
@@ -205,19 +197,54 @@ def from_meta(key, meta_object: "ModelWithMetadata"):
     return meta_object.get_value_from_metadata(key)
 
 
-def get_attribute_values(attributes, slug: "str"):
-    for attr in attributes:
-        if attr.attribute.slug == slug:
-            return attr.values
+def update_stream_ticket_access_state(payment: "Payment"):
+    update_stream_tickets_access_state([payment])
 
 
-def update_stream_ticket_access_state(payment: "Payment"):
-    if payment.order:
+def update_stream_tickets_access_state(payments: Iterable["Payment"]) -> Dict[int, int]:
+    """Update the access state of the stream tickets of many payments at once.
+
+    Tickets are updated with one query per access state and the entitlements of
+    every affected user are invalidated once. The updated tickets are counted
+    from the rows returned by the updates. Returns the number of updated tickets
+    per order id.
+    """
+    access_states = _get_access_states_by_order(payments)
+
+    if not access_states:
+        return {}
+
+    order_ids_by_state = defaultdict(list)
+    for order_id, access_state in access_states.items():
+        order_ids_by_state[access_state].append(order_id)
+
+    updated_tickets: Dict[int, int] = defaultdict(int)
+    user_ids = set()
+    for access_state, order_ids in order_ids_by_state.items():
+        for order_id, user_id in _update_access_state(order_ids, access_state):
+            updated_tickets[order_id] += 1
+            user_ids.add(user_id)
+
+    # the cache is dropped after the commit, so it can't be refilled with the
+    # tickets still active
+    transaction.on_commit(lambda: invalidate_user_entitlements(user_ids))
+
+    return dict(updated_tickets)
+
+
+def _get_access_states_by_order(payments: Iterable["Payment"]) -> Dict[int, str]:
+    access_states: Dict[int, str] = {}
+
+    for payment in payments:
         access_state = _get_access_state_from_payment(payment)
 
-        if access_state is not None:
-            stream_tickets = StreamTicket.objects.filter(order_id=payment.order.pk)
-            _update_access_state(stream_tickets, access_state)
+        if payment.order_id is None or access_state is None:
+            continue
+        # a full refund of any payment revokes the access to the whole order
+        if access_states.get(payment.order_id) != AccessState.FULLY_REFUNDED:
+            access_states[payment.order_id] = access_state
+
+    return access_states
 
 
 def _get_access_state_from_payment(payment: "Payment") -> AccessState:
@@ -231,7 +258,17 @@ def _get_access_state_from_payment(payment: "Payment") -> AccessState:
     return access_state
 
 
-def _update_access_state(stream_tickets, access_state: "AccessState"):
-    for ticket in stream_tickets:
-        ticket.access_state = access_state
-        ticket.save()
+def _update_access_state(
+    order_ids: List[int], access_state: "AccessState"
+) -> List[Tuple[int, Optional[int]]]:
+    """Update the tickets of the orders, return their order and user ids."""
+    query = f"""
+        UPDATE {StreamTicket._meta.db_table}
+        SET access_state = %s
+        WHERE order_id = ANY(%s)
+        RETURNING order_id, user_id
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, [access_state, order_ids])
+        return cursor.fetchall()
@@ -0,0 +1,52 @@
+from typing import List
+
+from celery.utils.log import get_task_logger
+
+from ..celeryconf import app
+from ..core.caching import is_redis_cache
+from . import stream_settings
+from .archive import archive_expired_stream_tickets
+from .user_watch_log import (
+    KINESIS_MAX_BATCH_SIZE,
+    buffer_user_watch_log,
+    pop_buffered_user_watch_logs,
+    user_watch_log_producer,
+)
+
+task_logger = get_task_logger(__name__)
+
+
+@app.task
+def send_user_watch_logs_task(user_watch_logs: List[dict]):
+    user_watch_log_producer.send(user_watch_logs)
+
+
+@app.task
+def flush_user_watch_logs_task():
+    """Send the buffered user watch logs in batches of up to 500 records."""
+    while user_watch_logs := pop_buffered_user_watch_logs(KINESIS_MAX_BATCH_SIZE):
+        user_watch_log_producer.send(user_watch_logs)
+        if len(user_watch_logs) < KINESIS_MAX_BATCH_SIZE:
+            break
+
+
+def enqueue_user_watch_log(user_watch_log: dict):
+    """Buffer the log to be sent together with the logs of other orders.
+
+    The buffer is flushed once it holds `USER_WATCH_LOG_BATCH_SIZE` logs and
+    periodically by the beat. Without Redis the log is sent on its own.
+    """
+    if not is_redis_cache():
+        send_user_watch_logs_task.delay([user_watch_log])
+        return
+
+    size = buffer_user_watch_log(user_watch_log)
+    if size == stream_settings.USER_WATCH_LOG_BATCH_SIZE:
+        flush_user_watch_logs_task.delay()
+
+
+@app.task
+def archive_expired_stream_tickets_task():
+    count = archive_expired_stream_tickets()
+    if count:
+        task_logger.info("Archived %s expired stream tickets", count)
@@ -0,0 +1,20 @@
+import pytest
+
+from ....streaming.entitlement import StreamGame, has_access
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_has_access(stream_setup_users, count_queries):
+    game = StreamGame(game_id="14", season_id="seasonId", home_team_id="team1")
+
+    for user in stream_setup_users:
+        assert has_access(user, game) is not None
+
+
+@pytest.mark.django_db
+def test_has_access_uses_single_query(stream_setup_users, django_assert_num_queries):
+    game = StreamGame(game_id="14", season_id="seasonId", league_id="league1")
+
+    with django_assert_num_queries(1):
+        assert has_access(stream_setup_users[0], game) is not None
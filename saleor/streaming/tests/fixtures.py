@@ -1,13 +1,18 @@
 import graphene
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from django.utils import timezone
+
+from saleor.account.models import User
 from saleor.attribute import AttributeType
 from saleor.attribute.models import Attribute, AttributeValue
 from saleor.attribute.utils import associate_attribute_values_to_instance
 from saleor.checkout.models import Checkout, CheckoutLine
+from saleor.core.utils.stream_data import create_gatling_test_user, create_stream_ticket
 from saleor.order.models import Order
 from saleor.product.models import Product, ProductVariant
+from saleor.streaming.models import StreamTicket, TeamRestriction
 
 
 @pytest.fixture
@@ -242,3 +247,42 @@ def create_attribute(name, value, date_time=None):
     )
 
     return attribute
+
+
+@pytest.fixture
+def stream_setup_users():
+    list(create_gatling_test_user(20))
+    users = list(User.objects.filter(email__startswith="gatling"))
+
+    for user in users:
+        create_stream_ticket(user)
+
+    return users
+
+
+@pytest.fixture
+def season_stream_ticket(customer_user):
+    return StreamTicket.objects.create(
+        user=customer_user,
+        type="season",
+        stream_type="Game",
+        season_id="seasonId",
+        team_ids="team1,team2",
+        team_restriction=TeamRestriction.HOME_ONLY,
+        product_slug="cup",
+    )
+
+
+@pytest.fixture
+def timed_stream_ticket(customer_user):
+    start_time = timezone.now() - timedelta(days=1)
+    return StreamTicket.objects.create(
+        user=customer_user,
+        type="timed",
+        stream_type="Game",
+        league_ids="league1,league2",
+        start_time=start_time,
+        expires=start_time + timedelta(days=31),
+        timed_type="timed",
+        product_slug="regular-season",
+    )
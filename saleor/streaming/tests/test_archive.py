@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from ...core.utils.stream_data import create_stream_ticket
+from ...streaming.archive import (
+    STREAM_TICKET_HISTORY_VIEW,
+    archive_expired_stream_tickets,
+)
+from ...streaming.models import ArchivedStreamTicket, StreamTicket
+
+
+def create_expired_stream_tickets(user, days, count):
+    tickets = [create_stream_ticket(user, game_id=f"game{i}") for i in range(count)]
+    StreamTicket.objects.filter(pk__in=[ticket.pk for ticket in tickets]).update(
+        expires=timezone.now() - timedelta(days=days)
+    )
+    return tickets
+
+
+def test_archive_expired_stream_tickets(customer_user):
+    old_tickets = create_expired_stream_tickets(customer_user, days=100, count=5)
+    recent_tickets = create_expired_stream_tickets(customer_user, days=10, count=2)
+    active_ticket = create_stream_ticket(customer_user)
+
+    count = archive_expired_stream_tickets(older_than_days=90, chunk_size=2)
+
+    assert count == 5
+    assert set(StreamTicket.objects.values_list("pk", flat=True)) == {
+        *[ticket.pk for ticket in recent_tickets],
+        active_ticket.pk,
+    }
+    archived_tickets = ArchivedStreamTicket.objects.all()
+    assert {ticket.pk for ticket in archived_tickets} == {
+        ticket.pk for ticket in old_tickets
+    }
+    assert all(ticket.user_id == customer_user.pk for ticket in archived_tickets)
+    assert all(ticket.archived_at for ticket in archived_tickets)
+
+
+def test_stream_ticket_history_view(customer_user):
+    create_expired_stream_tickets(customer_user, days=100, count=3)
+    create_stream_ticket(customer_user)
+    archive_expired_stream_tickets(older_than_days=90)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT count(*), count(archived_at) FROM {STREAM_TICKET_HISTORY_VIEW}"
+        )
+        assert cursor.fetchone() == (4, 3)
+
+
+def test_archive_stream_tickets_command(customer_user):
+    create_expired_stream_tickets(customer_user, days=10, count=2)
+
+    call_command("archive_stream_tickets", "--days", "5", "--chunk-size", "1")
+
+    assert not StreamTicket.objects.exists()
+    assert ArchivedStreamTicket.objects.count() == 2
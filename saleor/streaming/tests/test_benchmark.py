@@ -0,0 +1,116 @@
+import pytest
+from django.test import TestCase
+
+from ...order.models import Order
+from ...streaming.benchmark import (
+    OperationStats,
+    StreamCheckoutBenchmark,
+    compare_with_baseline,
+    percentile,
+)
+from ...streaming.entitlement import StreamGame, has_access
+from ...streaming.models import StreamTicket
+
+
+def test_percentile():
+    values = [0.1 * i for i in range(1, 101)]
+
+    assert percentile(values, 50) == pytest.approx(5.0)
+    assert percentile(values, 95) == pytest.approx(9.5)
+    assert percentile(values, 99) == pytest.approx(9.9)
+    assert percentile([], 50) == 0.0
+
+
+def test_operation_stats_summary():
+    stats = OperationStats()
+    stats.add(0.01, 3, failed=False)
+    stats.add(0.03, 5, failed=True)
+
+    summary = stats.summary()
+
+    assert summary["count"] == 2
+    assert summary["errors"] == 1
+    assert summary["queries_avg"] == 4
+    assert summary["queries_max"] == 5
+    assert summary["p50_ms"] == 10.0
+    assert summary["p99_ms"] == 30.0
+    assert summary["throughput_per_s"] == 50.0
+
+
+def test_compare_with_baseline():
+    baseline_summary = {
+        "errors": 0,
+        "queries_avg": 10,
+        "queries_max": 10,
+        "p50_ms": 10.0,
+        "p95_ms": 20.0,
+        "p99_ms": 30.0,
+    }
+    baseline = {"operations": {"checkoutComplete": baseline_summary}}
+    results = {
+        "operations": {
+            "checkoutComplete": {
+                **baseline_summary,
+                "queries_max": 11,
+                "p95_ms": 23.0,
+                "p99_ms": 40.0,
+            },
+            "checkoutCreate": baseline_summary,
+        }
+    }
+
+    regressions = compare_with_baseline(results, baseline, tolerance=0.2)
+
+    assert regressions == [
+        "checkoutComplete: queries_max 10 -> 11",
+        "checkoutComplete: p99_ms 30.0 -> 40.0",
+    ]
+
+
+def test_benchmark_measure_records_queries(customer_user, variant, channel_USD):
+    benchmark = StreamCheckoutBenchmark(
+        channel_slug=channel_USD.slug,
+        variant=variant,
+        game_id="game1",
+        gateway="mirumee.payments.dummy",
+        payment_token="token",
+    )
+    game = StreamGame(game_id="game1")
+
+    benchmark.measure("hasAccess", lambda: has_access(customer_user, game))
+
+    stats = benchmark.stats["hasAccess"]
+    assert stats.queries == [1]
+    assert stats.errors == 0
+
+
+def test_benchmark_user_flow_grants_access(
+    customer_user, single_ticket_product, channel_USD, settings
+):
+    settings.PLUGINS += ["saleor.plugins.streaming.plugin.StreamingPlugin"]
+    product_type = single_ticket_product.product_type
+    product_type.is_shipping_required = False
+    product_type.save(update_fields=["is_shipping_required"])
+    benchmark = StreamCheckoutBenchmark(
+        channel_slug=channel_USD.slug,
+        variant=single_ticket_product.variants.get(),
+        game_id="game1",
+        gateway="mirumee.payments.dummy",
+        payment_token="token",
+        entitlement_checks=1,
+    )
+
+    # the ticket is created by the order callbacks run after the commit
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        results = benchmark.run([customer_user])
+
+    operations = results["operations"]
+    assert operations["checkoutComplete"]["errors"] == 0
+    ticket = has_access(customer_user, StreamGame(game_id="game1"))
+    assert ticket is not None
+    assert ticket.order.token in benchmark.order_tokens
+
+    benchmark.cleanup()
+
+    assert not StreamTicket.objects.filter(pk=ticket.pk).exists()
+    assert not Order.objects.filter(pk=ticket.order_id).exists()
@@ -0,0 +1,191 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from ...core.utils.stream_data import create_stream_ticket
+from ...payment import ChargeStatus
+from ...streaming import stream_settings
+from ...streaming.entitlement import (
+    StreamEntitlement,
+    StreamGame,
+    get_cached_entitlement,
+    get_entitlement_cache_key,
+    get_entitlement_cache_stats,
+    get_entitlement_cache_timeout,
+    has_access,
+)
+from ...streaming.models import AccessState, StreamTicket
+from ...streaming.stream_ticket import (
+    create_stream_ticket_from_order,
+    update_stream_ticket_access_state,
+)
+
+
+def test_has_access_single_ticket(customer_user):
+    stream_ticket = create_stream_ticket(customer_user, game_id="game1")
+
+    assert has_access(customer_user, StreamGame(game_id="game1")) == stream_ticket
+    assert has_access(customer_user, StreamGame(game_id="game2")) is None
+
+
+def test_has_access_ignores_refunded_ticket(customer_user):
+    stream_ticket = create_stream_ticket(customer_user, game_id="game1")
+    stream_ticket.access_state = AccessState.FULLY_REFUNDED
+    stream_ticket.save()
+
+    assert has_access(customer_user, StreamGame(game_id="game1")) is None
+
+
+def test_has_access_ignores_expired_ticket(customer_user):
+    stream_ticket = create_stream_ticket(customer_user, game_id="game1")
+    stream_ticket.expires = timezone.now() - timedelta(minutes=1)
+    stream_ticket.save()
+
+    assert has_access(customer_user, StreamGame(game_id="game1")) is None
+
+
+def test_has_access_ignores_other_user(customer_user, staff_user):
+    create_stream_ticket(staff_user, game_id="game1")
+
+    assert has_access(customer_user, StreamGame(game_id="game1")) is None
+
+
+def test_has_access_season_ticket_home_only(season_stream_ticket):
+    user = season_stream_ticket.user
+    home_game = StreamGame(
+        game_id="game1",
+        season_id="seasonId",
+        home_team_id="team1",
+        guest_team_id="team3",
+    )
+    guest_game = StreamGame(
+        game_id="game2",
+        season_id="seasonId",
+        home_team_id="team3",
+        guest_team_id="team1",
+    )
+
+    assert has_access(user, home_game) == season_stream_ticket
+    assert has_access(user, guest_game) is None
+
+
+def test_has_access_season_ticket_for_all_teams(customer_user):
+    stream_ticket = StreamTicket.objects.create(
+        user=customer_user,
+        type="timed-season",
+        stream_type="Game",
+        season_id="seasonId",
+        team_ids="",
+    )
+    game = StreamGame(
+        game_id="game1",
+        season_id="seasonId",
+        home_team_id="team1",
+        guest_team_id="team2",
+    )
+
+    assert stream_ticket.team_id_list == []
+    assert has_access(customer_user, game) == stream_ticket
+
+
+def test_has_access_timed_ticket(timed_stream_ticket):
+    user = timed_stream_ticket.user
+    game = StreamGame(game_id="game1", league_id="league2", start_time=timezone.now())
+
+    assert timed_stream_ticket.league_id_list == ["league1", "league2"]
+    assert has_access(user, game) == timed_stream_ticket
+    assert has_access(user, StreamGame(game_id="game1", league_id="league3")) is None
+
+
+def test_has_access_timed_ticket_before_start(timed_stream_ticket):
+    user = timed_stream_ticket.user
+    game = StreamGame(
+        game_id="game1",
+        league_id="league1",
+        start_time=timed_stream_ticket.start_time - timedelta(days=1),
+    )
+
+    assert has_access(user, game) is None
+
+
+@pytest.fixture
+def entitlement_cache(monkeypatch):
+    monkeypatch.setattr(
+        "saleor.streaming.entitlement.is_redis_cache", lambda: True
+    )
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+def test_get_cached_entitlement_miss_and_hit(
+    customer_user, entitlement_cache, django_assert_num_queries
+):
+    stream_ticket = create_stream_ticket(customer_user, game_id="game1")
+    entitlement_cache.clear()
+    stats = get_entitlement_cache_stats()
+    game = StreamGame(game_id="game1")
+
+    with django_assert_num_queries(1):
+        entitlement = get_cached_entitlement(customer_user, game)
+    with django_assert_num_queries(0):
+        cached_entitlement = get_cached_entitlement(customer_user, game)
+
+    assert entitlement.ticket_id == stream_ticket.pk
+    assert cached_entitlement == entitlement
+    assert get_entitlement_cache_stats()["misses"] == stats["misses"] + 1
+    assert get_entitlement_cache_stats()["hits"] == stats["hits"] + 1
+
+
+def test_create_stream_ticket_fills_entitlement_cache(
+    single_ticket_order, entitlement_cache
+):
+    key = get_entitlement_cache_key(single_ticket_order.user_id)
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        stream_ticket = create_stream_ticket_from_order(single_ticket_order)
+        # the ticket isn't cached before the transaction is committed
+        assert entitlement_cache.get(key) is None
+
+    entitlements = entitlement_cache.get(key)
+    assert [entitlement.ticket_id for entitlement in entitlements] == [
+        stream_ticket.pk
+    ]
+
+
+def test_refund_invalidates_entitlement_cache(
+    single_ticket_order, payment_dummy, entitlement_cache
+):
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        create_stream_ticket_from_order(single_ticket_order)
+    key = get_entitlement_cache_key(single_ticket_order.user_id)
+    assert entitlement_cache.get(key)
+    payment_dummy.order = single_ticket_order
+    payment_dummy.charge_status = ChargeStatus.FULLY_REFUNDED
+
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        update_stream_ticket_access_state(payment_dummy)
+        # the refund isn't committed yet
+        assert entitlement_cache.get(key)
+
+    assert entitlement_cache.get(key) is None
+    assert get_cached_entitlement(
+        single_ticket_order.user, StreamGame(game_id="gameId")
+    ) is None
+
+
+def test_entitlement_cache_timeout_follows_nearest_expires(
+    timed_stream_ticket, season_stream_ticket
+):
+    now = timezone.now()
+    entitlements = [
+        StreamEntitlement.from_stream_ticket(timed_stream_ticket),
+        StreamEntitlement.from_stream_ticket(season_stream_ticket),
+    ]
+
+    timeout = get_entitlement_cache_timeout(entitlements, now)
+
+    expected = int((timed_stream_ticket.expires - now).total_seconds())
+    assert timeout == min(expected, stream_settings.ENTITLEMENT_CACHE_TIMEOUT)
@@ -0,0 +1,60 @@
+from django.core.cache import cache
+
+from ...core.caching import CachePrefix
+from ...streaming.product_profile import (
+    get_stream_product_profile,
+    get_stream_product_profile_cache_key,
+    load_stream_product_profile,
+)
+from ...streaming.stream_ticket import validate_stream_ticket_checkout
+
+
+def test_load_stream_product_profile(team_timed_season_ticket_product):
+    profile = load_stream_product_profile(team_timed_season_ticket_product.pk)
+
+    assert profile.stream_type == 'game'
+    assert profile.ticket_type == 'timed-season'
+    assert profile.product_slug == 'regular-season'
+    assert profile.team_restriction == 'allow-both'
+    assert profile.team_slugs == ['team1', 'team2']
+    assert profile.team_count == 2
+    assert profile.is_restricted_to_teams
+
+
+def test_load_stream_product_profile_for_all_teams(season_ticket_product):
+    profile = load_stream_product_profile(season_ticket_product.pk)
+
+    assert profile.team_slugs == ['all-teams']
+    assert not profile.is_restricted_to_teams
+
+
+def test_load_stream_product_profile_without_attributes(product):
+    assert load_stream_product_profile(product.pk) is None
+
+
+def test_validate_stream_ticket_checkout_uses_single_query(
+    team_timed_season_ticket_checkout, django_assert_num_queries
+):
+    [checkout, lines] = team_timed_season_ticket_checkout
+
+    with django_assert_num_queries(1):
+        assert validate_stream_ticket_checkout(checkout, lines) is True
+
+
+def test_get_stream_product_profile_is_cached(
+    single_ticket_product, monkeypatch, django_assert_num_queries
+):
+    monkeypatch.setattr(
+        "saleor.streaming.product_profile.is_redis_cache", lambda: True
+    )
+    cache.delete(get_stream_product_profile_cache_key(single_ticket_product.pk))
+
+    with django_assert_num_queries(1):
+        profile = get_stream_product_profile(single_ticket_product.pk)
+    with django_assert_num_queries(0):
+        cached_profile = get_stream_product_profile(single_ticket_product.pk)
+
+    assert cached_profile == profile
+    assert get_stream_product_profile_cache_key(single_ticket_product.pk).startswith(
+        f"{CachePrefix.PRODUCT}:"
+    )
@@ -5,8 +5,12 @@ import graphene
 import pytest
 
 from ...order.models import Order
+from ...payment import ChargeStatus
+from ...payment.models import Payment
+from ...streaming.models import AccessState, StreamTicket
 from ...streaming.stream_ticket import (
-    create_stream_ticket_from_order, validate_stream_ticket_checkout,
+    create_stream_ticket_from_order, update_stream_tickets_access_state,
+    validate_stream_ticket_checkout,
 )
 
 now_string = '%d' % datetime.utcnow().timestamp()
@@ -88,3 +92,50 @@ def test_team_timed_season_ticket_validation(team_timed_season_ticket_checkout):
     )
 
     assert actual is True
+
+
+def test_update_stream_tickets_access_state(
+    order_list, customer_user, django_assert_num_queries
+):
+    for order in order_list:
+        StreamTicket.objects.create(
+            user=customer_user, order=order, type="single", stream_type="Game"
+        )
+    StreamTicket.objects.create(
+        user=customer_user, order=order_list[0], type="single", stream_type="Game"
+    )
+    payments = [
+        Payment(order=order_list[0], charge_status=ChargeStatus.FULLY_REFUNDED),
+        Payment(order=order_list[1], charge_status=ChargeStatus.PARTIALLY_REFUNDED),
+        Payment(order=order_list[2], charge_status=ChargeStatus.FULLY_CHARGED),
+    ]
+
+    with django_assert_num_queries(2):
+        updated_tickets = update_stream_tickets_access_state(payments)
+
+    assert updated_tickets == {order_list[0].pk: 2, order_list[1].pk: 1}
+    access_states = dict(
+        StreamTicket.objects.values_list("order_id", "access_state").distinct()
+    )
+    assert access_states == {
+        order_list[0].pk: AccessState.FULLY_REFUNDED,
+        order_list[1].pk: AccessState.PARTIALLY_REFUNDED,
+        order_list[2].pk: AccessState.ACTIVE,
+    }
+
+
+def test_update_stream_tickets_access_state_prefers_full_refund(
+    order, customer_user
+):
+    StreamTicket.objects.create(
+        user=customer_user, order=order, type="single", stream_type="Game"
+    )
+    payments = [
+        Payment(order=order, charge_status=ChargeStatus.FULLY_REFUNDED),
+        Payment(order=order, charge_status=ChargeStatus.PARTIALLY_REFUNDED),
+    ]
+
+    update_stream_tickets_access_state(payments)
+
+    ticket = StreamTicket.objects.get(order=order)
+    assert ticket.access_state == AccessState.FULLY_REFUNDED
@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ...plugins.manager import get_plugins_manager
+from ...streaming.tasks import enqueue_user_watch_log, flush_user_watch_logs_task
+from ...streaming.user_watch_log import (
+    UserWatchLogProducer,
+    buffer_user_watch_log,
+    create_user_watch_log_from_stream_ticket,
+    pop_buffered_user_watch_logs,
+)
+
+
+class FakeKinesisClient:
+    def __init__(self, failures=None):
+        self.failures = failures or []
+        self.calls = []
+
+    def put_records(self, StreamName, Records):
+        self.calls.append(Records)
+        failed = self.failures.pop(0) if self.failures else 0
+        results = [{"ErrorCode": "ProvisionedThroughputExceededException"}] * failed
+        results += [{"SequenceNumber": "1", "ShardId": "1"}] * (len(Records) - failed)
+        return {"FailedRecordCount": failed, "Records": results}
+
+
+@pytest.fixture
+def credentials():
+    return {
+        "AccessKeyId": "key",
+        "SecretKey": "secret",
+        "SessionToken": "token",
+        "Expiration": datetime.now(tz=timezone.utc) + timedelta(hours=1),
+    }
+
+
+@pytest.fixture
+def mocked_aws(credentials):
+    def _mocked_aws(client):
+        retrieve_credentials = patch(
+            "saleor.streaming.user_watch_log.retrieve_cognito_credentials",
+            return_value=credentials,
+        )
+        create_client = patch(
+            "saleor.streaming.user_watch_log.create_kinesis_client",
+            return_value=client,
+        )
+        return retrieve_credentials, create_client
+
+    return _mocked_aws
+
+
+def test_producer_sends_logs_in_batches(mocked_aws):
+    client = FakeKinesisClient()
+    retrieve_credentials, create_client = mocked_aws(client)
+    producer = UserWatchLogProducer(batch_size=2, retry_backoff=0)
+
+    with retrieve_credentials as mocked_credentials, create_client:
+        producer.send([{"gameId": str(i)} for i in range(5)])
+
+    assert [len(records) for records in client.calls] == [2, 2, 1]
+    mocked_credentials.assert_called_once()
+
+
+def test_producer_retries_failed_records(mocked_aws):
+    client = FakeKinesisClient(failures=[2, 1])
+    retrieve_credentials, create_client = mocked_aws(client)
+    producer = UserWatchLogProducer(retry_backoff=0)
+
+    with retrieve_credentials, create_client:
+        producer.send([{"gameId": str(i)} for i in range(3)])
+
+    assert [len(records) for records in client.calls] == [3, 2, 1]
+
+
+def test_producer_refreshes_expired_credentials(mocked_aws, credentials):
+    credentials["Expiration"] = datetime.now(tz=timezone.utc)
+    client = FakeKinesisClient()
+    retrieve_credentials, create_client = mocked_aws(client)
+    producer = UserWatchLogProducer(retry_backoff=0)
+
+    with retrieve_credentials as mocked_credentials, create_client:
+        producer.send([{"gameId": "1"}])
+        producer.send([{"gameId": "2"}])
+
+    assert mocked_credentials.call_count == 2
+
+
+def test_pop_buffered_user_watch_logs_in_order(redis_client):
+    for game_id in "123":
+        buffer_user_watch_log({"gameId": game_id})
+
+    assert pop_buffered_user_watch_logs(2) == [{"gameId": "1"}, {"gameId": "2"}]
+    assert pop_buffered_user_watch_logs(2) == [{"gameId": "3"}]
+    assert pop_buffered_user_watch_logs(2) == []
+
+
+@patch("saleor.streaming.tasks.flush_user_watch_logs_task.delay")
+def test_enqueue_user_watch_log_flushes_full_buffer(
+    mocked_flush, redis_client, monkeypatch
+):
+    monkeypatch.setattr("saleor.streaming.stream_settings.USER_WATCH_LOG_BATCH_SIZE", 2)
+
+    enqueue_user_watch_log({"gameId": "1"})
+    mocked_flush.assert_not_called()
+    enqueue_user_watch_log({"gameId": "2"})
+
+    mocked_flush.assert_called_once_with()
+
+
+@patch("saleor.streaming.tasks.send_user_watch_logs_task.delay")
+def test_enqueue_user_watch_log_without_redis(mocked_send):
+    enqueue_user_watch_log({"gameId": "1"})
+
+    mocked_send.assert_called_once_with([{"gameId": "1"}])
+
+
+@patch("saleor.streaming.tasks.user_watch_log_producer.send")
+def test_flush_user_watch_logs_task_sends_buffered_logs(
+    mocked_send, redis_client
+):
+    for game_id in "12":
+        buffer_user_watch_log({"gameId": game_id})
+
+    flush_user_watch_logs_task()
+
+    mocked_send.assert_called_once_with([{"gameId": "1"}, {"gameId": "2"}])
+    assert pop_buffered_user_watch_logs(10) == []
+
+
+@patch("saleor.streaming.tasks.flush_user_watch_logs_task.delay")
+def test_order_created_buffers_user_watch_log(
+    mocked_flush, single_ticket_order, settings, redis_client
+):
+    settings.PLUGINS = ["saleor.plugins.streaming.plugin.StreamingPlugin"]
+
+    get_plugins_manager().order_created(single_ticket_order)
+
+    [user_watch_log] = pop_buffered_user_watch_logs(10)
+    assert user_watch_log["gameId"] == "gameId"
+
+
+def test_user_watch_log_only_for_single_tickets():
+    stream_ticket = MagicMock(game_id=None)
+
+    assert create_user_watch_log_from_stream_ticket(stream_ticket) is None
@@ -1,40 +1,134 @@
-import datetime
-
-import boto3
-import graphene
 import json
-import boto3.exceptions
 import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 
+import boto3
+import graphene
+from botocore.exceptions import BotoCoreError, ClientError
+from django.core.cache import cache
 from django.core.management.utils import get_random_secret_key
 
 from .models import StreamTicket
+from ..core.caching import CachePrefix, get_redis_client
 from ..streaming import stream_settings
-from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# maximum number of records accepted by a single Kinesis PutRecords call
+KINESIS_MAX_BATCH_SIZE = 500
+CREDENTIALS_EXPIRATION_MARGIN = timedelta(minutes=1)
 
-def create_user_watch_log_from_stream_ticket(stream_ticket: "StreamTicket"):
+
+def create_user_watch_log_from_stream_ticket(
+    stream_ticket: "StreamTicket",
+) -> Optional[dict]:
     # user watch logs will only be created for single tickets
     if stream_ticket.game_id is not None:
-        send_user_watch_log_to_kinesis_stream(stream_ticket)
-
-
-def send_user_watch_log_to_kinesis_stream(stream_ticket: "StreamTicket"):
-    try:
-        credentials = retrieve_cognito_credentials()
-        kinesis = create_kinesis_client(credentials)
-        user_watch_log = create_user_watch_log(stream_ticket)
-        put_stream_record(kinesis, user_watch_log)
-    except Exception as exc:
-        logger.exception(
-            f"[AWS Kinesis] Couldn't create user watch log "
-            f"for stream_ticket={stream_ticket.id}",
-            exc_info=exc
+        return create_user_watch_log(stream_ticket)
+    return None
+
+
+class UserWatchLogProducer:
+    """Send user watch logs to Kinesis in batches.
+
+    Cognito credentials and the Kinesis client are reused until the credentials
+    are about to expire. Logs of many orders are collected in a buffer shared by
+    all processes, see `buffer_user_watch_log`.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = KINESIS_MAX_BATCH_SIZE,
+        max_retries: int = stream_settings.AWS_KINESIS_MAX_RETRIES,
+        retry_backoff: float = 0.1,
+    ):
+        self.batch_size = min(batch_size, KINESIS_MAX_BATCH_SIZE)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._client = None
+        self._credentials_expiration = None
+
+    def send(self, user_watch_logs: List[dict]):
+        for index in range(0, len(user_watch_logs), self.batch_size):
+            self._put_records(user_watch_logs[index:index + self.batch_size])
+
+    def get_client(self):
+        if self._client is None or self._are_credentials_expired():
+            credentials = retrieve_cognito_credentials()
+            self._client = create_kinesis_client(credentials)
+            self._credentials_expiration = credentials.get("Expiration")
+        return self._client
+
+    def reset_client(self):
+        self._client = None
+        self._credentials_expiration = None
+
+    def _are_credentials_expired(self) -> bool:
+        if self._credentials_expiration is None:
+            return False
+        now = datetime.now(tz=timezone.utc)
+        return self._credentials_expiration - CREDENTIALS_EXPIRATION_MARGIN <= now
+
+    def _put_records(self, user_watch_logs: List[dict]):
+        records = [create_stream_record(log) for log in user_watch_logs]
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            try:
+                response = self.get_client().put_records(
+                    StreamName=stream_settings.AWS_KINESIS_STREAM_NAME,
+                    Records=records,
+                )
+            except (BotoCoreError, ClientError) as exc:
+                logger.warning(
+                    "[AWS Kinesis] Couldn't put %s user watch logs",
+                    len(records),
+                    exc_info=exc,
+                )
+                # credentials could have been revoked, retrieve new ones
+                self.reset_client()
+                continue
+
+            if not response.get("FailedRecordCount"):
+                return
+            records = [
+                record
+                for record, result in zip(records, response["Records"])
+                if result.get("ErrorCode")
+            ]
+
+        logger.error(
+            "[AWS Kinesis] Dropped %s user watch logs after %s retries",
+            len(records),
+            self.max_retries,
         )
 
 
+user_watch_log_producer = UserWatchLogProducer()
+
+
+def get_user_watch_logs_key() -> str:
+    return cache.make_key(CachePrefix.USER_WATCH_LOGS)
+
+
+def buffer_user_watch_log(user_watch_log: dict) -> int:
+    """Add the log to the Redis buffer and return the number of buffered logs."""
+    return get_redis_client().rpush(get_user_watch_logs_key(), encode(user_watch_log))
+
+
+def pop_buffered_user_watch_logs(count: int) -> List[dict]:
+    """Remove up to `count` of the oldest buffered logs and return them."""
+    key = get_user_watch_logs_key()
+    pipeline = get_redis_client().pipeline(transaction=True)
+    pipeline.lrange(key, 0, count - 1)
+    pipeline.ltrim(key, count, -1)
+    entries, _ = pipeline.execute()
+    return [json.loads(entry) for entry in entries]
+
+
 def retrieve_cognito_credentials():
     cognito = boto3.client('cognito-identity')
     identity_id = retrieve_identity_id(cognito)
@@ -74,12 +168,11 @@ def create_user_watch_log(stream_ticket: "StreamTicket"):
     }
 
 
-def put_stream_record(kinesis, user_watch_log):
-    kinesis.put_record(
-        StreamName=stream_settings.AWS_KINESIS_STREAM_NAME,
-        PartitionKey=get_random_secret_key(),
-        Data=encode(user_watch_log)
-    )
+def create_stream_record(user_watch_log):
+    return {
+        'PartitionKey': get_random_secret_key(),
+        'Data': encode(user_watch_log)
+    }
 
 
 def encode(user_watch_log):
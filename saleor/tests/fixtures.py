@@ -94,6 +94,7 @@ from ..product.models import (
     VariantMedia,
 )
 from ..product.tests.utils import create_image
+from ..settings import CACHES
 from ..shipping.models import (
     ShippingMethod,
     ShippingMethodChannelListing,
@@ -194,6 +195,134 @@ def assert_max_num_queries(capture_queries):
     return partial(capture_queries, exact=False)
 
 
+class FakeRedisPipeline:
+    """Queue the commands and run them on the client when executed."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        return lambda *args, **kwargs: self.commands.append((method, args, kwargs))
+
+    def execute(self):
+        commands, self.commands = self.commands, []
+        return [method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+def encode(value):
+    return value.encode() if isinstance(value, str) else value
+
+
+class FakeRedisClient:
+    """In-memory client implementing the Redis commands used by the caches."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.lists = {}
+        self.sets = {}
+        self.sorted_sets = {}
+
+    def pipeline(self, transaction=True):
+        return FakeRedisPipeline(self)
+
+    def incr(self, name):
+        self.values[name] = self.values.get(name, 0) + 1
+        return self.values[name]
+
+    def decr(self, name):
+        self.values[name] = self.values.get(name, 0) - 1
+        return self.values[name]
+
+    def set(self, name, value, nx=False, ex=None):
+        if nx and name in self.values:
+            return None
+        self.values[name] = value
+        return True
+
+    def expire(self, name, timeout):
+        return True
+
+    def delete(self, name):
+        containers = [self.values, self.hashes, self.lists, self.sets, self.sorted_sets]
+        return sum(container.pop(name, None) is not None for container in containers)
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[encode(key)] = encode(value)
+        return 1
+
+    def hlen(self, name):
+        return len(self.hashes.get(name, {}))
+
+    def hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+    def rpush(self, name, value):
+        self.lists.setdefault(name, []).append(encode(value))
+        return len(self.lists[name])
+
+    def lrange(self, name, start, end):
+        values = self.lists.get(name, [])
+        # the end of the range is inclusive
+        stop = len(values) + end + 1 if end < 0 else end + 1
+        return values[start:stop]
+
+    def ltrim(self, name, start, end):
+        self.lists[name] = self.lrange(name, start, end)
+        return True
+
+    def sadd(self, name, value):
+        self.sets.setdefault(name, set()).add(encode(value))
+        return 1
+
+    def smembers(self, name):
+        return set(self.sets.get(name, set()))
+
+    def zadd(self, name, mapping):
+        self.sorted_sets.setdefault(name, {}).update(mapping)
+        return len(mapping)
+
+    def zremrangebyscore(self, name, min, max):
+        members = self.sorted_sets.get(name, {})
+        removed = [
+            member
+            for member, score in members.items()
+            if float(min) <= score <= float(max)
+        ]
+        for member in removed:
+            del members[member]
+        return len(removed)
+
+    def zrangebyscore(self, name, min, max):
+        members = self.sorted_sets.get(name, {})
+        return [
+            encode(member)
+            for member, score in sorted(members.items(), key=lambda item: item[1])
+            if float(min) <= score <= float(max)
+        ]
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    """Enable the Redis cache features and serve them from a fake Redis client.
+
+    The cache itself stays local, only the commands sent directly to Redis go to
+    the returned client.
+    """
+    client = FakeRedisClient()
+    caches = {
+        **CACHES,
+        "default": {**CACHES["default"], "BACKEND": "django_redis.cache.RedisCache"},
+    }
+    monkeypatch.setattr("saleor.core.caching.CACHES", caches)
+    monkeypatch.setattr(
+        "saleor.core.caching.get_redis_connection", lambda alias="default": client
+    )
+    return client
+
+
 @pytest.fixture
 def setup_vatlayer(settings, channel_USD):
     settings.PLUGINS = ["saleor.plugins.vatlayer.plugin.VatlayerPlugin"]
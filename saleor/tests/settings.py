@@ -44,6 +44,22 @@ PASSWORD_HASHERS = ["saleor.tests.dummy_password_hasher.DummyHasher"]
 
 PLUGINS = []
 
+# data of rolled back tests must not survive in process memory
+PLUGINS_MANAGER_CACHE_ENABLED = False
+DISCOUNTS_SNAPSHOT_ENABLED = False
+CONFIGURATION_CACHE_ENABLED = False
+WEBHOOK_REGISTRY_ENABLED = False
+WEBHOOK_DEFERRED_PAYLOADS_ENABLED = False
+WEBHOOK_TRANSPORT_POOLING_ENABLED = False
+
+# webhook deliveries are recorded and paused only by the tests covering them
+WEBHOOK_DELIVERY_ATTEMPTS_ENABLED = False
+WEBHOOK_CIRCUIT_BREAKER_ENABLED = False
+
+# operations exceeding their query budgets fail the tests
+GRAPHQL_QUERY_ACCOUNTING_ENABLED = True
+GRAPHQL_QUERY_BUDGET_RAISE = True
+
 PATTERNS_IGNORED_IN_QUERY_CAPTURES: List[Union[Pattern, SimpleLazyObject]] = [
     lazy_re_compile(r"^SET\s+")
 ]
@@ -6,13 +6,15 @@ from django.views.decorators.csrf import csrf_exempt
 
 from .core.views import jwks
 from .graphql.api import schema
-from .graphql.views import GraphQLView
+from .graphql.views import GraphQLView, query_stats_view
 from .payment.gateways.paypal.webhook.views import paypal_webhook
 from .payment.gateways.stripe.valcome_webhook.views import stripe_webhook
 from .plugins.views import (
     handle_global_plugin_webhook,
     handle_plugin_per_channel_webhook,
     handle_plugin_webhook,
+    plugin_hook_metrics,
+    webhook_delivery_metrics,
 )
 from .product.views import digital_product
 
@@ -47,6 +49,16 @@ urlpatterns = [
     url(r".well-known/jwks.json", jwks, name="jwks")
 ]
 
+if settings.PLUGINS_HOOK_METRICS_ENABLED:
+    urlpatterns += [
+        url(r"^metrics/plugins/$", plugin_hook_metrics, name="plugins-metrics")
+    ]
+
+if settings.WEBHOOK_DELIVERY_METRICS_ENABLED:
+    urlpatterns += [
+        url(r"^metrics/webhooks/$", webhook_delivery_metrics, name="webhooks-metrics")
+    ]
+
 if settings.DEBUG:
     import warnings
 
@@ -65,6 +77,7 @@ if settings.DEBUG:
         ]
 
     urlpatterns += static("/media/", document_root=settings.MEDIA_ROOT) + [
+        url(r"^graphql/query-stats/$", query_stats_view, name="query-stats"),
         url(r"^static/(?P<path>.*)$", serve),
         url(r"^", views.home, name="home"),
     ]
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Dict, Iterable, List, cast
 from django.db.models import F, Sum
 from django.db.models.expressions import Exists, OuterRef
 
+from ..core.caching import CachePrefix, invalidate_instances_cache
 from ..core.exceptions import AllocationError, InsufficientStock, InsufficientStockData
 from ..core.tracing import traced_atomic_transaction
 from ..order import OrderLineData
@@ -18,6 +19,18 @@ if TYPE_CHECKING:
 StockData = namedtuple("StockData", ["pk", "quantity"])
 
 
+def invalidate_stocks_cache(variant_ids: Iterable[int]):
+    """Drop the cached responses showing the availability of the variants."""
+    variant_ids = set(variant_ids)
+    if variant_ids:
+        invalidate_instances_cache(
+            CachePrefix.PRODUCT,
+            ProductVariant.objects.filter(pk__in=variant_ids).values_list(
+                "product_id", flat=True
+            ),
+        )
+
+
 @traced_atomic_transaction()
 def allocate_stocks(
     order_lines_info: Iterable["OrderLineData"], country_code: str, channel_slug: str
@@ -92,6 +105,7 @@ def allocate_stocks(
             )
             stocks_to_update.append(stock)
         Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+        invalidate_stocks_cache(variant.pk for variant in variants)
 
 
 def _create_allocations(
@@ -191,6 +205,7 @@ def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
 
     Allocation.objects.bulk_update(allocations_to_update, ["quantity_allocated"])
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    invalidate_stocks_cache(stock.product_variant_id for stock in stocks_to_update)
 
     if not_dellocated_lines:
         raise AllocationError(not_dellocated_lines)
@@ -235,6 +250,7 @@ def increase_stock(
             )
         stock.quantity_allocated = F("quantity_allocated") + quantity
         stock.save(update_fields=["quantity_allocated"])
+    invalidate_stocks_cache([stock.product_variant_id])
 
 
 @traced_atomic_transaction()
@@ -265,6 +281,7 @@ def increase_allocations(lines_info: Iterable["OrderLineData"], channel_slug: st
         stocks_to_update.append(stock)
     Allocation.objects.filter(pk__in=allocation_pks_to_delete).delete()
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    invalidate_stocks_cache(stock.product_variant_id for stock in stocks_to_update)
 
     allocate_stocks(
         lines_info,
@@ -389,6 +406,7 @@ def _decrease_stocks_quantity(
         raise InsufficientStock(insufficient_stocks)
 
     Stock.objects.bulk_update(stocks_to_update, ["quantity"])
+    invalidate_stocks_cache(stock.product_variant_id for stock in stocks_to_update)
 
 
 def get_order_lines_with_track_inventory(
@@ -420,3 +438,4 @@ def deallocate_stock_for_order(order: "Order"):
         stocks_to_update.append(stock)
     allocations.update(quantity_allocated=0)
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    invalidate_stocks_cache(stock.product_variant_id for stock in stocks_to_update)
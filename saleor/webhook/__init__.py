@@ -1,6 +1,16 @@
 import opentracing
 
 
+class WebhookDeliveryStatus:
+    SUCCESS = "success"
+    FAILED = "failed"
+
+    CHOICES = [
+        (SUCCESS, "Success"),
+        (FAILED, "Failed"),
+    ]
+
+
 def traced_payload_generator(func):
     def wrapper(*args, **kwargs):
         operation = f"{func.__name__}"
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.5 on 2021-09-20 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhook", "0007_auto_20210319_0945"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhook",
+            name="batch_size",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="webhook",
+            name="batch_window",
+            field=models.PositiveIntegerField(default=5),
+        ),
+    ]
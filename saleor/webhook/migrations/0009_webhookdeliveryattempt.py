@@ -0,0 +1,53 @@
+# Generated by Django 3.2.5 on 2021-09-27 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhook", "0008_webhook_batching"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookDeliveryAttempt",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("event_type", models.CharField(max_length=128)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("success", "Success"), ("failed", "Failed")],
+                        max_length=16,
+                    ),
+                ),
+                ("duration", models.FloatField()),
+                (
+                    "response_code",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+                (
+                    "webhook",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="delivery_attempts",
+                        to="webhook.webhook",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("-created", "-pk"),
+            },
+        ),
+    ]
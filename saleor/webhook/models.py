@@ -2,6 +2,7 @@ from django.db import models
 
 from ..app.models import App
 from ..app.validators import AppURLValidator
+from . import WebhookDeliveryStatus
 
 
 class WebhookURLField(models.URLField):
@@ -16,6 +17,10 @@ class Webhook(models.Model):
     target_url = WebhookURLField(max_length=255)
     is_active = models.BooleanField(default=True)
     secret_key = models.CharField(max_length=255, null=True, blank=True)
+    # events are coalesced into batch requests of up to `batch_size` events, sent
+    # `batch_window` seconds after the first one; batching is disabled below 2
+    batch_size = models.PositiveIntegerField(default=0)
+    batch_window = models.PositiveIntegerField(default=5)
 
     class Meta:
         ordering = ("pk",)
@@ -32,3 +37,24 @@ class WebhookEvent(models.Model):
 
     def __repr__(self):
         return self.event_type
+
+
+class WebhookDeliveryAttempt(models.Model):
+    """Outcome of a single delivery of a webhook request.
+
+    Payloads are not stored, attempts are kept for
+    `WEBHOOK_DELIVERY_ATTEMPTS_RETENTION`.
+    """
+
+    webhook = models.ForeignKey(
+        Webhook, related_name="delivery_attempts", on_delete=models.CASCADE
+    )
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+    event_type = models.CharField(max_length=128)
+    status = models.CharField(max_length=16, choices=WebhookDeliveryStatus.CHOICES)
+    # seconds spent on the request
+    duration = models.FloatField()
+    response_code = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-created", "-pk")